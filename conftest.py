@@ -12,7 +12,6 @@ from pathlib import Path
 import platform
 import shutil
 import logging
-import stat
 import tempfile
 import pytest
 import requests
@@ -20,35 +19,106 @@ from selenium import webdriver
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
 # Imports to get firefox driver working
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
 
+from utils.browser_pool import BrowserPools, IMPLICIT_WAIT, origin_of
+from pages.base_page import WAIT_STATS
+from utils.step_timing import STEPS, instrument_driver
+from utils.web_vitals import PAGE_METRICS, install_vitals_observer
+from utils.network_idle import install_network_tracker
+from utils.network_collector import network_collector
+from utils.graphql_recorder import GRAPHQL_STATS, graphql_calls
+from utils.wait_profiler import WAIT_PROFILE
+from utils.har import save_har
+from utils import tracing
+from utils.tracing import StepTracer, TraceSession, trace_path
+from utils.perf_baseline import record_run
+from utils.flaky_db import FLAKE_QUARANTINE_RATE, load_quarantine, record_outcomes
+from utils.artifacts import ARTIFACT_LEVELS, ARTIFACTS
+from utils.log import LOG_CONTEXT, LOG_JSONL, add_context, configure_logging, get_logger, shutdown_logging
+from report_generator import REPORT_FORMATS, generate, parse_formats
+from utils.driver_resolver import resolve_driver
+from utils.chrome_profile import (
+    REAPER, bake_profile, clone_profile, ensure_template, install_seed_storage, load_seed,
+    restore_seed_cookies,
+)
+from utils.auth_state import AuthStateStore
+from utils.browser_state import capture_state, restore_state, remove_restore_script
+from utils.api_login import ApiLogin, LoginError, timed_login
+from utils.oidc_stub import OidcStandIn
+from utils.credential_pool import CredentialPool, discover_credentials
+from utils.resource_blocking import (
+    ResourceSizeCache, apply_blocking, load_rules, network_usage, parse_categories, patterns_for,
+)
+from selenium.common.exceptions import TimeoutException
+
+log = get_logger("conftest")
 
-# This global dict will map each failed test nodeid → its screenshot relative path.
-#
-FAILED_SCREENSHOTS = {}
 
 def pytest_configure(config):
-    # this will always print once at startup
-    print("\n🐍 root conftest.py: pytest_configure loaded")
+    # --collect-only runs nothing worth a log file
+    jsonl = None if config.option.collectonly else config.getoption("--log-jsonl")
+    configure_logging(jsonl, fresh=not hasattr(config, "workerinput"))
+    log.debug("root conftest.py: pytest_configure loaded")
+    PAGE_METRICS.enabled = not config.getoption("--no-page-metrics")
+    ARTIFACTS.level = config.getoption("--artifacts")
+    # next to report.json, whatever directory a test moves to
+    ARTIFACTS.base_dir = config.invocation_params.dir
+    tracing.TRACE_DIR = config.invocation_params.dir / tracing.TRACE_DIR
+
+
+def pytest_sessionstart(session):
+    # pytest's own handlers (captured, live and file logs) format with %(where)s:
+    # pytest.ini's log_format. Its logging plugin only exists once configure is over.
+    plugin = session.config.pluginmanager.get_plugin("logging-plugin")
+    if plugin is not None:
+        add_context(*(getattr(plugin, name, None) for name in (
+            "caplog_handler", "report_handler", "log_cli_handler", "log_file_handler",
+        )))
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--quarantine"):
+        _quarantine(items)
+    if config.getoption("--benchmark"):
+        return
+    skip_bench = pytest.mark.skip(reason="benchmark: run with --benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_bench)
+
+def pytest_unconfigure(config):
+    shutdown_logging()
+
+
+def _quarantine(items):
+    """Flaky tests (utils/flaky_db.py) run as non-strict xfail: recorded, but they can't fail the run."""
+    flaky = load_quarantine()
+    for item in items:
+        rate = flaky.get(item.nodeid)
+        if rate is None:
+            continue
+        item.add_marker(pytest.mark.xfail(reason=f"quarantined: flake rate {rate:.0%}", strict=False))
+        item.user_properties.append(("quarantined", rate))
 
-# ─── LOGGER SETUP ──────────────────────────────────────────────────────────────
-logging.basicConfig(
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    level=logging.INFO
-)
 
+# ─── LOGGER SETUP ──────────────────────────────────────────────────────────────
+# Levels and the JSONL sink: utils/log.py (CDS_LOG_LEVEL, CDS_LOG_LEVELS, --log-jsonl).
+# Console format: log_format in pytest.ini.
 logging.getLogger("WDM").setLevel(logging.WARNING)
 # optionally prevent it from propagating to the root logger:
 logging.getLogger("WDM").propagate = False
 
 
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+REPORT_MODES = ("inline", "background", "off")
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--headed",
@@ -62,13 +132,147 @@ def pytest_addoption(parser):
         default="chrome",
         help="Send 'chrome' or 'firefox' as parameter for execution"
     )
+    parser.addoption(
+        "--max-browser-uses",
+        action="store",
+        type=int,
+        default=20,
+        help="recycle a pooled browser after this many tests"
+    )
+    parser.addoption(
+        "--no-browser-pool",
+        action="store_true",
+        default=False,
+        help="launch a fresh browser for every test instead of reusing a warm one"
+    )
+    parser.addoption(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="never download browser drivers; use CHROMEDRIVER_PATH/GECKODRIVER_PATH or the driver cache"
+    )
+    parser.addoption(
+        "--fresh-login",
+        action="store_true",
+        default=False,
+        help="always go through the full UI login instead of restoring a saved session"
+    )
+    parser.addoption(
+        "--login-mode",
+        action="store",
+        default="ui",
+        choices=("ui", "api"),
+        help="how provider fixtures log in the first time: 'ui' (Keycloak form) or 'api' (HTTP)"
+    )
+    parser.addoption(
+        "--credential-wait",
+        action="store",
+        type=float,
+        default=600,
+        help="seconds a test waits for a free test account before erroring"
+    )
+    parser.addoption(
+        "--block-resources",
+        action="store",
+        nargs="?",
+        const="default",
+        default=None,
+        help="block resource categories via CDP: comma list of analytics,trackers,fonts,images "
+             "(bare flag = analytics,trackers,fonts)"
+    )
+    parser.addoption(
+        "--block-rules",
+        action="store",
+        default=None,
+        help="JSON file of {category: [url patterns]} extending the built-in block rules"
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="also run tests marked @pytest.mark.benchmark"
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        default=os.getenv("PAGE_LOAD_STRATEGY", "normal"),
+        choices=PAGE_LOAD_STRATEGIES,
+        help="WebDriver page-load strategy: 'normal' (wait for load), 'eager' (DOMContentLoaded) "
+             "or 'none'; pages then wait on their own readiness locator"
+    )
+    parser.addoption(
+        "--no-page-metrics",
+        action="store_true",
+        default=False,
+        help="don't capture Navigation Timing / Web Vitals after page transitions"
+    )
+    parser.addoption(
+        "--no-profile-template",
+        action="store_true",
+        default=False,
+        help="start Chrome on an empty profile instead of a copy of the prebaked template"
+    )
+    parser.addoption(
+        "--artifacts",
+        action="store",
+        default=os.getenv("ARTIFACT_LEVEL", "failure"),
+        choices=ARTIFACT_LEVELS,
+        help="debug screenshots/HTML: 'off', 'failure' (failure paths only) or 'step' (every page-object step)"
+    )
+    parser.addoption(
+        "--cdp-trace",
+        action="store_true",
+        default=False,
+        help="record a Chrome performance trace of every browser test into traces/"
+    )
+    parser.addoption(
+        "--no-perf-baseline",
+        action="store_true",
+        default=False,
+        help="don't add this run to the performance history (and skip regression checks)"
+    )
+    parser.addoption(
+        "--no-flake-history",
+        action="store_true",
+        default=False,
+        help="don't add this run's outcomes to the flakiness database"
+    )
+    parser.addoption(
+        "--quarantine",
+        action="store_true",
+        default=False,
+        help=f"run tests with a flake rate of at least {FLAKE_QUARANTINE_RATE:.0%} as non-strict xfail"
+    )
+    parser.addoption(
+        "--har-bodies",
+        action="store_true",
+        default=False,
+        help="include response bodies in the HAR saved for a failed test"
+    )
+    parser.addoption(
+        "--log-jsonl",
+        action="store",
+        default=LOG_JSONL,
+        help="JSON Lines log of the run, one file per xdist worker ('' turns it off; env CDS_LOG_JSONL)"
+    )
+    parser.addoption(
+        "--report",
+        action="store",
+        default=os.getenv("REPORT_MODE", "inline"),
+        choices=REPORT_MODES,
+        help="build TEST_REPORT.* at the end of the run: inline (default), background "
+             "(detached, pytest exits right away) or off"
+    )
+    parser.addoption(
+        "--report-formats",
+        action="store",
+        default=",".join(REPORT_FORMATS),
+        help=f"comma-separated subset of {','.join(REPORT_FORMATS)} (default: all)"
+    )
 
 # ─── SELENIUM DRIVER FIXTURE ────────────────────────────────────────────────────
-@pytest.fixture
-def driver(request):
-    browser = request.config.getoption("--browser", default="chrome").lower()
-
-    # Common Chrome flags
+def _chrome_options(page_load_strategy: str = "normal"):
+    """Chrome flags shared by test browsers and the profile-template bake."""
     opts = webdriver.ChromeOptions()
     for flag in (
         "--headless=new", "--no-sandbox", "--disable-gpu",
@@ -76,66 +280,240 @@ def driver(request):
         "--window-size=1920,1080", "--start-maximized"
     ):
         opts.add_argument(flag)
+    opts.page_load_strategy = page_load_strategy
+    return opts
 
-    # Isolate user-data
-    tmp_profile = tempfile.mkdtemp(prefix="chrome-user-data-")
-    opts.add_argument(f"--user-data-dir={tmp_profile}")
+
+def _bake_profile(path: str, offline: bool = False):
+    """Launch Chrome once on `path` to turn it into the profile template."""
+    opts = _chrome_options()
+    opts.add_argument(f"--user-data-dir={path}")
+    drv = webdriver.Chrome(service=ChromeService(resolve_driver("chrome", offline=offline)), options=opts)
+    try:
+        return bake_profile(drv, os.getenv("HOME_URL_DEV"))
+    finally:
+        drv.quit()
+
+
+def _launch_browser(browser: str, offline: bool = False, page_load_strategy: str = "normal",
+                    profile_template: bool = True):
+    """
+    Start one browser session. Returns (driver, profile_dir); profile_dir is the
+    temp Chrome user-data dir to delete once the browser is quit (None for Firefox).
+    Chrome starts from a clone of the prebaked profile template unless
+    `profile_template` is False (or the bake failed).
+    """
+    # Common Chrome flags
+    opts = _chrome_options(page_load_strategy)
+
+    # Network events in the performance log (request counts, bytes, blocked requests)
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    tmp_profile = None
+    seed = None
 
     if browser == "chrome":
-        # 1) Fetch via webdriver_manager
-        raw_path = ChromeDriverManager().install()
-        folder = os.path.dirname(raw_path)
-
-        # 2) If the returned path isn't the actual binary, look for it
-        if not os.access(raw_path, os.X_OK) or os.path.basename(raw_path) != "chromedriver":
-            candidates = [
-                fn for fn in os.listdir(folder)
-                if fn.lower() == "chromedriver"
-            ]
-            if not candidates:
-                raise RuntimeError(
-                    f"Couldn’t find executable ‘chromedriver’ in {folder}. "
-                    f"Files there: {os.listdir(folder)}"
-                )
-            real = os.path.join(folder, candidates[0])
-            # ensure it’s executable
-            st = os.stat(real)
-            os.chmod(real, st.st_mode | stat.S_IXUSR)
-            driver_path = real
+        # Isolate user-data: a private copy of the template, or an empty dir
+        template = ensure_template(lambda path: _bake_profile(path, offline)) if profile_template else None
+        if template:
+            tmp_profile = clone_profile(template)
+            seed = load_seed(template)
         else:
-            driver_path = raw_path
+            tmp_profile = tempfile.mkdtemp(prefix="chrome-user-data-")
+        opts.add_argument(f"--user-data-dir={tmp_profile}")
 
-        print(f"[INFO] Using chromedriver at: {driver_path}")
+        driver_path = resolve_driver("chrome", offline=offline)
+        log.debug("Using chromedriver at: %s", driver_path)
         service = ChromeService(driver_path)
         drv = webdriver.Chrome(service=service, options=opts)
+        # consent etc. from the template, re-applied after every pool reset
+        drv.cds_seed_state = seed
+        install_seed_storage(drv, seed)
 
     elif browser == "firefox":
-        gd = GeckoDriverManager().install()
-        print(f"[INFO] Using geckodriver at: {gd}")
+        gd = resolve_driver("firefox", offline=offline)
+        log.debug("Using geckodriver at: %s", gd)
         service = FirefoxService(gd)
-        drv = webdriver.Firefox(service=service)
+        fopts = webdriver.FirefoxOptions()
+        fopts.page_load_strategy = page_load_strategy
+        drv = webdriver.Firefox(service=service, options=fopts)
 
     else:
         raise ValueError(f"Unsupported browser: {browser!r}")
 
-    # Debug
-    print(f"[INFO] session id: {drv.session_id}")
-    print(f"[INFO] window handle: {drv.current_window_handle}")
+    log.debug("session id: %s, window handle: %s", drv.session_id, drv.current_window_handle)
 
-    drv.implicitly_wait(3)
+    drv.implicitly_wait(IMPLICIT_WAIT)
     try:
         drv.execute_cdp_cmd("Network.enable", {})
     except Exception:
         pass
+    # fetch/XHR in-flight counter behind BasePage.wait_for_network_idle()
+    install_network_tracker(drv)
+    # LCP/CLS observer + CDP Performance domain for page metrics
+    install_vitals_observer(drv)
+
+    return drv, tmp_profile
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """
+    Warm browsers per pytest process (i.e. per xdist worker), one pool per
+    page-load strategy. Only the first test on a worker pays the browser
+    startup cost.
+    """
+    browser = request.config.getoption("--browser", default="chrome").lower()
+    offline = request.config.getoption("--offline")
+    template = not request.config.getoption("--no-profile-template")
+    pools = BrowserPools(
+        lambda strategy: (lambda: _launch_browser(
+            browser, offline=offline, page_load_strategy=strategy, profile_template=template
+        )),
+        max_uses=request.config.getoption("--max-browser-uses"),
+        origins=[origin_of(os.getenv("HOME_URL_DEV", ""))],
+        after_reset=lambda drv: restore_seed_cookies(drv, getattr(drv, "cds_seed_state", None)),
+        discard_profile=REAPER.reap,
+    )
+    yield pools
+    pools.close()
 
+
+@pytest.fixture(scope="session")
+def resource_size_cache():
+    """Transfer sizes learned from page loads, used to estimate what blocking saved."""
+    cache = ResourceSizeCache()
+    yield cache
+    cache.save()
+
+
+def _blocked_categories(request):
+    """Categories to block for this test: @pytest.mark.block_resources(...) wins over --block-resources."""
+    marker = request.node.get_closest_marker("block_resources")
+    if marker is not None:
+        return parse_categories(",".join(marker.args) or "default")
+    return parse_categories(request.config.getoption("--block-resources"))
+
+
+def _page_load_strategy(request):
+    """@pytest.mark.page_load_strategy("eager") wins over --page-load-strategy."""
+    marker = request.node.get_closest_marker("page_load_strategy")
+    strategy = marker.args[0] if marker else request.config.getoption("--page-load-strategy")
+    if strategy not in PAGE_LOAD_STRATEGIES:
+        raise pytest.UsageError(
+            f"Unknown page-load strategy {strategy!r}; expected one of {PAGE_LOAD_STRATEGIES}"
+        )
+    return strategy
+
+
+def _start_trace(request, drv):
+    """A TraceSession for the whole test, a StepTracer for one step, or None."""
+    marker = request.node.get_closest_marker("trace")
+    if marker is None and not request.config.getoption("--cdp-trace"):
+        return None
+    step = marker.kwargs.get("step") if marker else None
+    if step:
+        tracer = StepTracer(drv, request.node.name, step)
+        STEPS.hooks.append(tracer)
+        return tracer
+    try:
+        return TraceSession(drv, trace_path(request.node.name)).start()
+    except Exception as e:
+        log.warning("Could not start a trace for %s: %s", request.node.name, e)
+        return None
+
+
+def _stop_trace(request, trace):
+    """Paths of the test's traces, relative to the invocation directory like report.json's other paths."""
+    if isinstance(trace, StepTracer):
+        paths = trace.paths
+    elif trace is None:
+        return []
+    else:
+        try:
+            paths = [trace.stop()]
+        except Exception as e:
+            log.warning("Could not save the trace for %s: %s", request.node.name, e)
+            return []
+    return [os.path.relpath(path, request.config.invocation_params.dir) for path in paths]
+
+
+@pytest.fixture
+def driver(request, browser_pool, resource_size_cache):
+    # marks the test for the perf and flake histories (utils/report_reader.is_browser_test)
+    browser = request.config.getoption("--browser", default="chrome").lower()
+    request.node.user_properties.append(("browser", browser))
+    strategy = _page_load_strategy(request)
+    pooled = not request.config.getoption("--no-browser-pool")
+    if pooled:
+        pool = browser_pool.get(strategy)
+        drv = pool.acquire()
+        tmp_profile = None
+    else:
+        drv, tmp_profile = _launch_browser(
+            browser, offline=request.config.getoption("--offline"), page_load_strategy=strategy,
+            profile_template=not request.config.getoption("--no-profile-template"),
+        )
+
+    categories = _blocked_categories(request)
+    if categories:
+        rules = load_rules(request.config.getoption("--block-rules"))
+        if not apply_blocking(drv, patterns_for(categories, rules)):
+            log.warning("Resource blocking needs Chrome (CDP); ignoring --block-resources")
+            categories = ()
+
+    instrument_driver(drv)
+    network = network_collector(drv)
+    network.reset()
+    WAIT_STATS.reset()
+    STEPS.reset()
+    PAGE_METRICS.reset()
+    trace = _start_trace(request, drv)
+    ARTIFACTS.start_test(drv, request.node.name)
+    if ARTIFACTS.level == "step":
+        STEPS.hooks.append(ARTIFACTS)
     yield drv
 
-    # Teardown
     try:
-        drv.quit()
-    except:
-        pass
-    shutil.rmtree(tmp_profile, ignore_errors=True)
+        artifacts = ARTIFACTS.end_test()
+        if artifacts:
+            request.node.user_properties.append(("artifacts", artifacts))
+        traces = _stop_trace(request, trace)
+        if traces:
+            request.node.user_properties.append(("traces", traces))
+            log.info("Traces: %s", ", ".join(traces))
+        if WAIT_STATS.calls:
+            request.node.user_properties.append(("wait_stats", WAIT_STATS.summary()))
+        if STEPS.spans:
+            request.node.user_properties.append(("steps", STEPS.ordered()))
+        if PAGE_METRICS.records:
+            request.node.user_properties.append(("page_metrics", PAGE_METRICS.records))
+
+        if network.available:
+            calls = graphql_calls(network)
+            if calls:
+                request.node.user_properties.append(("graphql", calls))
+            usage = network_usage(network.all(), resource_size_cache)
+            if categories:
+                usage["categories"] = list(categories)
+                request.node.user_properties.append(("resource_blocking", usage))
+                log.info("%d request(s) blocked, ~%.0f KB saved (%d of unknown size), %.0f KB received",
+                         usage["blocked_requests"], usage["bytes_saved_estimate"] / 1024,
+                         usage["blocked_unknown_size"], usage["bytes_received"] / 1024)
+    finally:
+        # a browser a failed test leaves behind may be in any state: retire it
+        reports = (getattr(request.node, "rep_setup", None), getattr(request.node, "rep_call", None))
+        failed = any(rep is not None and rep.failed for rep in reports)
+        if pooled:
+            pool.release(drv, healthy=not failed)
+        else:
+            try:
+                drv.quit()
+            except:
+                pass
+            # deleted on the reaper thread so teardown doesn't wait on it
+            REAPER.reap(tmp_profile)
 
 @pytest.fixture(scope="session")
 def base_url():
@@ -169,30 +547,164 @@ def sample_logo_path():
     return logo_path
 
 @pytest.fixture(scope="session")
-def test_credentials():
+def credential_pool(request, tmp_path_factory):
+    """
+    All TEST_EMAIL_<n>/TEST_PASSWORD_<n> accounts, leased out one per worker.
+    Lock files live in a directory shared by every xdist worker of this run
+    (or in CREDENTIAL_LOCK_DIR, to coordinate separate runs on one machine).
+    """
+    lock_dir = os.getenv("CREDENTIAL_LOCK_DIR")
+    if not lock_dir:
+        base = tmp_path_factory.getbasetemp()
+        # xdist workers each get basetemp/popen-gwN; the parent is common to all of them
+        lock_dir = base.parent if os.getenv("PYTEST_XDIST_WORKER") else base
+    creds = discover_credentials()
+    assert creds, "No TEST_EMAIL_<n>/TEST_PASSWORD_<n> credentials set!"
+    return CredentialPool(
+        creds,
+        Path(lock_dir) / "credential-locks",
+        wait_timeout=request.config.getoption("--credential-wait"),
+    )
+
+
+@pytest.fixture
+def test_credentials(credential_pool):
+    """
+    Leases one account for the duration of the test and returns (email, password).
+    No other worker gets the same account until the test finishes; if every
+    account is busy the test waits (up to --credential-wait seconds).
+    TEST_USER_INDEX still pins the run to a single account.
+    """
+    with credential_pool.lease() as lease:
+        yield lease.email, lease.password
+
+
+# ─── PROVIDER SESSION REUSE ─────────────────────────────────────────────────────
+@pytest.fixture(scope="session")
+def auth_state_store():
+    """Logged-in cookies/storage per credential, shared by all tests of this worker."""
+    store = AuthStateStore()
+    yield store
+    log.info("%d UI login(s), %d API login(s), %d restored session(s)",
+             store.logins, store.api_logins, store.restores)
+
+
+def _open_restored_dashboard(driver, base_url, timeout: int = 10):
+    """Open /dashboard with restored state; ProviderHomePage if the session is accepted, else None."""
+    from pages.provider.provider_home_page import ProviderHomePage
+
+    prov_home = ProviderHomePage(driver, timeout)
+    prov_home.load(base_url)
+    try:
+        prov_home.is_header_visible()
+    except TimeoutException:
+        return None
+    return prov_home
+
+
+def _restore_into(driver, base_url, state):
+    """Inject `state` and open /dashboard. Returns (ProviderHomePage or None, script id to remove later)."""
+    script_id = restore_state(driver, state)
+    prov_home = _open_restored_dashboard(driver, base_url)
+    if prov_home is None:
+        remove_restore_script(driver, script_id)
+        return None, None
+    return prov_home, script_id
+
+
+@pytest.fixture(scope="session")
+def api_login(base_url):
+    """One ApiLogin (and so one pooled requests.Session) for the whole worker."""
+    api = ApiLogin(base_url)
+    yield api
+    api.session.close()
+
+
+@pytest.fixture
+def provider_home(request, driver, base_url, test_credentials, auth_state_store):
     """
-        Reads TEST_USER_INDEX (1 or 2) from the environment,
-        then returns (email, password) pulled from TEST_EMAIL_1/2 and TEST_PASSWORD_1/2.
-        """
-    idx = int(os.getenv("TEST_USER_INDEX", "1"))
-    email = os.getenv(f"TEST_EMAIL_{idx}")
-    password = os.getenv(f"TEST_PASSWORD_{idx}")
-    assert email and password, f"Credentials for user index {idx} not set!"
-    return email, password
+    A ProviderHomePage for `test_credentials`, already logged in.
+
+    The first test per credential logs in and saves the resulting cookies +
+    local/session storage; later tests get that state restored into their
+    browser before the first navigation. An expired or rejected session falls
+    back to a fresh login.
+
+    --login-mode=api does that first login over HTTP (utils.api_login) instead
+    of through the Keycloak form, falling back to the UI if it fails.
+    Use --fresh-login or @pytest.mark.fresh_login to always run the full UI flow.
+    """
+    from pages.home_page import HomePage
+
+    email, password = test_credentials
+    fresh = request.config.getoption("--fresh-login") or request.node.get_closest_marker("fresh_login")
+
+    prov_home = None
+    script_id = None
+    state = None if fresh else auth_state_store.get(email)
+    if state is not None:
+        prov_home, script_id = _restore_into(driver, base_url, state)
+        if prov_home is None:
+            log.info("Restored session for %s was rejected, logging in again", email)
+            auth_state_store.invalidate(email)
+        else:
+            auth_state_store.count_restore()
+
+    if prov_home is None and not fresh and request.config.getoption("--login-mode") == "api":
+        try:
+            state, seconds = timed_login(request.getfixturevalue("api_login"), email, password)
+            log.info("API login for %s took %.2fs", email, seconds,
+                     extra={"data": {"key": "api_login", "metric": "duration_s", "value": seconds}})
+            prov_home, script_id = _restore_into(driver, base_url, state)
+            if prov_home is None:
+                log.warning("Dashboard did not accept the API session, falling back to the UI login")
+        except (LoginError, requests.RequestException) as e:
+            log.warning("API login failed (%s), falling back to the UI login", e)
+        if prov_home is not None:
+            auth_state_store.count_login(api=True)
+            # re-capture so whatever the app put in web storage is part of the saved state
+            auth_state_store.put(email, capture_state(driver))
+
+    if prov_home is None:
+        home = HomePage(driver, base_url)
+        home.load()
+        prov_home = home.go_to_login(flow="provider", email=email, password=password)
+        auth_state_store.count_login()
+        if not fresh:
+            auth_state_store.put(email, capture_state(driver))
+
+    yield prov_home
+
+    remove_restore_script(driver, script_id)
+
+
+@pytest.fixture(scope="session")
+def oidc_stand_in():
+    """
+    Local frontend + Keycloak stand-in (utils.oidc_stub) so the API login path
+    can be tested without network access. Knows one user, see `.users`.
+    """
+    stand_in = OidcStandIn({"provider@example.org": "Passw0rd!"}).start()
+    yield stand_in
+    stand_in.stop()
 
 
 # 1) pytest_runtest_makereport
 #    After each test “call” phase, if it failed and a WebDriver fixture is present,
-#    take a screenshot and stash (nodeid → relative PNG path) in FAILED_SCREENSHOTS.
+#    take a screenshot and save a HAR of the recent traffic; both paths go into
+#    the test's user_properties.
 # ─────────────────────────────────────────────────────────────────────────────────────────────────────────────
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_runtest_makereport(item, call):
     """
     Called after each test run phase. If the test “call” phase failed and the test
-    has a WebDriver fixture, take a screenshot and record the relative path in FAILED_SCREENSHOTS.
+    has a WebDriver fixture, take a screenshot (and a HAR) and record the relative paths
+    in user_properties.
     """
     outcome = yield
     rep = outcome.get_result()
+    # item.rep_setup / item.rep_call, for fixture teardown (driver releases a failed test's browser as unhealthy)
+    setattr(item, f"rep_{rep.when}", rep)
 
     # We only care about failures in the “call” phase
     if rep.when == "call" and rep.failed:
@@ -203,8 +715,8 @@ def pytest_runtest_makereport(item, call):
                 driver_obj = fixture_val
                 break
 
-        if not driver_obj:
-            # No WebDriver fixture → nothing to screenshot
+        if not driver_obj or ARTIFACTS.level == "off":
+            # No WebDriver fixture (or artifacts turned off) → nothing to screenshot
             return
 
         # 2) Make sure ./screenshots exists
@@ -219,48 +731,175 @@ def pytest_runtest_makereport(item, call):
             driver_obj.save_screenshot(str(png_path))
             rel = os.path.relpath(str(png_path), os.getcwd())
 
-            # Record in the global dict for pytest_json_modifyreport to inject later
-            FAILED_SCREENSHOTS[rep.nodeid] = rel
+            # The teardown report carries user_properties into report.json,
+            # also from xdist workers
+            item.user_properties.append(("screenshot", rel))
 
-            print(f"\n📸 [HOOK] Saved screenshot for {rep.nodeid}: {rel}\n")
+            log.info("Saved screenshot: %s", rel)
+        except Exception as e:
+            log.warning("Could not save a screenshot: %s", e)
+
+        # 4) The network traffic leading up to the failure, as a HAR next to it
+        har_path = screenshots_dir / f"{sanitized}.har"
+        try:
+            if save_har(driver_obj, har_path, bodies=item.config.getoption("--har-bodies")):
+                rel = os.path.relpath(str(har_path), os.getcwd())
+                item.user_properties.append(("har", rel))
+                log.info("Saved HAR: %s", rel)
         except Exception as e:
-            print(f"\n⚠️ [HOOK] Could not save screenshot for {rep.nodeid}: {e}\n")
+            log.warning("Could not save a HAR: %s", e)
+
+
+def pytest_runtest_logstart(nodeid, location):
+    LOG_CONTEXT.test = nodeid
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    LOG_CONTEXT.test = None
+
+
+def _announce(config, message, level=logging.INFO):
+    """A session-level notice: logged, and shown on the terminal (log capture is off by then)."""
+    log.log(level, message)
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        # the progress line may still be open at session end
+        reporter.line("")
+        reporter.write_line(message)
+
+
+def pytest_runtest_logreport(report):
+    # with xdist this also sees the workers' reports, user_properties included
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "graphql":
+            GRAPHQL_STATS.add(report.nodeid, value)
+        elif name == "wait_stats":
+            WAIT_PROFILE.add(value.get("by_locator", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput"):
+        return
+    if WAIT_PROFILE.locators:
+        terminalreporter.section("Waits by locator: total time")
+        for line in WAIT_PROFILE.table("seconds"):
+            terminalreporter.write_line(line)
+        timeouts = WAIT_PROFILE.table("timeouts")
+        if len(timeouts) > 1:
+            terminalreporter.section("Waits by locator: timeouts")
+            for line in timeouts:
+                terminalreporter.write_line(line)
+        WAIT_PROFILE.write(Path(os.getcwd()) / "wait_profile.json")
+        terminalreporter.write_line("Full per-locator table: wait_profile.json")
+    if GRAPHQL_STATS.calls:
+        terminalreporter.section("GraphQL operations (ms)")
+        for line in GRAPHQL_STATS.table():
+            terminalreporter.write_line(line)
+        GRAPHQL_STATS.write(Path(os.getcwd()) / "graphql_stats.json")
+        terminalreporter.write_line("Per-operation percentiles and histograms: graphql_stats.json")
 
 
 # ─────────────────────────────────────────────────────────────────────────────────────────────────────────────
 # 2) pytest_json_modifyreport
 #    This hook is provided by pytest-json-report. It runs after the plugin builds its
-#    internal JSON data but before writing report.json. We inject our screenshot path here.
+#    internal JSON data but before writing report.json. We lift the step timings here.
 # ─────────────────────────────────────────────────────────────────────────────────────────────────────────────
 @pytest.hookimpl
 def pytest_json_modifyreport(json_report):
     """
-    For each test in the JSON report, if we have a screenshot recorded in FAILED_SCREENSHOTS,
-    append ["screenshot", <rel_path>] into that test’s "user_properties" array.
+    Screenshot and HAR paths of failed tests already sit in "user_properties"
+    ({"screenshot": ...}, {"har": ...}). Page-object step timings recorded by
+    the driver fixture are lifted into a top-level "steps" list on the test.
     """
     for test_dict in json_report.get("tests", []):
-        nodeid = test_dict.get("nodeid")
-        if nodeid in FAILED_SCREENSHOTS:
-            rel_path = FAILED_SCREENSHOTS[nodeid]
-            if "user_properties" not in test_dict or test_dict["user_properties"] is None:
-                test_dict["user_properties"] = []
-            test_dict["user_properties"].append(["screenshot", rel_path])
-            print(f"🔗 [HOOK] Injected screenshot into JSON for {nodeid}: {rel_path}")
+        for prop in test_dict.get("user_properties") or []:
+            if isinstance(prop, dict) and "steps" in prop:
+                test_dict["steps"] = prop["steps"]
 
 
 # ─────────────────────────────────────────────────────────────────────────────────────────────────────────────
 # 3) pytest_sessionfinish
 #    After pytest finishes running all tests (and after report.json is written),
-#    automatically call report_generator.py to produce TEST_REPORT.md and TEST_REPORT.pdf.
+#    record the run's performance history and build TEST_REPORT.* (report_generator.generate),
+#    in this process or in a detached one.
 # ─────────────────────────────────────────────────────────────────────────────────────────────────────────────
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
     """
-    Called once pytest is completely done. If report.json exists, invoke report_generator.py.
+    Called once pytest is completely done. If report.json exists, record the
+    run and build the reports (on the controller only, under xdist).
     """
-    rpt = Path(os.getcwd()) / "report.json"
-    if rpt.exists():
-        print("\n\n📄 Generating TEST_REPORT.md + TEST_REPORT.pdf …")
-        subprocess.run([sys.executable, "report_generator.py"], check=False)
-    else:
-        print("\n\n⚠️  report.json not found; skipping report generation.")
\ No newline at end of file
+    # let the reaper finish deleting retired browser profiles
+    REAPER.drain()
+    ARTIFACTS.close()
+
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    # nothing to record or report on (--collect-only, or -k matched nothing)
+    if config.option.collectonly or not _tests_ran(config):
+        return
+    base_dir = config.invocation_params.dir
+    log_path = config.getoption("--log-jsonl")
+    rpt = base_dir / getattr(config.option, "json_report_file", "report.json")
+    if not rpt.exists():
+        _announce(config, f"⚠️  {rpt.name} not found; skipping report generation.", logging.WARNING)
+        return
+
+    if not config.getoption("--no-perf-baseline"):
+        try:
+            flagged = record_run(rpt, out_path=base_dir / "perf_regressions.json", log_path=log_path)
+            if flagged:
+                _announce(config, f"🐢 {len(flagged)} performance regression(s) against the "
+                                  f"rolling median; see perf_regressions.json", logging.WARNING)
+        except Exception as e:
+            _announce(config, f"⚠️  Could not update the performance history: {e}", logging.WARNING)
+
+    if not config.getoption("--no-flake-history"):
+        try:
+            flaky = record_outcomes(rpt, out_path=base_dir / "flaky_tests.json")
+            if flaky:
+                _announce(config, f"🎲 {len(flaky)} flaky test(s) in the outcome history; "
+                                  f"see flaky_tests.json")
+        except Exception as e:
+            _announce(config, f"⚠️  Could not update the flakiness database: {e}", logging.WARNING)
+
+    mode = config.getoption("--report")
+    formats = parse_formats(config.getoption("--report-formats"))
+    if mode == "off" or not formats:
+        return
+    names = " + ".join(f"TEST_REPORT.{f}" for f in formats)
+    if mode == "background":
+        _start_report_worker(base_dir, rpt, formats, log_path)
+        _announce(config, f"📄 Generating {names} in the background (see report_generator.log) …")
+        return
+
+    _announce(config, f"📄 Generating {names} …")
+    try:
+        generate([str(rpt)], formats, base_dir=base_dir, log_path=log_path)
+    except Exception as e:
+        _announce(config, f"⚠️  Report generation failed: {e}", logging.WARNING)
+
+
+def _tests_ran(config) -> bool:
+    """Whether any test reached setup, from the terminal reporter's stats (workers' reports included)."""
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is None:
+        return True
+    return any(
+        getattr(r, "when", None) for reports in reporter.stats.values() for r in reports
+    )
+
+
+def _start_report_worker(base_dir, rpt, formats, log_path):
+    """report_generator.py in its own session: it outlives pytest, which exits right away. Returns the Popen."""
+    script = Path(__file__).resolve().parent / "report_generator.py"
+    with open(base_dir / "report_generator.log", "w", encoding="utf-8") as out:
+        return subprocess.Popen(
+            [sys.executable, str(script), str(rpt), "--formats", ",".join(formats),
+             "--log-jsonl", log_path or ""],
+            cwd=base_dir, stdout=out, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
\ No newline at end of file
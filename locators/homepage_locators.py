@@ -9,4 +9,5 @@ class HomepageLocators:
     TAB_ABOUT           = "/html/body/main/div/header/nav/div/div[2]/div[2]/div[5]/a"
     LOGIN_SIGNUP_BUTTON = "/html/body/main/div/header/nav/div/div[2]/div[3]/button"
     LOGOUT_PROFILE_LOGO = "//button[.//div[contains(@class, 'Avatar-module_Wrapper')]]"
-    LOGOUT              = "//button[normalize-space()='Log Out']"
\ No newline at end of file
+    LOGOUT              = "//button[normalize-space()='Log Out']"
+    COOKIE_CONSENT_ACCEPT = "//*[@id='cookieConsentAccept']"
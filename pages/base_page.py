@@ -1,22 +1,359 @@
 # pages/base_page.py
+import time
+from urllib.parse import urldefrag
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils.artifacts import ARTIFACTS
+from utils.log import get_logger
+from utils.network_collector import network_collector
+from utils.network_idle import NETWORK_QUIET_MS, inject_network_tracker, is_network_idle, network_state
+from utils.step_timing import STEPS, instrument_class
+from utils.wait_profiler import locator_name
+
+log = get_logger(__name__)
+
+# Named timeout profiles (seconds). Pages pick a profile instead of a number
+# so every wait in the suite is tuned from one place. "instant" evaluates the
+# condition exactly once.
+TIMEOUT_PROFILES = {
+    "instant": 0,
+    "short": 3,
+    "default": 5,
+    "long": 10,
+    "very_long": 30,
+}
+POLL_FREQUENCY = 0.2
+
+
+def resolve_timeout(timeout):
+    """Accept a profile name or a number of seconds."""
+    if isinstance(timeout, str):
+        try:
+            return TIMEOUT_PROFILES[timeout]
+        except KeyError:
+            raise ValueError(
+                f"Unknown timeout profile {timeout!r}; "
+                f"expected one of {sorted(TIMEOUT_PROFILES)}"
+            )
+    return timeout
+
+
+def as_locator(locator):
+    """Locators are XPath strings or (By, value) tuples."""
+    if isinstance(locator, str):
+        return (By.XPATH, locator)
+    return tuple(locator)
+
+
+class WaitStats:
+    """
+    Per-call record of every explicit wait made through BasePage.
+    conftest resets it at the start of each test and stores summary()
+    in the test's user_properties.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def reset(self):
+        self.calls = []
+
+    def record(self, kind, locator, profile, elapsed, timed_out):
+        self.calls.append({
+            "kind": kind,
+            "locator": locator[1] if isinstance(locator, tuple) else locator,
+            "profile": profile,
+            "elapsed": round(elapsed, 4),
+            "timed_out": timed_out,
+        })
+
+    def summary(self):
+        by_kind = {}
+        for call in self.calls:
+            bucket = by_kind.setdefault(call["kind"], {"count": 0, "seconds": 0.0})
+            bucket["count"] += 1
+            bucket["seconds"] = round(bucket["seconds"] + call["elapsed"], 4)
+        by_locator = {}
+        for call in self.calls:
+            name = locator_name(call["locator"]) or f"<{call['kind']}>"
+            bucket = by_locator.setdefault(name, {
+                "calls": 0, "seconds": 0.0, "timeouts": 0, "satisfied": 0,
+                "satisfied_seconds": 0.0, "max_s": 0.0, "kinds": [],
+            })
+            bucket["calls"] += 1
+            bucket["seconds"] = round(bucket["seconds"] + call["elapsed"], 4)
+            bucket["max_s"] = max(bucket["max_s"], call["elapsed"])
+            if call["timed_out"]:
+                bucket["timeouts"] += 1
+            else:
+                bucket["satisfied"] += 1
+                bucket["satisfied_seconds"] = round(bucket["satisfied_seconds"] + call["elapsed"], 4)
+            if call["kind"] not in bucket["kinds"]:
+                bucket["kinds"].append(call["kind"])
+        slowest = sorted(self.calls, key=lambda c: c["elapsed"], reverse=True)[:5]
+        return {
+            "calls": len(self.calls),
+            "seconds": round(sum(c["elapsed"] for c in self.calls), 4),
+            "timeouts": sum(1 for c in self.calls if c["timed_out"]),
+            "by_kind": by_kind,
+            "slowest": slowest,
+            "by_locator": by_locator,
+        }
+
+
+WAIT_STATS = WaitStats()
+
+
 class BasePage:
-    def __init__(self, driver, timeout=5):
-        self.driver = driver
-        self.wait   = WebDriverWait(driver, timeout)
+    # Element that means "this page can be used". Under the eager/none
+    # page-load strategies driver.get() returns before the load event, so
+    # visit() waits on this rather than on every subresource.
+    READY_LOCATOR = None
+
+    def __init_subclass__(cls, **kwargs):
+        # Every public method of a page object is a timed step (utils/step_timing.py)
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
+
+    def __init__(self, driver, timeout="default"):
+        self.driver  = driver
+        # The page's own default profile; explicit per-call profiles win.
+        self.timeout = timeout
 
     def visit(self, url):
+        # The outgoing document's timeOrigin: readiness must not be read off it
+        try:
+            previous, current_url = self.driver.execute_script(
+                "return [performance.timeOrigin, location.href];"
+            )
+        except WebDriverException:
+            previous, current_url = None, None
         self.driver.get(url)
+        if "#" in url and current_url and urldefrag(url).url == urldefrag(current_url).url:
+            # only the fragment changes: the document stays, there is no new one to wait for
+            previous = None
+        self.wait_until_ready(previous=previous)
+
+    def wait_until_ready(self, timeout="long", previous=None):
+        """
+        The new document is parsed (readyState past "loading") and, if the
+        page defines one, READY_LOCATOR is visible. `previous` is the
+        performance.timeOrigin of the document navigated away from, which
+        is never taken for the new one. Returns immediately after a
+        `normal` strategy get().
+        """
+        def _parsed(driver):
+            try:
+                return driver.execute_script(
+                    "return performance.timeOrigin !== arguments[0] && document.readyState !== 'loading';",
+                    previous,
+                )
+            except WebDriverException:
+                # mid-navigation under the "none" strategy
+                return False
+
+        self.wait_for(_parsed, timeout, kind="ready")
+        if self.READY_LOCATOR:
+            self.wait_visible(self.READY_LOCATOR, timeout)
+        return self
+
+    # ── Wait engine ──────────────────────────────────────────────────────
+    def wait_for(self, condition, timeout=None, message="", locator=None, kind="condition"):
+        """
+        Run one explicit wait and record it. Every wait in pages/ goes
+        through here; the driver's implicit wait stays at 0 so the two
+        never compound. `locator` may be a function of the wait's result
+        (None on timeout) when the locator to charge depends on it.
+        """
+        profile = self.timeout if timeout is None else timeout
+        seconds = resolve_timeout(profile)
+        started = time.perf_counter()
+        STEPS.enter_wait()
+        try:
+            result = WebDriverWait(
+                self.driver, seconds, poll_frequency=POLL_FREQUENCY
+            ).until(condition, message)
+        except TimeoutException:
+            elapsed = time.perf_counter() - started
+            STEPS.exit_wait(elapsed)
+            if callable(locator):
+                locator = locator(None)
+            WAIT_STATS.record(kind, locator, profile, elapsed, True)
+            log.debug("%s wait timed out after %.2fs (%r): %s", kind, elapsed, profile, locator)
+            raise
+        except BaseException:
+            STEPS.exit_wait(time.perf_counter() - started)
+            raise
+        elapsed = time.perf_counter() - started
+        STEPS.exit_wait(elapsed)
+        if callable(locator):
+            locator = locator(result)
+        WAIT_STATS.record(kind, locator, profile, elapsed, False)
+        log.debug("%s wait satisfied in %.2fs: %s", kind, elapsed, locator)
+        return result
+
+    def capture_step(self, label: str):
+        """Screenshot at a checkpoint, only when artifacts are captured per step."""
+        ARTIFACTS.capture_step(self.driver, label)
+
+    def capture_failure(self, label: str):
+        """Screenshot + page HTML before re-raising a failure (unless artifacts are off)."""
+        ARTIFACTS.capture_failure(self.driver, label)
+
+    def wait_visible(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.visibility_of_element_located(loc), timeout, message, loc, "visible")
+
+    def wait_clickable(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.element_to_be_clickable(loc), timeout, message, loc, "clickable")
+
+    def wait_present(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.presence_of_element_located(loc), timeout, message, loc, "present")
+
+    def wait_all_present(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.presence_of_all_elements_located(loc), timeout, message, loc, "all_present")
+
+    def wait_all_visible(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.visibility_of_all_elements_located(loc), timeout, message, loc, "all_visible")
+
+    def wait_invisible(self, locator, timeout=None, message=""):
+        loc = as_locator(locator)
+        return self.wait_for(EC.invisibility_of_element_located(loc), timeout, message, loc, "invisible")
+
+    def wait_url_contains(self, fragment, timeout=None, message=""):
+        return self.wait_for(EC.url_contains(fragment), timeout, message, None, "url")
+
+    def wait_for_any(self, locators, timeout=None, message=""):
+        """
+        Wait until one of several locators is visible and return its index.
+        Lets a page branch on state (e.g. logged in vs. logged out) with a
+        single wait instead of a timeout on the branch that isn't there.
+        """
+        locs = [as_locator(l) for l in locators]
+
+        def _any_visible(driver):
+            for i, loc in enumerate(locs):
+                for el in driver.find_elements(*loc):
+                    try:
+                        if el.is_displayed():
+                            # Index 0 is falsy, so hand WebDriverWait a tuple.
+                            return (i,)
+                    except Exception:
+                        continue
+            return False
+
+        def _charged(hit):
+            # the locator that matched; all of them when none did
+            if hit:
+                return locs[hit[0]]
+            return " or ".join(locator_name(loc) for loc in locs)
+
+        return self.wait_for(_any_visible, timeout, message, _charged, "any")[0]
+
+    def network_mark(self):
+        """
+        Snapshot of the page's request counters to pass as `since` to
+        wait_for_network_idle(). Take it before an action whose request the
+        wait must see. None if the tracker isn't in this document yet.
+        """
+        state = network_state(self.driver)
+        if state is None:
+            inject_network_tracker(self.driver)
+        return state
+
+    def wait_for_network_idle(self, quiet_ms=None, timeout="long", graphql_only=False,
+                              since=None, expect_request=False):
+        """
+        Wait until no fetch/XHR request (only GraphQL ones with graphql_only)
+        has been in flight for `quiet_ms`, counted from the start of the wait
+        (or from `since`, a network_mark()) rather than from whenever the page
+        last went quiet. With `expect_request`, a request must also have
+        started after the mark; use it for uploads and saves. Returns False
+        instead of raising if the page never goes quiet (e.g. polling), so it
+        can't fail a step a sleep wouldn't have.
+        """
+        quiet = NETWORK_QUIET_MS if quiet_ms is None else quiet_ms
+        mark = [since or self.network_mark()]
+
+        def _idle(driver):
+            state = network_state(driver)
+            if state is None:
+                # New document without the launch-time hook (e.g. Firefox)
+                inject_network_tracker(driver)
+                return False
+            if mark[0] is None:
+                # the tracker was only just injected: the window starts now
+                mark[0] = state
+            return is_network_idle(state, mark[0], quiet, graphql_only, expect_request)
+
+        try:
+            self.wait_for(_idle, timeout, kind="network_idle")
+            return True
+        except TimeoutException:
+            log.debug("Network not idle after %r; continuing", timeout)
+            return False
+
+    def wait_for_operation(self, name, timeout="long", message=""):
+        """
+        Wait until the GraphQL operation `name` (operationName or root field,
+        e.g. "publishDataset") has a finished response and return its
+        NetworkRequest. Chrome only: it reads the driver's NetworkCollector.
+        """
+        network = network_collector(self.driver)
+        message = message or f"No response for GraphQL operation {name!r}"
+        return self.wait_for(
+            lambda d: network.completed_operation(name), timeout, message,
+            locator=name, kind="graphql",
+        )
+
+    # ── Fast checks (no waiting) ─────────────────────────────────────────
+    def exists_now(self, locator):
+        """True if the element is in the DOM right now."""
+        loc = as_locator(locator)
+        started = time.perf_counter()
+        found = bool(self.driver.find_elements(*loc))
+        WAIT_STATS.record("exists_now", loc, "instant", time.perf_counter() - started, False)
+        return found
+
+    def is_visible(self, locator, timeout="instant"):
+        """True if the element becomes visible within `timeout`; never raises."""
+        try:
+            self.wait_visible(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def is_absent(self, locator, timeout="instant"):
+        """True if the element is gone (or hidden) within `timeout`; never raises."""
+        try:
+            self.wait_invisible(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def finds_if_any(self, locator, timeout="short"):
+        """All present matches, or [] if none appear within `timeout`."""
+        try:
+            return self.wait_all_present(locator, timeout)
+        except TimeoutException:
+            return []
 
-    def find(self, by_locator):
-        return self.wait.until(EC.visibility_of_element_located(by_locator))
+    # ── Shorthands ───────────────────────────────────────────────────────
+    def find(self, by_locator, timeout=None):
+        return self.wait_visible(by_locator, timeout)
 
-    def finds(self, by_locator):
-        return self.wait.until(EC.presence_of_all_elements_located(by_locator))
+    def finds(self, by_locator, timeout=None):
+        return self.wait_all_present(by_locator, timeout)
 
-    def click(self, by_locator):
-        elem = self.wait.until(EC.element_to_be_clickable(by_locator))
+    def click(self, by_locator, timeout=None):
+        elem = self.wait_clickable(by_locator, timeout)
         elem.click()
         return elem
@@ -1,7 +1,6 @@
 # pages/consumer/dataset_page.py
 import requests
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
 from pages.base_page import BasePage
 from locators.consumer.dataset_locators import DatasetLocators
@@ -9,9 +8,11 @@ from locators.consumer.dataset_locators import DatasetLocators
 class DatasetPage(BasePage):
     """Encapsulates interactions on the Datasets tab / page."""
 
+    READY_LOCATOR = DatasetLocators.CARD
+
     def is_loaded(self) -> bool:
         """Wait for at least one dataset card to be visible."""
-        self.wait.until(EC.visibility_of_element_located((By.XPATH, DatasetLocators.CARD)))
+        self.wait_visible(DatasetLocators.CARD)
         return True
 
     def list_cards(self):
@@ -24,18 +25,10 @@ class DatasetPage(BasePage):
         Returns (status_code, href).
         """
         # wait for card container
-        card = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, DatasetLocators.FIRST_CARD))
-        )
-        card.click()
-
-        # wait for dataset page load
-        dataset_page = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, DatasetLocators.DOWNLOAD_LINK))
-        )
-
-        # find and click download
-        link = dataset_page.find_element(By.XPATH, DatasetLocators.DOWNLOAD_LINK)
+        self.click(DatasetLocators.FIRST_CARD)
+
+        # wait for dataset page load and its download link
+        link = self.wait_clickable(DatasetLocators.DOWNLOAD_LINK)
         href = link.get_attribute("href")
         if not href:
             raise AssertionError("Download link has no href")
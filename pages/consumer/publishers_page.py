@@ -2,8 +2,7 @@
 
 import logging
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException
 import requests
 from pages.base_page import BasePage
 from locators.consumer.publishers_locators import PublishersLocators
@@ -12,17 +11,17 @@ from pages.consumer.publisher_detail_page import PublisherDetailPage
 logger = logging.getLogger(__name__)
 
 class PublishersPage(BasePage):
+    READY_LOCATOR = PublishersLocators.HEADER
+
     def is_loaded(self) -> bool:
         """Wait for ‘Our Publishers’ header to be visible."""
         return self.find((By.XPATH, PublishersLocators.HEADER)).is_displayed()
 
-    def _select_tab(self, xpath: str, timeout: int = 10) -> None:
+    def _select_tab(self, xpath: str, timeout="long") -> None:
         """
         Clicks the tab (if not already active) with overlap-safe logic.
         """
-        tab = WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
-        )
+        tab = self.wait_present(xpath, timeout)
 
         # Already selected?
         if "active" in tab.get_attribute("class"):
@@ -33,19 +32,18 @@ class PublishersPage(BasePage):
         # ----- safe-click with up to 3 attempts -----
         for attempt in range(3):
             try:
-                WebDriverWait(self.driver, timeout).until(
-                    EC.element_to_be_clickable((By.XPATH, xpath))
-                )
+                self.wait_clickable(xpath, timeout)
                 tab.click()
                 return
             except ElementClickInterceptedException:
                 # Wait a short moment for overlay/animation to clear, then retry
-                WebDriverWait(self.driver, 2).until(
+                self.wait_for(
                     lambda drv: drv.execute_script(
                         "return arguments[0].getBoundingClientRect().top >= 0 && "
                         "arguments[0].getBoundingClientRect().bottom <= (window.innerHeight || document.documentElement.clientHeight);",
                         tab,
-                    )
+                    ),
+                    "short", kind="in_viewport",
                 )
         # If we’re still here → fail fast so the test shows a clear error
         raise TimeoutException(f"Could not click tab located by {xpath} after retries")
@@ -82,7 +80,7 @@ class PublishersPage(BasePage):
         self._select_tab(tab_xpath)
 
         # wait for the grid container to show up
-        self.wait.until(EC.presence_of_element_located((By.XPATH, PublishersLocators.GRID_CONTAINER)))
+        self.wait_present(PublishersLocators.GRID_CONTAINER)
 
         # return all the <a> publisher cards
         return self.finds((By.XPATH, PublishersLocators.PUBLISHER_CARD))
@@ -116,5 +114,5 @@ class PublishersPage(BasePage):
             f"({PublishersLocators.All_UC_Card})[{index+1}]"
             f"{PublishersLocators.ALL_UC_FIRST_CARD}"
         )
-        self.wait.until(EC.element_to_be_clickable(link_locator)).click()
+        self.click(link_locator)
         return self
\ No newline at end of file
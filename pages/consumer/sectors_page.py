@@ -1,6 +1,5 @@
 # pages/consumer/sectors_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import requests
 from pages.base_page import BasePage
@@ -9,6 +8,8 @@ from locators.consumer.sectors_locators import SectorsLocators
 class SectorsPage(BasePage):
     """Interactions on the Sectors tab / page."""
 
+    READY_LOCATOR = SectorsLocators.HEADER
+
     def is_loaded(self) -> bool:
         """Wait for the ‘Our Sectors’ header to be visible."""
         return self.find((By.XPATH, SectorsLocators.HEADER)).is_displayed()
@@ -24,25 +25,13 @@ class SectorsPage(BasePage):
         Returns (href, status_code).
         """
         # 1) click the Nth sector’s link
-        sector_link = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH,
-                f"({SectorsLocators.SEC_FIRST_CARD})[{sector_index+1}]"
-            ))
-        )
-        sector_link.click()
+        self.click(f"({SectorsLocators.SEC_FIRST_CARD})[{sector_index+1}]")
 
         # 2) click the Mth dataset card
-        dataset_card = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH,
-                f"({SectorsLocators.SEC_DATASET_FIRST_CARD})[{dataset_index+1}]"
-            ))
-        )
-        dataset_card.click()
+        self.click(f"({SectorsLocators.SEC_DATASET_FIRST_CARD})[{dataset_index+1}]")
 
         # 3) find & wait for the Download link
-        download_link = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, SectorsLocators.DOWNLOAD_LINK))
-        )
+        download_link = self.wait_clickable(SectorsLocators.DOWNLOAD_LINK)
         href = download_link.get_attribute("href")
 
         # 4) assert the href is non‐empty
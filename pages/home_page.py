@@ -2,13 +2,10 @@
 from __future__ import annotations
 
 import os
-import time
 from dotenv import load_dotenv
 from typing import Union
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     ElementClickInterceptedException,
@@ -16,6 +13,8 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver import ActionChains
 from pages.base_page import BasePage
+from utils.log import get_logger
+from utils.web_vitals import PAGE_METRICS
 
 # ─── Consumer‐flow imports (PLACE YOUR ORIGINAL IMPORTS HERE) ─────────────────────
 #
@@ -43,6 +42,8 @@ load_dotenv()
 # TEST_PASSWORD = os.getenv("TEST_PASSWORD")
 # ────────────────────────────────────────────────────────────────────────────────
 
+log = get_logger(__name__)
+
 
 class HomePage(BasePage):
     """
@@ -53,78 +54,65 @@ class HomePage(BasePage):
       2) A unified go_to_login(...) for consumer vs provider login
     """
 
+    READY_LOCATOR = HomepageLocators.ICON
+
     def __init__(self, driver, base_url):
-        self.driver = driver
+        super().__init__(driver)
         self.url = base_url.rstrip("/") + "/"
-        
-    def load(self) -> None:
-        """Navigate to the site root once."""
-        self.driver.get(os.getenv("HOME_URL_DEV"))
 
-    def is_loaded(self, timeout: int = 5) -> bool:
+    def load(self) -> None:
+        """Navigate to the site root once; returns when the logo is visible."""
+        self.visit(os.getenv("HOME_URL_DEV"))
+        PAGE_METRICS.capture(self.driver, "home")
+
+    def _arrive(self, page: BasePage, name: str) -> BasePage:
+        """Hand back `page`, first recording its page metrics once it is ready."""
+        if PAGE_METRICS.enabled:
+            if page.READY_LOCATOR:
+                page.is_visible(page.READY_LOCATOR, "long")
+            PAGE_METRICS.capture(self.driver, name)
+        return page
+
+    def is_loaded(self, timeout="default") -> bool:
         """
-        Returns True once the login‐form container is visible.
-        We wait on the FORM locator.
+        Returns True once the platform icon is visible.
         """
-        try:
-            WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located((By.XPATH, HomepageLocators.ICON))
-            )
-            return True
-        except TimeoutException:
-            return False
+        return self.is_visible(HomepageLocators.ICON, timeout)
     
     # ─── Consumer‐flow navigation methods ───────────────────────────────────────────
 
     def go_to_about(self) -> AboutPage:
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, HomepageLocators.TAB_ABOUT))
-        )
-        btn.click()
-        return AboutPage(self.driver)
+        self.click(HomepageLocators.TAB_ABOUT, "long")
+        return self._arrive(AboutPage(self.driver), "about")
 
     def go_to_all_data_page(self) -> DatasetPage:
 
-        try:
-            bann = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "cookieConsentAccept"))
-            )
-            bann.click()
-        except:
-            pass
+        # Banner is gone when consent came seeded with the profile template,
+        # so don't spend a long wait on its absence
+        if self.is_visible(HomepageLocators.COOKIE_CONSENT_ACCEPT, "short"):
+            try:
+                self.click(HomepageLocators.COOKIE_CONSENT_ACCEPT)
+            except:
+                pass
 
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, HomepageLocators.TAB_DATASETS))
-        )
-        btn.click()
-        return DatasetPage(self.driver)
+        self.click(HomepageLocators.TAB_DATASETS, "long")
+        return self._arrive(DatasetPage(self.driver), "datasets")
 
     def go_to_publishers(self) -> PublishersPage:
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, HomepageLocators.TAB_PUBLISHERS))
-        )
-        btn.click()
-        return PublishersPage(self.driver)
+        self.click(HomepageLocators.TAB_PUBLISHERS, "long")
+        return self._arrive(PublishersPage(self.driver), "publishers")
 
     def go_to_sectors(self) -> SectorsPage:
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, HomepageLocators.TAB_SECTORS))
-        )
-        btn.click()
-        return SectorsPage(self.driver)
+        self.click(HomepageLocators.TAB_SECTORS, "long")
+        return self._arrive(SectorsPage(self.driver), "sectors")
 
     def go_to_usecases(self) -> UseCasePage:
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, HomepageLocators.TAB_USECASES))
-        )
-        btn.click()
-        return UseCasePage(self.driver)
+        self.click(HomepageLocators.TAB_USECASES, "long")
+        return self._arrive(UseCasePage(self.driver), "usecases")
 
-    def is_icon_visible(self, timeout: int = 10) -> bool:
+    def is_icon_visible(self, timeout="long") -> bool:
         """TC_HOM_01: Wait for the platform icon (logo) to be visible."""
-        WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located((By.XPATH, HomepageLocators.ICON))
-        )
+        self.wait_visible(HomepageLocators.ICON, timeout)
         return True
 
     # ────────────────────────────────────────────────────────────────────────────────
@@ -133,68 +121,55 @@ class HomePage(BasePage):
     # ─── Provider‐flow login method ──────────────────────────────────────────────────
 
     def go_to_login(self, flow: str = "consumer", email: str|None = None, password: str|None = None):
-        print("\n[STEP] Starting go_to_login (flow=%s)" % flow)
+        log.debug("go_to_login (flow=%s)", flow)
         self.logout()
 
         if flow.lower() == "provider":
-            print("[WAIT] Checking if dashboard header is already visible")
+            # logout() has just refreshed the page: wait for whichever of the
+            # dashboard header and the LOGIN button renders first
             try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.visibility_of_element_located((By.XPATH, ProviderHomepageLocators.HEADER))
-                )
-                print("[OK] Already logged in; ProviderHomePage visible")
-                return ProviderHomePage(self.driver)
+                if self.wait_for_any([ProviderHomepageLocators.HEADER, LoginLocators.LOGIN_BUTTON]) == 0:
+                    log.info("Already logged in; ProviderHomePage visible")
+                    return ProviderHomePage(self.driver)
             except TimeoutException:
-                print("[INFO] Not already logged in, continuing to login.")
+                pass  # neither yet; the LOGIN wait below has the longer timeout
+            log.debug("Not logged in yet, continuing to login")
 
-        print("[WAIT] Waiting for LOGIN / SIGN UP button to be clickable")
+        log.debug("Waiting for the LOGIN / SIGN UP button")
         try:
-            login_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, LoginLocators.LOGIN_BUTTON))
-            )
-            print("[OK] Login button found, clicking…")
+            login_btn = self.wait_clickable(LoginLocators.LOGIN_BUTTON, "long")
             login_btn.click()
-            self.driver.save_screenshot(f"after_login_click_{int(time.time())}.png")
-            print(f"[OK] Clicked LOGIN, current URL: {self.driver.current_url}")
+            self.capture_step("after_login_click")
+            log.debug("Clicked LOGIN")
         except Exception as e:
-            print(f"[FAIL] Could not find or click login button: {e}")
-            self.driver.save_screenshot('debug_login_fail.png')
-            with open('debug_login_fail.html', 'w') as f:
-                f.write(self.driver.page_source)
+            log.error("Could not find or click the login button: %s", e)
+            self.capture_failure("debug_login_fail")
             raise
 
-        print("[WAIT] Waiting for login form to appear (10s)")
+        log.debug("Waiting for the login form")
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, LoginLocators.FORM))
-            )
-            print("[OK] Login form is now visible")
+            self.wait_visible(LoginLocators.FORM, "long")
+            log.debug("Login form visible")
         except TimeoutException as e:
-            print("[FAIL] Login form never appeared after clicking LOGIN")
-            self.driver.save_screenshot('debug_no_login_form.png')
-            with open('debug_no_login_form.html', 'w') as f:
-                f.write(self.driver.page_source)
+            log.error("Login form never appeared after clicking LOGIN")
+            self.capture_failure("debug_no_login_form")
             raise AssertionError("Tapped LOGIN / SIGN UP, but the login form never appeared.")
 
         login_page = LoginPage(self.driver)
 
         if flow.lower() == "provider":
-            print("[ACTION] Logging in as provider (auto-fill)")
+            log.debug("Logging in as provider")
             # Use parameters if provided, else fallback
             email = email or os.getenv("TEST_EMAIL")
             password = password or os.getenv("TEST_PASSWORD")
             login_page.login(email, password)
-            print("[WAIT] Waiting for ProviderHomePage header to appear (10s)")
+            log.debug("Waiting for the ProviderHomePage header")
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.XPATH, ProviderHomepageLocators.HEADER))
-                )
-                print("[OK] ProviderHomePage loaded after login")
+                self.wait_visible(ProviderHomepageLocators.HEADER, "long")
+                log.info("ProviderHomePage loaded after login")
             except TimeoutException as e:
-                print("[FAIL] ProviderHomePage header did not appear after login")
-                self.driver.save_screenshot('debug_post_login_fail.png')
-                with open('debug_post_login_fail.html', 'w') as f:
-                    f.write(self.driver.page_source)
+                log.error("ProviderHomePage header did not appear after login")
+                self.capture_failure("debug_post_login_fail")
                 raise
 
             return ProviderHomePage(self.driver)
@@ -209,25 +184,22 @@ class HomePage(BasePage):
     #     home.go_to_login(flow="provider", email=email, password=password)
 
     def logout(self):
+        logged_out_btn = "//button[contains(.,'LOGIN') or contains(.,'Sign Up')]"
         try:
-            # 1. Click the avatar/profile button
-            avatar_btn = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, HomepageLocators.LOGOUT_PROFILE_LOGO))
+            # 1. One wait decides the state: avatar (logged in) or the
+            #    LOGIN button (logged out) — no timeout on the absent branch.
+            state = self.wait_for_any(
+                [HomepageLocators.LOGOUT_PROFILE_LOGO, logged_out_btn], "default"
             )
-            avatar_btn.click()
+            if state == 0:
+                # 2. Avatar → "Log Out" in the dropdown
+                self.click(HomepageLocators.LOGOUT_PROFILE_LOGO)
+                self.click(HomepageLocators.LOGOUT)
 
-            # 2. Click "Log Out" in the dropdown
-            logout_btn = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, HomepageLocators.LOGOUT))
-            )
-            logout_btn.click()
-
-            # 3. Optionally wait for login button to reappear (optional, adjust as needed)
-            WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, "//button[contains(.,'LOGIN') or contains(.,'Sign Up')]"))
-            )
+                # 3. Wait for the login button to reappear
+                self.wait_visible(logged_out_btn, "long")
         except Exception as e:
-            print("Logout not needed or failed:", e)
+            log.debug("Logout not needed or failed: %s", e)
 
         # 4. Always clear cookies/storage for total isolation
         self.driver.delete_all_cookies()
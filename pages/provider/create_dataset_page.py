@@ -1,14 +1,13 @@
 # pages/provider/create_dataset_page.py
 
-import time
 import json
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
 from pages.base_page import BasePage
+from utils.network_collector import network_collector
 from locators.provider.create_dataset_locators import CreateDatasetLocators
 from pages.provider.dataset_detail_page import DatasetDetailPage
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
@@ -18,23 +17,17 @@ class CreateDatasetPage(BasePage):
 
     def is_form_visible(self) -> bool:
         # “Metadata” tab must be visible
-        return bool(self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.TAB_METADATA))
-        ))
+        return bool(self.wait_visible(CreateDatasetLocators.TAB_METADATA))
 
     # ---- Tab navigation ----
     def go_to_metadata_tab(self):
         self.click((By.XPATH, CreateDatasetLocators.TAB_METADATA))
-        self.wait.until(EC.visibility_of_element_located(
-            (By.XPATH, CreateDatasetLocators.DESCRIPTION)
-        ))
+        self.wait_visible(CreateDatasetLocators.DESCRIPTION)
         return self
 
     def go_to_datafiles_tab(self):
         # 1) wait until the tab is clickable
-        tab = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateDatasetLocators.TAB_DATAFILES)
-        ))
+        tab = self.wait_clickable(CreateDatasetLocators.TAB_DATAFILES)
 
         # 2) scroll it into view (centered)
         self.driver.execute_script(
@@ -48,9 +41,7 @@ class CreateDatasetPage(BasePage):
 
     def go_to_publish_tab(self):
         self.click((By.XPATH, CreateDatasetLocators.TAB_PUBLISH))
-        self.wait.until(EC.visibility_of_element_located(
-            (By.XPATH, CreateDatasetLocators.PUBLISH_REVIEW_TEXT)
-        ))
+        self.wait_visible(CreateDatasetLocators.PUBLISH_REVIEW_TEXT)
         return self
 
     # ---- Metadata entry ----
@@ -62,9 +53,7 @@ class CreateDatasetPage(BasePage):
 
     def select_sectors(self, items: list[str]):
         # 1) click into the combobox input
-        combo = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateDatasetLocators.SECTOR_INPUT)
-        ))
+        combo = self.wait_clickable(CreateDatasetLocators.SECTOR_INPUT)
         combo.click()
 
         for val in items:
@@ -74,21 +63,17 @@ class CreateDatasetPage(BasePage):
 
             # 3) click the exact option
             xpath = CreateDatasetLocators.SECTOR_DROPDOWN_ITEM.format(value=val)
-            opt = self.wait.until(EC.element_to_be_clickable(
-                (By.XPATH, xpath)
-            ))
+            opt = self.wait_clickable(xpath)
             opt.click()
 
         # 4) close dropdown
         ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(3)
+        self.wait_for_network_idle()
         return self
 
     def select_tags(self, items: list[str]):
         # 1) open the tags combobox
-        combo = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateDatasetLocators.TAGS_INPUT)
-        ))
+        combo = self.wait_clickable(CreateDatasetLocators.TAGS_INPUT)
         combo.click()
 
         for val in items:
@@ -98,9 +83,7 @@ class CreateDatasetPage(BasePage):
 
             # 3) pick the exact matching option
             xpath = CreateDatasetLocators.TAG_DROPDOWN_ITEM.format(value=val)
-            opt = self.wait.until(EC.element_to_be_clickable(
-                (By.XPATH, xpath)
-            ))
+            opt = self.wait_clickable(xpath)
             opt.click()
 
         # 4) close dropdown
@@ -108,13 +91,9 @@ class CreateDatasetPage(BasePage):
         return self
 
     def select_geography(self, value: str):
-        toggle = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateDatasetLocators.GEOGRAPHY_CONTAINER)
-        ))
+        toggle = self.wait_clickable(CreateDatasetLocators.GEOGRAPHY_CONTAINER)
         toggle.click()
-        opt = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateDatasetLocators.GEO_OPTION.format(value=value))
-        ))
+        opt = self.wait_clickable(CreateDatasetLocators.GEO_OPTION.format(value=value))
         opt.click()
         ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
         return self
@@ -122,9 +101,7 @@ class CreateDatasetPage(BasePage):
     def enter_date_created(self, iso_date: str):
 
         # 1) locate the date <input>
-        fld = self.wait.until(EC.presence_of_element_located(
-            (By.XPATH, CreateDatasetLocators.DATE_CREATED_INPUT)
-        ))
+        fld = self.wait_present(CreateDatasetLocators.DATE_CREATED_INPUT)
         fld.send_keys(iso_date)
         return self
 
@@ -139,9 +116,7 @@ class CreateDatasetPage(BasePage):
         Picks the desired license from the native <select>.
         """
         # 1) wait for the <select> to be present
-        sel_elem = self.wait.until(EC.presence_of_element_located(
-            (By.XPATH, CreateDatasetLocators.LICENSE_SELECT)
-        ))
+        sel_elem = self.wait_present(CreateDatasetLocators.LICENSE_SELECT)
 
         # 2) wrap it in the Select helper and choose by visible text
         sel = Select(sel_elem)
@@ -153,12 +128,14 @@ class CreateDatasetPage(BasePage):
     def upload_datafile(self, path: str):
            
         # locate the file‐input directly
-        inp = self.wait.until(EC.presence_of_element_located((By.XPATH, CreateDatasetLocators.DATAFILES_INPUT)))
+        inp = self.wait_present(CreateDatasetLocators.DATAFILES_INPUT)
 
         # 3) send the absolute file-path to it (this triggers the upload)
+        mark = self.network_mark()
         inp.send_keys(path)
-        time.sleep(3)
-        btn = self.wait.until(EC.presence_of_element_located((By.XPATH, CreateDatasetLocators.BACK_BUTTON)))
+        # The upload is a request of its own; wait for it instead of guessing
+        self.wait_for_network_idle(timeout="very_long", since=mark, expect_request=True)
+        btn = self.wait_present(CreateDatasetLocators.BACK_BUTTON)
         btn.click()
 
         return self
@@ -171,28 +148,20 @@ class CreateDatasetPage(BasePage):
     # ----Getter functions----
 
     def get_description_value(self) -> str:
-        elt = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.DESCRIPTION))
-        )
+        elt = self.wait_visible(CreateDatasetLocators.DESCRIPTION)
         return elt.get_attribute("value").strip()
 
     def get_selected_sectors(self) -> list[str]:
         # Assuming each selected‐tag appears as a “pill” with text inside
-        elements = self.driver.find_elements(
-            By.XPATH, CreateDatasetLocators.SECTOR_SELECTED_PILL
-        )
+        elements = self.finds_if_any(CreateDatasetLocators.SECTOR_SELECTED_PILL)
         return [el.text.strip() for el in elements]
 
     def get_selected_tags(self) -> list[str]:
-        elements = self.driver.find_elements(
-            By.XPATH, CreateDatasetLocators.TAG_SELECTED_PILL
-        )
+        elements = self.finds_if_any(CreateDatasetLocators.TAG_SELECTED_PILL)
         return [el.text.strip() for el in elements]
 
     def get_selected_geography(self) -> str:
-        elt = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.GEOGRAPHY_SELECTED_PILL))
-        )
+        elt = self.wait_visible(CreateDatasetLocators.GEOGRAPHY_SELECTED_PILL)
         return elt.text.strip()
 
     def get_date_created_value(self) -> str:
@@ -200,22 +169,16 @@ class CreateDatasetPage(BasePage):
         Returns the “value” attribute of the <input type='date'> field,
         which should be in YYYY-MM-DD format.
         """
-        inp = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.GET_DATE_CREATED))
-        )
+        inp = self.wait_visible(CreateDatasetLocators.GET_DATE_CREATED)
         return inp.get_attribute("value")
 
     def get_source_website_value(self) -> str:
-        inp = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.SOURCE_WEBSITE_INPUT))
-        )
+        inp = self.wait_visible(CreateDatasetLocators.SOURCE_WEBSITE_INPUT)
         return inp.get_attribute("value").strip()
 
     def get_selected_license_text(self) -> str:
         # If LICENSE_CONTAINER is the dropdown, maybe the current selection is inside a <span> there.
-        elt = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.LICENSE_SELECTED_TEXT))
-        )
+        elt = self.wait_visible(CreateDatasetLocators.LICENSE_SELECTED_TEXT)
         return elt.text.strip()
 
     def get_uploaded_resource_names(self) -> list[str]:
@@ -223,70 +186,32 @@ class CreateDatasetPage(BasePage):
         Returns the text of every cell under the “NAME OF RESOURCE” column.
         """
         # wait until at least one row has appeared
-        els = self.wait.until(EC.presence_of_all_elements_located(
-            (By.XPATH, CreateDatasetLocators.RESOURCE_NAME_CELLS)
-        ))
+        els = self.wait_all_present(CreateDatasetLocators.RESOURCE_NAME_CELLS)
         # strip() in case there’s extra whitespace
         return [el.text.strip() for el in els]
 
     # ─── Publish‐tab getters ─────────────────────────────────────────────────────────────────
     def is_publish_tab_visible(self) -> bool:
-        return bool(self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateDatasetLocators.PUBLISH_TAB_CONTAINER))
-        ))
+        return bool(self.wait_visible(CreateDatasetLocators.PUBLISH_TAB_CONTAINER))
 
     def is_published(self) -> bool:
         # 1) wait for your redirect so you know the mutation has fired
-        WebDriverWait(self.driver, 10).until(
-            lambda d: "?tab=drafts" in d.current_url
-        )
-        time.sleep(1)  # give perf logs a moment to fill up
-
-        logs = self.driver.get_log("performance")
-        publish_req_id = None
-
-        # 2) find the requestId for the GraphQL call whose payload contains your mutation
-        for entry in logs:
-            msg = json.loads(entry["message"])["message"]
-            if msg.get("method") != "Network.requestWillBeSent":
-                continue
-            req = msg["params"]["request"]
-            # GraphQL POST bodies always have an "operationName"
-            # or will literally contain your mutation field
-            if req.get("postData") and "publishDataset" in req["postData"]:
-                publish_req_id = msg["params"]["requestId"]
-                break
-
-        if not publish_req_id:
+        self.wait_url_contains("?tab=drafts", "long")
+
+        # 2) the publishDataset request, once its response is complete
+        try:
+            req = self.wait_for_operation("publishDataset")
+        except TimeoutException:
+            return False
+        if req.failed or req.status != 200:
             return False
 
-        # 3) find exactly that request’s response
-        for entry in logs:
-            msg = json.loads(entry["message"])["message"]
-            if msg.get("method") != "Network.responseReceived":
-                continue
-            if msg["params"]["requestId"] != publish_req_id:
-                continue
-
-            resp = msg["params"]["response"]
-            # HTTP 200?
-            if resp.get("status") != 200:
-                return False
-
-            # pull the actual JSON body via CDP
-            body = self.driver.execute_cdp_cmd(
-                "Network.getResponseBody", {"requestId": publish_req_id}
-            )["body"]
-            data = json.loads(body)
-            status = data.get("data", {}) \
-                         .get("publishDataset", {}) \
-                         .get("status")
-            return status == "PUBLISHED"
-
-        return False
+        # 3) pull the actual JSON body via CDP
+        data = json.loads(network_collector(self.driver).response_body(req))
+        # a failed mutation answers "publishDataset": null
+        status = ((data.get("data") or {}).get("publishDataset") or {}).get("status")
+        return status == "PUBLISHED"
 
     def get_download_url(self) -> str:
-        link = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, CreateDatasetLocators.DOWNLOAD_LINK))
-        )
+        link = self.wait_clickable(CreateDatasetLocators.DOWNLOAD_LINK)
         return link.get_attribute("href")
\ No newline at end of file
@@ -1,16 +1,17 @@
 # pages/provider/create_usecase_page.py
 
+import logging
 import os
-import time
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import ElementClickInterceptedException
 from pages.base_page import BasePage
 from locators.provider.create_usecase_locators import CreateUsecaseLocators
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class CreateUsecasePage(BasePage):
@@ -19,55 +20,63 @@ class CreateUsecasePage(BasePage):
     All methods return `self` where chaining is appropriate, except for `is_published()`.
     """
 
+    # network_mark() taken before an autosaving action; the next step waits
+    # for that save to have gone out and settled before it starts
+    _save_mark = None
+
+    def _wait_for_save(self, timeout="long"):
+        mark, self._save_mark = self._save_mark, None
+        self.wait_for_network_idle(timeout=timeout, since=mark, expect_request=mark is not None)
+
     def go_to_details_tab(self):
         """
         Click on the “Use Case Details” tab at the top of the wizard.
         """
-        self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.DETAILS_TAB),
+        self.wait_clickable(
+            CreateUsecaseLocators.DETAILS_TAB,
             message="Timed out waiting for the ‘Use Case Details’ tab"
         ).click()
         # Optionally: wait until the summary input is visible
-        self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.USECASE_SUMMARY_INPUT)
-        )
+        self.wait_visible(CreateUsecaseLocators.USECASE_SUMMARY_INPUT)
         return self
 
     def enter_usecase_name(self, name):
-        input_field = self.driver.find_element(By.ID, "usecaseName")  # or By.NAME, By.XPATH, etc.
+        input_field = self.wait_visible((By.ID, "usecaseName"))
         input_field.clear()
+        self._save_mark = self.network_mark()
         input_field.send_keys(str(name))
         return self  # for method chaining
 
     def enter_summary(self, text: str):
-        time.sleep(2)
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.USECASE_SUMMARY_INPUT),
+        # The name field autosaves; let that round trip settle first
+        self._wait_for_save()
+        fld = self.wait_visible(
+            CreateUsecaseLocators.USECASE_SUMMARY_INPUT,
             message="Could not find UseCase summary textarea"
         )
         fld.clear()
+        self._save_mark = self.network_mark()
         fld.send_keys(text)
-        time.sleep(2)
+        self._wait_for_save()
         fld.send_keys(text)
         # fld.send_keys(Keys.TAB)
         return self
 
     def enter_platform_url(self, url: str):
-        time.sleep(3)
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.PLATFORM_URL_INPUT),
+        self.wait_for_network_idle()
+        fld = self.wait_visible(
+            CreateUsecaseLocators.PLATFORM_URL_INPUT,
             message="Could not find Platform Url input"
         )
         fld.clear()
         fld.send_keys(url)
         # Optionally: click body to blur if needed
-        self.driver.find_element(By.TAG_NAME, "body").click()
+        self.wait_present((By.TAG_NAME, "body")).click()
         return self
 
     def select_tags(self, items: list[str]):
-        # time.sleep(2)
         # 1) open the tags combobox
-        combo = self.wait.until(EC.element_to_be_clickable(CreateUsecaseLocators.TAGS_INPUT))
+        combo = self.wait_clickable(CreateUsecaseLocators.TAGS_INPUT)
         combo.click()
 
         for val in items:
@@ -77,9 +86,7 @@ class CreateUsecasePage(BasePage):
 
             # 3) pick the exact matching option
             xpath = CreateUsecaseLocators.TAG_DROPDOWN_ITEM.format(value=val)
-            opt = self.wait.until(EC.element_to_be_clickable(
-                (By.XPATH, xpath)
-            ))
+            opt = self.wait_clickable(xpath)
             try:
                 opt.click()
             except ElementClickInterceptedException:
@@ -91,12 +98,10 @@ class CreateUsecasePage(BasePage):
 
     def select_sectors(self, items: list[str]):
         # 1) click into the combobox input
-        time,sleep(3)
-        self.wait.until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "toast"))
-        )
+        self.wait_for_network_idle()
+        self.wait_invisible((By.CLASS_NAME, "toast"))
 
-        combo = self.wait.until(EC.element_to_be_clickable(CreateUsecaseLocators.SECTOR_INPUT))
+        combo = self.wait_clickable(CreateUsecaseLocators.SECTOR_INPUT)
         combo.click()
 
         for val in items:
@@ -106,9 +111,7 @@ class CreateUsecasePage(BasePage):
 
             # 3) click the exact option
             xpath = CreateUsecaseLocators.SECTOR_DROPDOWN_ITEM.format(value=val)
-            opt = self.wait.until(EC.element_to_be_clickable(
-                (By.XPATH, xpath)
-            ))
+            opt = self.wait_clickable(xpath)
             try:
                 opt.click()
             except ElementClickInterceptedException:
@@ -119,12 +122,10 @@ class CreateUsecasePage(BasePage):
         return self
 
     def select_geography(self, value: str):
-        time.sleep(2)
-        toggle = self.wait.until(EC.element_to_be_clickable(CreateUsecaseLocators.GEOGRAPHY_CONTAINER))
+        self.wait_for_network_idle()
+        toggle = self.wait_clickable(CreateUsecaseLocators.GEOGRAPHY_CONTAINER)
         toggle.click()
-        opt = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateUsecaseLocators.GEO_OPTION.format(value=value))
-        ))
+        opt = self.wait_clickable(CreateUsecaseLocators.GEO_OPTION.format(value=value))
         try:
             opt.click()
         except ElementClickInterceptedException:
@@ -133,12 +134,10 @@ class CreateUsecasePage(BasePage):
         return self
 
     def select_sdg_goals(self, value: str):
-        time.sleep(3)
-        toggle = self.wait.until(EC.element_to_be_clickable(CreateUsecaseLocators.SDG_GOALS_CONTAINER))
+        self.wait_for_network_idle()
+        toggle = self.wait_clickable(CreateUsecaseLocators.SDG_GOALS_CONTAINER)
         toggle.click()
-        opt = self.wait.until(EC.element_to_be_clickable(
-            (By.XPATH, CreateUsecaseLocators.SDG_GOALS_OPTION.format(value=value))
-        ))
+        opt = self.wait_clickable(CreateUsecaseLocators.SDG_GOALS_OPTION.format(value=value))
         try:
             opt.click()
         except ElementClickInterceptedException:
@@ -148,16 +147,14 @@ class CreateUsecasePage(BasePage):
 
     def enter_started_on(self, iso_date: str):
         # 1) locate the date <input>
-        fld = self.wait.until(EC.presence_of_element_located(CreateUsecaseLocators.STARTED_ON_INPUT))
+        fld = self.wait_present(CreateUsecaseLocators.STARTED_ON_INPUT)
         fld.send_keys(iso_date)
         return self
 
     def select_running_status(self, status_text: str):
-        self.wait.until(
-            EC.invisibility_of_element_located((By.CLASS_NAME, "toast"))
-        )
-        select_el = self.wait.until(
-            EC.presence_of_element_located(CreateUsecaseLocators.RUNNING_STATUS_INPUT),
+        self.wait_invisible((By.CLASS_NAME, "toast"))
+        select_el = self.wait_present(
+            CreateUsecaseLocators.RUNNING_STATUS_INPUT,
             message="Could not find Running Status <select>"
         )
 
@@ -167,13 +164,14 @@ class CreateUsecasePage(BasePage):
         return self
 
     def enter_completed_on(self, iso_date: str):
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.COMPLETED_ON_INPUT),
+        fld = self.wait_visible(
+            CreateUsecaseLocators.COMPLETED_ON_INPUT,
             message="Could not find ‘Completed On’ date input"
         )
         fld.clear()
         fld.send_keys(iso_date)
-        self.wait.until(lambda d: fld.get_attribute("value") and iso_date in fld.get_attribute("value"))
+        self.wait_for(lambda d: fld.get_attribute("value") and iso_date in fld.get_attribute("value"),
+                      kind="value")
         return self
 
     def upload_logo(self, path_to_file: str):
@@ -185,83 +183,70 @@ class CreateUsecasePage(BasePage):
         assert os.path.isfile(path_to_file), f"File does not exist: {path_to_file}"
 
         # First, click anywhere on the DropZone to focus the input (important for React UIs)
-        dropzone = self.wait.until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "DropZone-module_DropZone__xD9-6")),
+        dropzone = self.wait_clickable(
+            (By.CLASS_NAME, "DropZone-module_DropZone__xD9-6"),
             message="Could not find clickable DropZone"
         )
         dropzone.click()
 
         # Then get the real <input type="file"> and send keys
-        input_el = self.driver.find_element(By.XPATH, "//input[@type='file']")
+        input_el = self.wait_present("//input[@type='file']")
 
         self.driver.execute_script("arguments[0].style.display = 'block';", input_el)
-        time.sleep(1)  # Give time for UI to stabilize
+        self._save_mark = self.network_mark()
         input_el.send_keys(path_to_file)
+        # Wait for the upload request itself rather than a fixed pause
+        self._wait_for_save(timeout="very_long")
 
         return self
 
     def get_usecase_name_value(self):
-        return self.driver.find_element(*CreateUsecaseLocators.USECASE_NAME_INPUT).get_attribute("value")
+        return self.wait_present(CreateUsecaseLocators.USECASE_NAME_INPUT).get_attribute("value")
 
     def get_summary_value(self):
-        return self.driver.find_element(*CreateUsecaseLocators.SUMMARY_INPUT).get_attribute("value")
+        return self.wait_present(CreateUsecaseLocators.SUMMARY_INPUT).get_attribute("value")
 
     def get_platform_url_value(self):
-        return self.driver.find_element(*CreateUsecaseLocators.PLATFORM_URL_INPUT).get_attribute("value")
+        return self.wait_present(CreateUsecaseLocators.PLATFORM_URL_INPUT).get_attribute("value")
 
     def get_selected_tags(self) -> list[str]:
-        # time.sleep(2)
-        elements = self.driver.find_elements(By.XPATH, CreateUsecaseLocators.SELECTED_TAGS)
+        elements = self.finds_if_any(CreateUsecaseLocators.SELECTED_TAGS)
         return [el.text.strip() for el in elements]
 
     def get_selected_sectors(self) -> list[str]:
         # Assuming each selected‐tag appears as a “pill” with text inside
-        elements = self.driver.find_elements(
-            By.XPATH, CreateUsecaseLocators.SELECTED_SECTORS
-        )
+        elements = self.finds_if_any(CreateUsecaseLocators.SELECTED_SECTORS)
         return [el.text.strip() for el in elements]
 
     def get_selected_geography(self) -> str:
-        elt = self.wait.until(
-            EC.visibility_of_element_located((By.XPATH, CreateUsecaseLocators.SELECTED_GEOGRAPHY))
-        )
+        elt = self.wait_visible(CreateUsecaseLocators.SELECTED_GEOGRAPHY)
         return elt.text.strip()
 
     def get_selected_sdg_goals(self) -> str:
-        time.sleep(2)
-        elements = self.wait.until(
-            EC.presence_of_all_elements_located((By.XPATH, CreateUsecaseLocators.SELECTED_SDG_GOALS))
-        )
+        self.wait_for_network_idle()
+        elements = self.wait_all_present(CreateUsecaseLocators.SELECTED_SDG_GOALS)
         if len(elements) > 3:
             return elements[3].text.strip()  # 4th chip
         raise IndexError("Less than 4 SDG goals selected.")
 
     def get_started_on_value(self) -> str:
-        time.sleep(2)
-        elt = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.STARTED_ON_VALUE_INPUT)
-        )
+        self.wait_for_network_idle()
+        elt = self.wait_visible(CreateUsecaseLocators.STARTED_ON_VALUE_INPUT)
         return elt.get_attribute("value")
 
     def get_running_status_value(self) -> str:
 
-        dropdown = Select(self.driver.find_element(*CreateUsecaseLocators.RUNNING_STATUS_SELECT))
+        dropdown = Select(self.wait_present(CreateUsecaseLocators.RUNNING_STATUS_SELECT))
         return dropdown.first_selected_option.text
 
     def get_completed_on_value(self):
-        time.sleep(2)
-        elt = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.COMPLETED_ON_VALUE_INPUT)
-        )
+        self.wait_for_network_idle()
+        elt = self.wait_visible(CreateUsecaseLocators.COMPLETED_ON_VALUE_INPUT)
         return elt.get_attribute("value")
 
     def is_logo_uploaded(self):
         try:
-            elt = self.wait.until(
-                EC.visibility_of_element_located(
-                    (By.CLASS_NAME, "FileUpload-module_Action__Hg0nE")
-                )
-            )
+            elt = self.wait_visible((By.CLASS_NAME, "FileUpload-module_Action__Hg0nE"))
             return bool(elt.text.strip())
         except:
             return False
@@ -270,7 +255,7 @@ class CreateUsecasePage(BasePage):
 
     def go_to_datasets_tab(self):
         # 1) wait until the tab is clickable
-        tab = self.wait.until(EC.element_to_be_clickable(CreateUsecaseLocators.DATASETS_TAB))
+        tab = self.wait_clickable(CreateUsecaseLocators.DATASETS_TAB)
 
         # 2) scroll it into view (centered)
         self.driver.execute_script(
@@ -283,65 +268,67 @@ class CreateUsecasePage(BasePage):
         return self
 
     def select_first_dataset_checkbox(self):
-        btn = self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.FIRST_DATASET_CHECKBOX),
+        btn = self.wait_clickable(
+            CreateUsecaseLocators.FIRST_DATASET_CHECKBOX,
             message="Could not click first dataset selection checkbox"
         )
         self.driver.execute_script("arguments[0].click();", btn)
 
         # Wait for it to reflect selection state
-        self.wait.until(
-            EC.presence_of_element_located(CreateUsecaseLocators.SELECTED_DATASET_CHECKBOX),
+        self.wait_present(
+            CreateUsecaseLocators.SELECTED_DATASET_CHECKBOX,
             message="Checkbox selection state was not reflected in DOM"
         )
         return self
 
     def click_submit_datasets(self):
-        btn = self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.SUBMIT_DATASETS_BUTTON),
+        btn = self.wait_clickable(
+            CreateUsecaseLocators.SUBMIT_DATASETS_BUTTON,
             message="Could not click ‘Submit’ on the Datasets tab"
         )
+        self._save_mark = self.network_mark()
         btn.click()
         return self
 
     def get_selected_datasets(self):
-        selected = self.driver.find_elements(*CreateUsecaseLocators.SELECTED_DATASET_CHECKBOX)
+        selected = self.finds_if_any(CreateUsecaseLocators.SELECTED_DATASET_CHECKBOX)
         return [f"Row {i + 1}" for i, _ in enumerate(selected)]
 
     # ─── “Contributors” Tab ─────────────────────────────────────────────────────────────────────────────────
 
     def go_to_contributors_tab(self):
-        # Click the Contributors tab
-        time, sleep(5)
-        self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.CONTRIBUTORS_TAB),
+        # Click the Contributors tab once the dataset submit has been saved
+        self._wait_for_save()
+        self.wait_clickable(
+            CreateUsecaseLocators.CONTRIBUTORS_TAB,
             message="Timed out waiting for Contributors tab"
         ).click()
-        time,sleep(5)
+        self.wait_for_network_idle()
         # Wait for the input field to appear and be ready
-        self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.CONTRIBUTORS_INPUT),
+        self.wait_clickable(
+            CreateUsecaseLocators.CONTRIBUTORS_INPUT,
             message="Timed out waiting for 'Add Contributors' input field"
         )
         return self
 
     def add_contributors(self, names: list[str]):
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.CONTRIBUTORS_INPUT),
+        fld = self.wait_visible(
+            CreateUsecaseLocators.CONTRIBUTORS_INPUT,
             message="Could not find ‘Add Contributors’ input"
         )
 
         for name in names:
             fld.clear()
+            self._save_mark = self.network_mark()
             fld.send_keys(name)
             fld.send_keys(Keys.ENTER)
-            time.sleep(0.5)  # slight wait in case async search is involved
+            self._wait_for_save()  # async search / save behind each ENTER
 
         return self
 
     def add_supporters(self, names: list[str]):
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.SUPPORTERS_INPUT),
+        fld = self.wait_visible(
+            CreateUsecaseLocators.SUPPORTERS_INPUT,
             message="Could not find ‘Add Supporters’ input"
         )
         for name in names:
@@ -351,8 +338,8 @@ class CreateUsecasePage(BasePage):
         return self
 
     def add_partners(self, names: list[str]):
-        fld = self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.PARTNERS_INPUT),
+        fld = self.wait_visible(
+            CreateUsecaseLocators.PARTNERS_INPUT,
             message="Could not find ‘Add Partners’ input"
         )
         for name in names:
@@ -362,55 +349,54 @@ class CreateUsecasePage(BasePage):
         return self
 
     def get_contributors_list(self):
-        elements = self.driver.find_elements(*CreateUsecaseLocators.CONTRIBUTORS_LIST_ITEMS)
+        elements = self.finds_if_any(CreateUsecaseLocators.CONTRIBUTORS_LIST_ITEMS)
         names = [el.text.strip() for el in elements if el.text.strip()]
         # Return only the 4th span if present
         return [names[3]] if len(names) > 3 else []
 
     def get_supporters_list(self):
-        return [el.text for el in self.driver.find_elements(*CreateUsecaseLocators.SUPPORTERS_LIST_ITEMS)]
+        return [el.text for el in self.finds_if_any(CreateUsecaseLocators.SUPPORTERS_LIST_ITEMS)]
 
     def get_partners_list(self):
-        return [el.text for el in self.driver.find_elements(*CreateUsecaseLocators.PARTNERS_LIST_ITEMS)]
+        return [el.text for el in self.finds_if_any(CreateUsecaseLocators.PARTNERS_LIST_ITEMS)]
 
     # ─── “Publish” Tab ─────────────────────────────────────────────────────────────────────────────────
 
     def go_to_publish_tab(self):
-        time.sleep(3)
-        self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.PUBLISH_TAB),
+        self.wait_for_network_idle()
+        self.wait_clickable(
+            CreateUsecaseLocators.PUBLISH_TAB,
             message="Timed out waiting for Publish tab"
         ).click()
         # Optionally: wait until the Publish button is shown
-        self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.PUBLISH_BUTTON)
-        )
+        self.wait_visible(CreateUsecaseLocators.PUBLISH_BUTTON)
         return self
 
     def click_publish(self):
-        btn = self.wait.until(
-            EC.element_to_be_clickable(CreateUsecaseLocators.PUBLISH_BUTTON),
+        btn = self.wait_clickable(
+            CreateUsecaseLocators.PUBLISH_BUTTON,
             message="Timed out waiting for Publish button to become clickable"
         )
         btn.click()
 
         # After clicking “Publish,” wait for the published‐marker to appear:
-        self.wait.until(
-            EC.visibility_of_element_located(CreateUsecaseLocators.PUBLISHED_MARKER),
+        self.wait_visible(
+            CreateUsecaseLocators.PUBLISHED_MARKER,
             message="Use Case did not show a ‘Published’ marker"
         )
         return self
 
     def is_published(self) -> bool:
         try:
-            self.wait.until(
-                EC.presence_of_element_located(CreateUsecaseLocators.PUBLISHED_MARKER),
+            self.wait_present(
+                CreateUsecaseLocators.PUBLISHED_MARKER,
                 message="Published toast not found"
             )
             return True
         except Exception as e:
-            print("DEBUG: Toast not found", e)
-            # Optional: print all toast texts for diagnosis
-            for t in self.driver.find_elements(By.XPATH, "//div[contains(@class,'toast')]"):
-                print("Toast visible:", t.text)
+            log.warning("Published toast not found: %s", e)
+            # List the toasts that are visible, for diagnosis
+            if log.isEnabledFor(logging.DEBUG):
+                for t in self.driver.find_elements(By.XPATH, "//div[contains(@class,'toast')]"):
+                    log.debug("Toast visible: %s", t.text)
             return False
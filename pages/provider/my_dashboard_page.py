@@ -2,8 +2,6 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from pages.base_page import BasePage
 from locators.provider.my_dashboard_locators import MyDashboardLocators
@@ -25,17 +23,15 @@ class MyDashboardPage(BasePage):
         """
         self.visit(self.base_url + "/dashboard")
 
-    def is_loaded(self, timeout: int = 10) -> bool:
+    def is_loaded(self, timeout="long") -> bool:
         """
         Verify that at least the “My Dashboard” card is visible (this is the first screen you see
         after login). We do *not* yet assume we are inside the Datasets panel.
         Tests should call `is_loaded()` right after obtaining a MyDashboardPage
         to ensure that the login redirect finished.
         """
-        WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located(
-                (By.XPATH, MyDashboardLocators.CARD_MY_DASHBOARD)
-            ),
+        self.wait_visible(
+            MyDashboardLocators.CARD_MY_DASHBOARD, timeout,
             message="Timed out waiting for the 'My Dashboard' card to appear on the Provider landing page"
         )
         return True
@@ -45,8 +41,8 @@ class MyDashboardPage(BasePage):
         Click the big “My Dashboard” c  ard on /dashboard. This reveals the sidebar menu.
         Returns self (so tests can chain further calls).
         """
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.CARD_MY_DASHBOARD)),
+        self.wait_clickable(
+            MyDashboardLocators.CARD_MY_DASHBOARD, "long",
             message="Timed out waiting for the 'My Dashboard' card to be clickable"
         ).click()
         return self
@@ -56,8 +52,8 @@ class MyDashboardPage(BasePage):
         Once the sidebar appears, click “Datasets” so that the Drafts/Published table loads.
         Returns self (so tests can chain).
         """
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.SIDEBAR_DATASETS)),
+        self.wait_clickable(
+            MyDashboardLocators.SIDEBAR_DATASETS, "long",
             message="Timed out waiting for the 'Datasets' link in sidebar to be clickable"
         ).click()
         return self
@@ -76,22 +72,20 @@ class MyDashboardPage(BasePage):
         """
         try:
             # If “My Dashboard” card is still visible, click it once.
-            WebDriverWait(self.driver, 3).until(
-                EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.CARD_MY_DASHBOARD))
-            ).click()
+            self.click(MyDashboardLocators.CARD_MY_DASHBOARD, "short")
         except:
             # If it’s not there, maybe they already clicked it. Either way—proceed.
             pass
 
         # Step C: Wait for the “Drafts” tab to appear. This ensures the Datasets panel is fully rendered.
-        WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, MyDashboardLocators.DRAFTS_TAB)),
+        self.wait_visible(
+            MyDashboardLocators.DRAFTS_TAB, "long",
             message="Timed out waiting for the 'Drafts' tab to appear"
         )
 
         # Step D: Now wait for “Add New Dataset” button to be clickable:
-        btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.ADD_NEW_DATASET_BTN)),
+        btn = self.wait_clickable(
+            MyDashboardLocators.ADD_NEW_DATASET_BTN, "long",
             message="Timed out waiting for the 'Add New Dataset' button to become clickable"
         )
 
@@ -103,15 +97,15 @@ class MyDashboardPage(BasePage):
         return CreateDatasetPage(self.driver)
 
     def click_usecases_card(self):
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.USECASES_NAV_LINK)),
+        self.wait_clickable(
+            MyDashboardLocators.USECASES_NAV_LINK, "long",
             message="Timed out waiting for the 'Usecases' card to be clickable"
         ).click()
         return UseCasesListPage(self.driver)
 
     def click_profile_card(self):
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, MyDashboardLocators.PROFILE_NAV_LINK)),
+        self.wait_clickable(
+            MyDashboardLocators.PROFILE_NAV_LINK, "long",
             message="Timed out waiting for the 'Profile' card to be clickable"
         ).click()
         return UpdateProfilePage(self.driver)
\ No newline at end of file
@@ -1,64 +1,144 @@
 # report_generator.py
 
+"""
+Builds TEST_REPORT.md / .pdf / .html from pytest JSON reports.
+
+conftest calls generate() in-process at the end of a run (or starts this
+script detached with --report=background). From the command line:
+
+  python report_generator.py [REPORT ...] [--formats md,pdf,html] [--out-dir DIR]
+"""
+
+import argparse
 import json
+import logging
 import os
 import sys
 from pathlib import Path
+from xml.sax.saxutils import escape
+
+from utils.html_report import HtmlReportWriter
+from utils.log import LOG_JSONL, read_records
+from utils.report_reader import expand_paths, merge_reports, user_property
+from utils.thumbnails import thumbnail_summary, timed_thumbnails
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+# Box a failure screenshot is printed in (inches)
+SCREENSHOT_BOX = (6, 3)
+REPORT_FORMATS = ("md", "pdf", "html")
+LOGO_PATH = Path(__file__).resolve().parent / "assets" / "logo.png"
 
 
-def main():
-    # 1) Locate the JSON report
-    rpt_path = Path("report.json")
-    if not rpt_path.exists():
-        print("⚠️ report.json not found, skipping PDF generation")
-        return
+def failure_message(test: dict) -> str:
+    """Crash message of the phase that failed (call, else setup/teardown errors)."""
+    for phase in ("call", "setup", "teardown"):
+        crash = (test.get(phase) or {}).get("crash")
+        if crash:
+            return crash.get("message", "<no message>")
+    return "<no message>"
 
+
+def load_regressions(created, base_dir="."):
+    """
+    Flags from perf_regressions.json (written by utils/perf_baseline.py), or
+    None if that file is missing or belongs to none of the reports (their
+    "created" stamps).
+    """
+    path = Path(base_dir) / "perf_regressions.json"
+    if not path.exists():
+        return None
     try:
-        data = json.loads(rpt_path.read_text(encoding="utf-8"))
-    except Exception as e:
-        print(f"❌ ERROR reading report.json: {e}", file=sys.stderr)
-        return
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    if data.get("report_created") not in created:
+        return None
+    return data
+
 
-    summary = data.get("summary", {})
-    total  = summary.get("total",   summary.get("collected",  0))
-    passed = summary.get("passed",  0)
-    failed = summary.get("failed",  0)
+def regression_lines(perf: dict) -> list:
+    """One line per flagged series: what, how much slower, against what median."""
+    lines = []
+    for r in perf["regressions"]:
+        unit = r["metric"].rsplit("_", 1)[-1]
+        lines.append(
+            f"{r['kind']} {r['key']} ({r['metric']}): {r['value']:g} {unit} vs. median "
+            f"{r['median']:g} {unit} over {r['runs']} runs, x{r['ratio']:.2f}"
+        )
+    return lines
 
-    # 2) Generate a .md document
+
+def load_test_logs(path) -> dict:
+    """
+    Warnings and errors from the run's JSONL log (utils/log.py), grouped by
+    test node id.
+    """
+    if not path:
+        return {}
+    by_test = {}
+    for record in read_records(path, logging.WARNING):
+        if record.get("test"):
+            by_test.setdefault(record["test"], []).append(record)
+    return by_test
+
+
+def log_line(record: dict) -> str:
+    step = f" [{record['step']}]" if record.get("step") else ""
+    return f"{record['level']}{step} {record['logger']}: {record['msg']}"
+
+
+def write_markdown(report, test_logs, perf, path) -> Path:
+    total  = report.total
+    passed = report.count("passed")
+    failed = report.count("failed")
+    errors = report.count("error")
 
     md_lines = [
         "# Test Report Summary",
         f"- **Total tests:** {total}",
         f"- **Passed:** {passed}",
         f"- **Failed:** {failed}",
-        "",
-        "## Failed Tests Details",
     ]
+    if errors:
+        md_lines.append(f"- **Errors:** {errors}")
+    md_lines += ["", "## Failed Tests Details"]
+
+    for t in report.failed_tests:
+        nodeid_md = t["nodeid"]
+        msg = failure_message(t)
+        md_lines.append(f"- `{nodeid_md}`: {msg}")
+        md_lines += [f"  - `{log_line(r)}`" for r in test_logs.get(nodeid_md, [])]
 
-    for t in data.get("tests", []):
-        if t.get("outcome") == "failed":
-            nodeid_md = t["nodeid"]
-            # look up the assertion message under call.crash.message
-            msg = t.get("call", {}) \
-                .get("crash", {}) \
-                .get("message", "<no message>")
-            md_lines.append(f"- `{nodeid_md}`: {msg}")
+    if perf is not None:
+        md_lines += [
+            "",
+            "## Performance regressions",
+            f"Slower than {perf['factor']}x the median of the last {perf['window']} runs:",
+        ]
+        md_lines += [f"- `{line}`" for line in regression_lines(perf)] or ["- None"]
 
     md_text = "\n".join(md_lines)
-    with open("TEST_REPORT.md", "w", encoding="utf-8") as md_out:
+    with open(path, "w", encoding="utf-8") as md_out:
         md_out.write(md_text)
-    print("✔️ TEST_REPORT.md generated")
+    print(f"✔️ {Path(path).name} generated")
+    return Path(path)
+
+
+def write_pdf(report, test_logs, perf, path, base_dir) -> Path:
+    # ReportLab is only imported when a PDF is actually asked for
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+
+    total  = report.total
+    passed = report.count("passed")
+    failed = report.count("failed")
+    errors = report.count("error")
 
     # 3) Prepare the PDF document
-    pdf_path = Path("TEST_REPORT.pdf")
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        str(path),
         pagesize=letter,
         rightMargin=40, leftMargin=40,
         topMargin=40, bottomMargin=40,
@@ -77,10 +157,9 @@ def main():
     story = []
 
     # 4) Add your logo (centered) if it exists
-    logo_path = Path("assets/logo.png")
-    if logo_path.exists():
+    if LOGO_PATH.exists():
         try:
-            img_logo = Image(str(logo_path), width=2*inch, height=2*inch)
+            img_logo = Image(str(LOGO_PATH), width=2*inch, height=2*inch)
             img_logo.hAlign = "CENTER"
             story.append(img_logo)
             story.append(Spacer(1, 12))
@@ -96,69 +175,188 @@ def main():
     story.append(Paragraph(f"<b>Total tests:</b> {total}", body))
     story.append(Paragraph(f"<b>Passed:</b> {passed}", body))
     story.append(Paragraph(f"<b>Failed:</b> {failed}", body))
+    if errors:
+        story.append(Paragraph(f"<b>Errors:</b> {errors}", body))
     story.append(Spacer(1, 12))
 
     # 7) Failed‐tests header
     story.append(Paragraph("Failed Tests Details", styles["Heading2"]))
     story.append(Spacer(1, 6))
 
-    # 8) Loop through each failed test
-    for t in data.get("tests", []):
-        if t.get("outcome") == "failed":
-            nodeid = t["nodeid"]
-            msg    = t.get("call", {}) \
-                      .get("crash", {}) \
-                      .get("message", "<no message>")
-
-            # —8a) Print the nodeid (bold)
-            safe_node = nodeid.replace("/", " / ")
-            header_text = f"<b>{safe_node}</b>:"
-            story.append(Paragraph(header_text, body))
-            story.append(Spacer(1, 4))
-
-            # —8b) Print the failure message itself (normal text)
-            #     This ensures the failure message appears immediately before any screenshot.
-            story.append(Paragraph(msg, body))
-            story.append(Spacer(1, 8))
-
-            # —8c) Check for a screenshot in user_properties
-            screenshot_path = None
-            for name, value in t.get("user_properties", []):
-                if name == "screenshot":
-                    screenshot_path = value
-                    break
-
-            if screenshot_path:
-                abs_path = Path(os.getcwd()) / screenshot_path
-                print(f"▶️ Found screenshot for {nodeid}: {abs_path} (exists? {abs_path.exists()})")
-
-                if abs_path.is_file():
-                    try:
-                        # Scale to a reasonable size (6" wide, 3" tall)
-                        img = Image(abs_path, width=6 * inch, height=3 * inch)
-                        img.hAlign = "CENTER"
-                        story.append(img)
-                        story.append(Spacer(1, 12))
-                    except Exception as img_err:
-                        story.append(Paragraph(f"[Unable to insert screenshot: {img_err}]", body))
-                        story.append(Spacer(1, 12))
-                else:
-                    story.append(Paragraph("[No screenshot file found]", body))
+    # 8) Downscale the failure screenshots to the size they are printed at
+    screenshots = [
+        base_dir / user_property(t, "screenshot")
+        for t in report.failed_tests if user_property(t, "screenshot")
+    ]
+    thumbs, seconds = timed_thumbnails([p for p in screenshots if p.is_file()], SCREENSHOT_BOX)
+    if thumbs:
+        print(f"🖼️ {thumbnail_summary(thumbs, seconds)}")
+
+    # 9) Loop through each failed test
+    for t in report.failed_tests:
+        nodeid = t["nodeid"]
+        msg    = failure_message(t)
+
+        # —9a) Print the nodeid (bold)
+        safe_node = nodeid.replace("/", " / ")
+        header_text = f"<b>{safe_node}</b>:"
+        story.append(Paragraph(header_text, body))
+        story.append(Spacer(1, 4))
+
+        # —9b) Print the failure message itself (normal text)
+        #     This ensures the failure message appears immediately before any screenshot.
+        story.append(Paragraph(msg, body))
+        story.append(Spacer(1, 8))
+
+        # —9c) Check for a screenshot in user_properties
+        screenshot_path = user_property(t, "screenshot")
+
+        if screenshot_path:
+            abs_path = base_dir / screenshot_path
+            print(f"▶️ Found screenshot for {nodeid}: {abs_path} (exists? {abs_path.exists()})")
+
+            if abs_path.is_file():
+                try:
+                    thumb = thumbs.get(str(abs_path))
+                    if thumb is not None:
+                        width, height = thumb.fit(SCREENSHOT_BOX[0] * inch, SCREENSHOT_BOX[1] * inch)
+                        img = Image(thumb.path, width=width, height=height)
+                    else:
+                        # Not readable by Pillow; embed the original (6" wide, 3" tall)
+                        img = Image(abs_path, width=SCREENSHOT_BOX[0] * inch, height=SCREENSHOT_BOX[1] * inch)
+                    img.hAlign = "CENTER"
+                    story.append(img)
+                    story.append(Spacer(1, 12))
+                except Exception as img_err:
+                    story.append(Paragraph(f"[Unable to insert screenshot: {img_err}]", body))
                     story.append(Spacer(1, 12))
             else:
-                story.append(Paragraph("[No screenshot captured]", body))
+                story.append(Paragraph("[No screenshot file found]", body))
                 story.append(Spacer(1, 12))
+        else:
+            story.append(Paragraph("[No screenshot captured]", body))
+            story.append(Spacer(1, 12))
 
-    # 9) Build the PDF (catch any exceptions)
+        # —9d) Point at the HAR of the network traffic before the failure
+        har_path = user_property(t, "har")
+        if har_path:
+            story.append(Paragraph(f"Network log (HAR): {har_path}", body))
+            story.append(Spacer(1, 12))
+
+        # —9e) Warnings and errors the test logged, with the step they came from
+        records = test_logs.get(nodeid, [])
+        if records:
+            story.append(Paragraph("<b>Logged warnings/errors:</b>", body))
+            for r in records:
+                story.append(Paragraph(escape(log_line(r)), body))
+            story.append(Spacer(1, 12))
+
+    # 10) Performance regressions against the run history
+    if perf is not None:
+        story.append(Paragraph("Performance regressions", styles["Heading2"]))
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(
+            f"Slower than {perf['factor']}x the median of the last {perf['window']} runs:", body
+        ))
+        for line in regression_lines(perf) or ["None"]:
+            story.append(Paragraph(escape(line), body))
+        story.append(Spacer(1, 12))
+
+    # 11) Build the PDF (catch any exceptions)
     print("ℹ️ About to build PDF…")
     try:
         doc.build(story)
-        print("✔️ TEST_REPORT.pdf generated")
+        print(f"✔️ {Path(path).name} generated")
     except Exception as e:
-        print(f"❌ ERROR generating TEST_REPORT.pdf: {e}", file=sys.stderr)
-        fallback = Path("TEST_REPORT_ERROR.txt")
+        print(f"❌ ERROR generating {Path(path).name}: {e}", file=sys.stderr)
+        fallback = Path(path).with_name("TEST_REPORT_ERROR.txt")
         fallback.write_text(f"PDF generation failed:\n{e}\n", encoding="utf-8")
         print(f"ℹ️ Wrote fallback error to {fallback}")
+        return None
+    return Path(path)
+
+
+def generate(reports=("report.json",), formats=REPORT_FORMATS, base_dir=None, out_dir=None,
+             log_path=LOG_JSONL) -> dict:
+    """
+    Build the reports; returns {format: path written}.
+
+    `reports` are files or globs, relative to `base_dir` (default: the
+    current directory), which is also where screenshots and
+    perf_regressions.json are looked up. Output goes to `out_dir` (default
+    `base_dir`). `log_path` is the run's JSONL log ("" or None: none).
+    """
+    unknown = set(formats) - set(REPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown report format(s) {sorted(unknown)}; expected some of {REPORT_FORMATS}")
+    base_dir = Path(base_dir or os.getcwd())
+    out_dir = Path(out_dir) if out_dir else base_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # 1) Locate the JSON reports and stream them into one summary
+    patterns = [p if os.path.isabs(p) else str(base_dir / p) for p in map(str, reports)]
+    paths = expand_paths(patterns)
+    if not paths:
+        print(f"⚠️ No report found ({', '.join(map(str, reports))}), skipping report generation")
+        return {}
+
+    if log_path and not os.path.isabs(log_path):
+        log_path = base_dir / log_path
+    test_logs = load_test_logs(log_path)
+
+    # The HTML report lists every test, so it takes its rows during the same pass
+    html = None
+    if "html" in formats:
+        html = HtmlReportWriter(out_dir / "TEST_REPORT.html", base_dir, failure_message, test_logs, log_line)
+
+    try:
+        report = merge_reports(paths, on_test=html.add_test if html else None)
+    except Exception as e:
+        print(f"❌ ERROR reading {', '.join(paths)}: {e}", file=sys.stderr)
+        return {}
+    if len(paths) > 1:
+        print(f"ℹ️ Merged {report.total} test(s) from {len(paths)} report file(s)")
+
+    perf = load_regressions(report.created, base_dir)
+
+    written = {}
+    if html is not None:
+        written["html"] = html.finish(report, regression_lines(perf) if perf else ())
+        print("✔️ TEST_REPORT.html generated")
+    if "md" in formats:
+        written["md"] = write_markdown(report, test_logs, perf, out_dir / "TEST_REPORT.md")
+    if "pdf" in formats:
+        pdf = write_pdf(report, test_logs, perf, out_dir / "TEST_REPORT.pdf", base_dir)
+        if pdf is not None:
+            written["pdf"] = pdf
+    return written
+
+
+def parse_formats(value: str) -> tuple:
+    return tuple(f.strip().lower() for f in value.split(",") if f.strip())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build TEST_REPORT.md/.pdf/.html from pytest JSON reports.")
+    parser.add_argument(
+        "reports", nargs="*", default=["report.json"],
+        help="report files or globs (.json from pytest-json-report, or .jsonl); default report.json",
+    )
+    parser.add_argument(
+        "--formats", type=parse_formats, default=REPORT_FORMATS,
+        help=f"comma-separated subset of {','.join(REPORT_FORMATS)} (default: all)",
+    )
+    parser.add_argument("--out-dir", default=None, help="where to write the reports (default: current directory)")
+    parser.add_argument(
+        "--log-jsonl", default=os.getenv("CDS_LOG_JSONL", LOG_JSONL),
+        help="the run's JSONL log, for the failed tests' warnings/errors ('' for none)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    generate(args.reports, args.formats, out_dir=args.out_dir, log_path=args.log_jsonl)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+# tests/consumer/functional/test_con_page_load_benchmark.py
+#
+# Wall time of the consumer smoke navigation under each page-load strategy.
+# Skipped unless pytest runs with --benchmark.
+
+import os
+import statistics
+import time
+
+import pytest
+
+from pages.home_page import HomePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+def _smoke_flow(driver, base_url):
+    """The consumer smoke suite's page visits, back to back."""
+    home = HomePage(driver, base_url)
+    home.load()
+    assert home.is_icon_visible()
+    assert home.go_to_all_data_page().is_loaded()
+    home.load()
+    assert home.go_to_sectors().is_loaded()
+    home.load()
+    assert home.go_to_usecases().is_loaded()
+    home.load()
+    assert home.go_to_publishers().is_loaded()
+    home.load()
+    assert home.go_to_about().is_heading_visible()
+
+
+@pytest.mark.benchmark
+def test_con_page_load_benchmark(browser_pool, base_url, record_property):
+    rounds = int(os.getenv("PAGE_LOAD_BENCH_ROUNDS", "3"))
+    strategies = os.getenv("PAGE_LOAD_BENCH_STRATEGIES", "normal,eager,none").split(",")
+    timings = {}
+
+    for strategy in strategies:
+        pool = browser_pool.get(strategy)
+        # Launch outside the timed loop; startup cost isn't what we compare
+        pool.release(pool.acquire())
+
+        timings[strategy] = []
+        for _ in range(rounds):
+            drv = pool.acquire()
+            try:
+                started = time.perf_counter()
+                _smoke_flow(drv, base_url)
+                timings[strategy].append(time.perf_counter() - started)
+            finally:
+                pool.release(drv)
+
+    summary = {
+        strategy: {
+            "median_s": round(statistics.median(values), 3),
+            "min_s": round(min(values), 3),
+            "max_s": round(max(values), 3),
+        }
+        for strategy, values in timings.items()
+    }
+    record_property("page_load_benchmark", summary)
+
+    baseline = summary.get("normal", {}).get("median_s")
+    for strategy, stats in summary.items():
+        relative = ""
+        if baseline and strategy != "normal":
+            relative = f" ({baseline / max(stats['median_s'], 1e-6):.2f}x normal)"
+        # one performance-history series per strategy (utils/perf_baseline.py)
+        log.info("Page-load benchmark, %s over %d round(s): median %.2fs  min %.2fs  max %.2fs%s",
+                 strategy, rounds, stats["median_s"], stats["min_s"], stats["max_s"], relative,
+                 extra={"data": {"key": f"page_load_benchmark.{strategy}", "metric": "median_s",
+                                 "value": stats["median_s"]}})
@@ -0,0 +1,64 @@
+# tests/provider/functional/test_prv_006_api_login.py
+#
+# Exercises the HTTP login path (utils.api_login) against the local OIDC
+# stand-in, so it runs offline and without a browser.
+
+import pytest
+
+from utils.api_login import ApiLogin, LoginError
+from utils.auth_state import state_expiry
+from utils.oidc_stub import CLIENT_ID
+
+
+@pytest.fixture
+def stand_in_user(oidc_stand_in):
+    email, password = next(iter(oidc_stand_in.users.items()))
+    return email, password
+
+
+@pytest.mark.functional
+def test_prv_006_api_login_returns_session_cookies(oidc_stand_in, stand_in_user):
+    email, password = stand_in_user
+    api = ApiLogin(oidc_stand_in.base_url)
+
+    state = api.login(email, password)
+
+    names = {c["name"] for c in state.cookies}
+    assert "next-auth.session-token" in names, f"No app session cookie after API login: {names}"
+    assert "KEYCLOAK_SESSION" in names, f"No Keycloak SSO cookie after API login: {names}"
+    assert state.origin == oidc_stand_in.base_url.rstrip("/")
+    assert state_expiry(state), "Session token carries no expiry, auth-state refresh could not work"
+
+    # the cookies really are a logged-in session
+    resp = api.session.get(oidc_stand_in.base_url + "dashboard")
+    assert "User Dashboard" in resp.text
+
+
+@pytest.mark.functional
+def test_prv_006_api_login_rejects_bad_password(oidc_stand_in, stand_in_user):
+    email, _ = stand_in_user
+    with pytest.raises(LoginError):
+        ApiLogin(oidc_stand_in.base_url).login(email, "not-the-password")
+
+
+@pytest.mark.functional
+def test_prv_006_api_login_reuses_connections(oidc_stand_in, stand_in_user):
+    email, password = stand_in_user
+    api = ApiLogin(oidc_stand_in.base_url)
+    api.login(email, password)
+    before = oidc_stand_in.connections
+    api.login(email, password)
+
+    assert oidc_stand_in.connections == before, (
+        f"Second login opened {oidc_stand_in.connections - before} new connection(s) instead of reusing the pool"
+    )
+
+
+@pytest.mark.functional
+def test_prv_006_password_grant_returns_tokens(oidc_stand_in, stand_in_user):
+    email, password = stand_in_user
+    tokens = ApiLogin(oidc_stand_in.base_url).password_grant(
+        oidc_stand_in.token_url, CLIENT_ID, email, password
+    )
+    assert tokens.get("access_token"), f"No access token in {tokens}"
+    assert tokens.get("token_type") == "Bearer"
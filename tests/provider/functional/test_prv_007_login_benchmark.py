@@ -0,0 +1,67 @@
+# tests/provider/functional/test_prv_007_login_benchmark.py
+#
+# UI login vs. API login + session injection, against the real site.
+# Skipped unless pytest runs with --benchmark.
+
+import os
+import statistics
+import time
+
+import pytest
+
+from pages.home_page import HomePage
+from pages.provider.provider_home_page import ProviderHomePage
+from utils.browser_pool import origin_of, reset_browser
+from utils.browser_state import restore_state, remove_restore_script
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+@pytest.mark.benchmark
+def test_prv_007_login_benchmark(driver, base_url, test_credentials, api_login, record_property):
+    rounds = int(os.getenv("LOGIN_BENCH_ROUNDS", "3"))
+    email, password = test_credentials
+    origins = [origin_of(base_url)]
+    timings = {"ui": [], "api": []}
+
+    for _ in range(rounds):
+        # ── current flow: Keycloak form in the browser ──
+        reset_browser(driver, origins)
+        started = time.perf_counter()
+        home = HomePage(driver, base_url)
+        home.load()
+        prov_home = home.go_to_login(flow="provider", email=email, password=password)
+        assert isinstance(prov_home, ProviderHomePage)
+        timings["ui"].append(time.perf_counter() - started)
+
+        # ── API login, cookies injected, straight to /dashboard ──
+        reset_browser(driver, origins)
+        started = time.perf_counter()
+        state = api_login.login(email, password)
+        script_id = restore_state(driver, state)
+        prov_home = ProviderHomePage(driver, 10)
+        prov_home.load(base_url)
+        assert prov_home.is_header_visible()
+        timings["api"].append(time.perf_counter() - started)
+        remove_restore_script(driver, script_id)
+
+    summary = {
+        mode: {
+            "median_s": round(statistics.median(values), 3),
+            "min_s": round(min(values), 3),
+            "max_s": round(max(values), 3),
+        }
+        for mode, values in timings.items()
+    }
+    record_property("login_benchmark", summary)
+
+    for mode, stats in summary.items():
+        # one performance-history series per login path (utils/perf_baseline.py)
+        log.info("Login benchmark, %s over %d round(s): median %.2fs  min %.2fs  max %.2fs",
+                 mode, rounds, stats["median_s"], stats["min_s"], stats["max_s"],
+                 extra={"data": {"key": f"login_benchmark.{mode}", "metric": "median_s",
+                                 "value": stats["median_s"]}})
+    speedup = summary["ui"]["median_s"] / max(summary["api"]["median_s"], 1e-6)
+    log.info("Login benchmark: API path is %.1fx the speed of the UI login", speedup,
+             extra={"data": {"summary": summary, "speedup": round(speedup, 2)}})
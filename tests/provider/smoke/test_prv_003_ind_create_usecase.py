@@ -16,7 +16,7 @@ from pages.provider.my_dashboard_page import MyDashboardPage
 from pages.provider.create_usecase_page import CreateUsecasePage
 
 @pytest.mark.smoke
-def test_prv_003_ind_create_usecase(driver, sample_logo_path, base_url,test_credentials):
+def test_prv_003_ind_create_usecase(driver, sample_logo_path, provider_home):
     """
     Test Case ID: test_prv_003_ind_create_usecase
     Verify User is able to create a UseCase end-to-end as an Individual provider.
@@ -33,19 +33,8 @@ def test_prv_003_ind_create_usecase(driver, sample_logo_path, base_url,test_cred
       8. Switch to “Publish” tab and click “Publish”.
       9. Assert that the UseCase is marked “Published”.
     """
-    # ─── Step 1: Load Homepage ──────────────────────────────────────────────────────
-    driver.delete_all_cookies()
-    email, password = test_credentials
-    home = HomePage(driver, base_url)
-    try:
-        if not home.is_loaded():
-            home.load()
-            assert home.is_loaded(), "Homepage did not load successfully"
-    except Exception as e:
-        print(f"Error loading homepage: {e}")
-
-    # ─── Step 2: Login as provider (auto-fill) ───────────────────────────────────────
-    prov_home = home.go_to_login(flow="provider", email=email, password=password,)
+    # ─── Steps 1–2: Homepage + provider login (restored session when possible) ────────
+    prov_home = provider_home
     assert isinstance(prov_home, ProviderHomePage), (
         f"Expected ProviderHomePage after auto-login, got {type(prov_home)}"
     )
@@ -10,7 +10,7 @@ from pages.provider.update_profile_page import UpdateProfilePage
 
 
 @pytest.mark.smoke
-def test_prv_005_ind_edit_profile(driver, sample_csv_path, base_url, test_credentials):
+def test_prv_005_ind_edit_profile(driver, sample_csv_path, provider_home):
     """
         Test Case ID: test_prv_005_ind_edit_profile
         Verify User is able to edit profile details.
@@ -25,21 +25,10 @@ def test_prv_005_ind_edit_profile(driver, sample_csv_path, base_url, test_creden
           9. Assert the profile details are updated
         """
 
-    driver.delete_all_cookies()
-    # Step 1: load homepage
-    home = HomePage(driver, base_url)
-    email, password = test_credentials
-    try:
-        if not home.is_loaded():
-            home.load()
-            assert home.is_loaded(), "Homepage did not load successfully"
-    except Exception as e:
-        print(f"Error loading homepage: {e}")
-
-    # Step 2: Login as provider (auto-redirects to /dashboard)
-    prov_home = home.go_to_login(flow="provider", email=email, password=password)
+    # Steps 1–2: homepage + provider login (restored from the session cache when possible)
+    prov_home = provider_home
     assert isinstance(prov_home, ProviderHomePage), (
-        "test_prv_005: expected HomePage.go_to_login(flow='provider') to return ProviderHomePage"
+        "test_prv_005: expected the provider_home fixture to return ProviderHomePage"
     )
 
     # Step 3: In the “ProviderHomePage” (the /dashboard screen), click “My Dashboard”
@@ -0,0 +1,98 @@
+# tests/unit/test_artifacts.py
+#
+# What each ARTIFACT_LEVEL captures, with a fake driver writing into tmp_path.
+
+import base64
+from pathlib import Path
+
+import pytest
+
+import utils.artifacts as artifacts
+from utils.artifacts import ArtifactManager
+
+PNG = b"\x89PNG fake"
+
+
+class FakeDriver:
+    page_source = "<html>page</html>"
+
+    def __init__(self, broken=False):
+        self.broken = broken
+
+    def get_screenshot_as_base64(self):
+        if self.broken:
+            raise RuntimeError("session gone")
+        return base64.b64encode(PNG).decode()
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", Path("artifacts"))
+    made = []
+
+    def make(level):
+        m = ArtifactManager(level)
+        m.base_dir = tmp_path
+        m.start_test(FakeDriver(), "tests/x.py::test_y[a b]")
+        made.append(m)
+        return m
+
+    yield make
+    for m in made:
+        m.close()
+
+
+def run_steps(m):
+    driver = m.driver
+    m.capture_step(driver, "after login")
+    m.step_finished("Page.publish")
+    m.capture_failure(driver, "publish failed")
+    return m.end_test()
+
+
+def test_off_captures_nothing(manager):
+    assert run_steps(manager("off")) == []
+
+
+def test_failure_captures_only_failure_paths(manager, tmp_path):
+    saved = run_steps(manager("failure"))
+    assert [p.rsplit("/", 1)[-1] for p in saved] == ["01_publish_failed.png", "01_publish_failed.html"]
+    # relative to base_dir (the invocation dir), not to the current directory
+    assert saved[0] == "artifacts/tests_x.py_test_y_a_b/01_publish_failed.png"
+    folder = tmp_path / "artifacts" / "tests_x.py_test_y_a_b"
+    assert (folder / "01_publish_failed.png").read_bytes() == PNG
+    assert (folder / "01_publish_failed.html").read_text(encoding="utf-8") == "<html>page</html>"
+
+
+def test_step_captures_checkpoints_and_steps_in_order(manager):
+    saved = run_steps(manager("step"))
+    assert [p.rsplit("/", 1)[-1] for p in saved] == [
+        "01_after_login.png",
+        "02_Page.publish.png",
+        "03_publish_failed.png",
+        "03_publish_failed.html",
+    ]
+
+
+def test_steps_after_end_test_capture_nothing(manager):
+    m = manager("step")
+    m.end_test()
+    m.step_finished("Page.publish")
+    assert m.end_test() == []
+
+
+def test_capture_error_is_swallowed(manager):
+    m = manager("failure")
+    m.capture_failure(FakeDriver(broken=True), "publish failed")
+    assert m.end_test() == []
+
+
+def test_files_stay_under_base_dir_when_the_test_changes_directory(manager, tmp_path, monkeypatch):
+    m = manager("failure")
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    m.capture_failure(m.driver, "boom")
+    m.end_test()
+    assert (tmp_path / "artifacts" / "tests_x.py_test_y_a_b" / "01_boom.png").exists()
+    assert not (elsewhere / "artifacts").exists()
@@ -0,0 +1,69 @@
+# tests/unit/test_auth_state.py
+#
+# Expiry checks of saved login states (utils/auth_state.py), on hand-built
+# BrowserStates with unsigned JWTs.
+
+import base64
+import json
+
+from utils.auth_state import EXPIRY_MARGIN, AuthStateStore, state_expiry
+from utils.browser_state import BrowserState
+
+NOW = 1_700_000_000
+
+
+def jwt(exp):
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+    return f"{part({'alg': 'none'})}.{part({'exp': exp})}.sig"
+
+
+def state(cookies=(), local=None, session=None, captured_at=NOW):
+    return BrowserState(list(cookies), "https://example.org", local or {}, session or {}, captured_at)
+
+
+def test_expiry_is_the_earliest_auth_cookie_or_jwt():
+    s = state(
+        cookies=[
+            {"name": "KEYCLOAK_SESSION", "value": "x", "expires": NOW + 900},
+            {"name": "access_token", "value": jwt(NOW + 600)},
+            # not an auth cookie: its expiry doesn't matter
+            {"name": "consent", "value": "yes", "expires": NOW + 10},
+        ],
+        local={"oidc.user": json.dumps({"id_token": jwt(NOW + 300)})},
+    )
+    assert state_expiry(s) == NOW + 300
+
+
+def test_no_expiry_in_session_cookies_or_opaque_values():
+    s = state(cookies=[{"name": "session", "value": "opaque", "expires": -1}], session={"k": "not a jwt"})
+    assert state_expiry(s) is None
+
+
+def test_is_expired_by_ttl_or_token():
+    store = AuthStateStore(ttl=1800)
+    assert not store.is_expired(state(), now=NOW + 1799)
+    assert store.is_expired(state(), now=NOW + 1801)
+
+    token = state(cookies=[{"name": "access_token", "value": jwt(NOW + 120)}])
+    assert not store.is_expired(token, now=NOW + 120 - EXPIRY_MARGIN - 1)
+    # within the margin counts as expired already
+    assert store.is_expired(token, now=NOW + 120 - EXPIRY_MARGIN)
+
+
+def test_get_drops_expired_states_and_counts_nothing():
+    store = AuthStateStore(ttl=0)
+    store.put("a@example.org", state(captured_at=1))
+    assert store.get("a@example.org") is None
+    assert store.get("a@example.org") is None  # invalidated
+    assert (store.logins, store.api_logins, store.restores) == (0, 0, 0)
+
+
+def test_counters_are_explicit():
+    store = AuthStateStore()
+    store.put("a@example.org", state(captured_at=None))
+    assert store.get("a@example.org") is not None
+    store.count_login()
+    store.count_login(api=True)
+    store.count_restore()
+    assert (store.logins, store.api_logins, store.restores) == (1, 1, 1)
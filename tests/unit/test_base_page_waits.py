@@ -0,0 +1,86 @@
+# tests/unit/test_base_page_waits.py
+#
+# BasePage's wait engine on a fake driver; no browser.
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from pages.base_page import WAIT_STATS, BasePage
+
+
+class FakeElement:
+    def is_displayed(self):
+        return True
+
+
+class FakeDriver:
+    """find_elements() answers from a {locator value: element count} map."""
+
+    def __init__(self, present):
+        self.present = present
+
+    def find_elements(self, by, value):
+        return [FakeElement()] * self.present.get(value, 0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    WAIT_STATS.reset()
+    yield
+    WAIT_STATS.reset()
+
+
+def test_wait_for_any_charges_the_locator_that_matched():
+    page = BasePage(FakeDriver({"//login": 1}))
+    assert page.wait_for_any(["//header", "//login"], "instant") == 1
+    (call,) = WAIT_STATS.calls
+    assert call["locator"] == "//login" and not call["timed_out"]
+
+
+def test_wait_for_any_timeout_charges_all_locators():
+    page = BasePage(FakeDriver({}))
+    with pytest.raises(TimeoutException):
+        page.wait_for_any(["//header", "//login"], "instant")
+    (call,) = WAIT_STATS.calls
+    assert call["locator"] == "//header or //login" and call["timed_out"]
+
+
+class NavigatingDriver:
+    """Documents are identified by timeOrigin; a new one shows up `lag` readiness checks after get()."""
+
+    def __init__(self, url, lag=1):
+        self.url, self.origin, self.lag = url, 1000.0, lag
+        self.pending = None
+        self.checks = 0
+
+    def get(self, url):
+        url_base, _, fragment = url.partition("#")
+        if fragment and url_base == self.url.partition("#")[0]:
+            self.url = url  # fragment navigation: same document
+        else:
+            self.pending = (url, self.origin + 1, self.lag)
+
+    def execute_script(self, script, *args):
+        if script.startswith("return [performance.timeOrigin"):
+            return [self.origin, self.url]
+        self.checks += 1
+        if self.pending:
+            url, origin, lag = self.pending
+            self.pending = (url, origin, lag - 1) if lag else None
+            if not lag:
+                self.url, self.origin = url, origin
+        return self.origin != args[0]
+
+
+def test_visit_waits_for_the_new_document():
+    driver = NavigatingDriver("https://site.test/a")
+    BasePage(driver).visit("https://site.test/b")
+    assert driver.url == "https://site.test/b" and driver.checks == 2
+
+
+def test_visit_to_a_fragment_of_the_same_page_does_not_wait():
+    driver = NavigatingDriver("https://site.test/a")
+    BasePage(driver).visit("https://site.test/a#section")
+    assert driver.origin == 1000.0 and driver.checks == 1
+    (call,) = WAIT_STATS.calls
+    assert not call["timed_out"]
@@ -0,0 +1,145 @@
+# tests/unit/test_browser_pool.py
+#
+# BrowserPool recycling and retirement with fake drivers; no browser.
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.browser_pool import BrowserPool, BrowserPools, origin_of
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+        self.quit_called = False
+        self.fail_reset = False
+        self.current_url = "about:blank"
+        self.cdp = []
+        self.switch_to = self
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        return ["main"]
+
+    def window(self, handle):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.fail_reset:
+            raise WebDriverException("tab crashed")
+        self.cdp.append((cmd, params))
+
+    def get(self, url):
+        self.current_url = url
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Launcher:
+    def __init__(self):
+        self.launched = []
+
+    def __call__(self):
+        driver = FakeDriver(f"browser-{len(self.launched)}")
+        self.launched.append(driver)
+        return driver, f"/tmp/profile-{len(self.launched)}"
+
+
+def make_pool(**kwargs):
+    launcher = Launcher()
+    discarded = []
+    pool = BrowserPool(launcher, discard_profile=discarded.append, **kwargs)
+    return pool, launcher, discarded
+
+
+def test_released_browser_is_reset_and_reused():
+    pool, launcher, _ = make_pool(origins=["https://site.test"])
+    first = pool.acquire()
+    pool.release(first)
+
+    assert pool.acquire() is first
+    assert pool.launches == 1
+    assert ("Storage.clearDataForOrigin", {"origin": "https://site.test", "storageTypes": "all"}) in first.cdp
+
+
+def test_browser_is_retired_after_max_uses():
+    pool, launcher, discarded = make_pool(max_uses=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+
+    assert driver.quit_called and discarded == ["/tmp/profile-1"]
+    assert pool.acquire() is not driver
+    assert pool.launches == 2 and pool.retired == 1
+
+
+def test_unhealthy_or_dead_browsers_are_retired():
+    pool, _, _ = make_pool()
+    failed = pool.acquire()
+    pool.release(failed, healthy=False)
+    assert failed.quit_called
+
+    crashed = pool.acquire()
+    crashed.alive = False
+    pool.release(crashed)
+    assert crashed.quit_called and pool.retired == 2
+
+
+def test_failed_reset_retires_the_browser():
+    pool, _, _ = make_pool()
+    driver = pool.acquire()
+    driver.fail_reset = True
+    pool.release(driver)
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+
+
+def test_idle_browser_that_died_is_replaced():
+    pool, _, _ = make_pool()
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.alive = False
+
+    assert pool.acquire() is not driver
+    assert driver.quit_called and pool.launches == 2
+
+
+def test_foreign_driver_is_quit_on_release():
+    pool, _, _ = make_pool()
+    stranger = FakeDriver("stranger")
+    pool.release(stranger)
+    assert stranger.quit_called and pool.retired == 0
+
+
+def test_close_retires_idle_and_busy_browsers():
+    pool, _, discarded = make_pool()
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.quit_called and busy.quit_called and len(discarded) == 2
+
+
+def test_pools_are_kept_apart_per_launch_configuration():
+    made = []
+
+    def make_launcher(key):
+        made.append(key)
+        return Launcher()
+
+    pools = BrowserPools(make_launcher, max_uses=5)
+    assert pools.get("eager") is pools.get("eager")
+    assert pools.get("normal") is not pools.get("eager")
+    assert made == ["eager", "normal"]
+
+
+def test_origin_of():
+    assert origin_of("https://site.test:8443/a/b?c") == "https://site.test:8443"
+    assert origin_of("about:blank") is None
+    assert origin_of(None) is None
@@ -0,0 +1,96 @@
+# tests/unit/test_chrome_profile.py
+#
+# Profile template baking and cloning on tmp_path; `bake` is a fake that
+# writes a few files instead of launching Chrome.
+
+import os
+import shutil
+
+import pytest
+
+import utils.chrome_profile as chrome_profile
+from utils.chrome_profile import ProfileReaper, clone_profile, ensure_template, load_seed
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(chrome_profile, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(chrome_profile, "installed_browser_version", lambda browser: "126.0.1")
+    monkeypatch.setattr(chrome_profile, "_template", {})
+    return tmp_path
+
+
+class Bake:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self, path):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("chrome crashed")
+        os.makedirs(os.path.join(path, "Default", "Cache"))
+        with open(os.path.join(path, "Default", "Preferences"), "w") as f:
+            f.write("{}")
+        with open(os.path.join(path, "Default", "Cache", "data_0"), "wb") as f:
+            f.write(b"\0" * 1024)
+        with open(os.path.join(path, "SingletonLock"), "w") as f:
+            f.write("host-123")
+        with open(os.path.join(path, "lockfile"), "w") as f:
+            f.write("")
+        return {"origin": "https://site.test", "cookies": [], "local": {"consent": "yes"}}
+
+
+def test_template_is_baked_once_per_major_version(cache):
+    bake = Bake()
+    path = ensure_template(bake)
+    assert path == cache / "chrome-profile-126"
+    assert load_seed(path)["local"] == {"consent": "yes"}
+
+    # a later process finds the fresh template and doesn't bake again
+    chrome_profile._template.clear()
+    assert ensure_template(bake) == path
+    assert bake.calls == 1
+
+
+def test_stale_template_is_rebaked(cache, monkeypatch):
+    bake = Bake()
+    path = ensure_template(bake)
+    marker = path / chrome_profile.READY_MARKER
+    os.utime(marker, (0, 0))
+    chrome_profile._template.clear()
+    ensure_template(bake)
+    assert bake.calls == 2
+
+
+def test_failed_bake_falls_back_to_empty_profiles(cache):
+    assert ensure_template(Bake(fail=True)) is None
+    # neither a template nor a half-built one is left behind
+    assert [p.name for p in cache.iterdir()] == ["chrome-profile-126.lock"]
+
+
+def test_clone_copies_the_profile_without_locks_or_bookkeeping(cache):
+    template = ensure_template(Bake())
+    os.symlink("Default/Preferences", template / "prefs-link")
+    clone = clone_profile(template)
+    try:
+        assert open(os.path.join(clone, "Default", "Preferences")).read() == "{}"
+        assert os.path.getsize(os.path.join(clone, "Default", "Cache", "data_0")) == 1024
+        assert os.path.islink(os.path.join(clone, "prefs-link"))
+        for skipped in ("SingletonLock", "lockfile", chrome_profile.READY_MARKER, chrome_profile.SEED_FILE):
+            assert not os.path.exists(os.path.join(clone, skipped))
+        # the clone is independent: writing it leaves the template alone
+        with open(os.path.join(clone, "Default", "Preferences"), "w") as f:
+            f.write('{"changed": true}')
+        assert (template / "Default" / "Preferences").read_text() == "{}"
+    finally:
+        shutil.rmtree(clone, ignore_errors=True)
+
+
+def test_reaper_deletes_in_the_background(tmp_path):
+    doomed = tmp_path / "retired-profile"
+    (doomed / "Default").mkdir(parents=True)
+    reaper = ProfileReaper()
+    reaper.reap(str(doomed))
+    reaper.drain(timeout=10)
+    assert not doomed.exists()
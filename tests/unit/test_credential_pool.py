@@ -0,0 +1,65 @@
+# tests/unit/test_credential_pool.py
+#
+# Account leasing through lock files under tmp_path; no site needed.
+
+import pytest
+
+from utils.credential_pool import CredentialPool, discover_credentials
+
+ACCOUNTS = [(1, "a@test", "pa"), (2, "b@test", "pb")]
+
+
+@pytest.fixture(autouse=True)
+def controller(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+
+
+def pool(tmp_path, **kwargs):
+    return CredentialPool(ACCOUNTS, tmp_path / "locks", **kwargs)
+
+
+def test_two_pools_sharing_a_lock_dir_never_share_an_account(tmp_path):
+    first = pool(tmp_path).acquire()
+    second = pool(tmp_path).acquire()
+    assert {first.index, second.index} == {1, 2}
+    first.release()
+    second.release()
+
+
+def test_all_busy_times_out(tmp_path):
+    leases = [pool(tmp_path).acquire() for _ in ACCOUNTS]
+    with pytest.raises(TimeoutError):
+        pool(tmp_path, wait_timeout=0.3, poll_interval=0.1).acquire()
+    for lease in leases:
+        lease.release()
+
+
+def test_released_account_can_be_leased_again(tmp_path):
+    holder = pool(tmp_path)
+    with holder.lease() as lease:
+        held = lease.index
+    other = pool(tmp_path, wait_timeout=0).acquire()
+    assert other.index == held
+    other.release()
+
+
+def test_worker_starts_at_its_own_slot(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    lease = pool(tmp_path).acquire()
+    assert lease.index == 2
+    lease.release()
+
+
+def test_empty_pool_fails_clearly(tmp_path):
+    with pytest.raises(RuntimeError, match="empty"):
+        CredentialPool([], tmp_path).acquire()
+
+
+def test_discover_credentials_needs_both_halves_and_honours_the_pin():
+    environ = {
+        "TEST_EMAIL_2": "b@test", "TEST_PASSWORD_2": "pb",
+        "TEST_EMAIL_1": "a@test", "TEST_PASSWORD_1": "pa",
+        "TEST_EMAIL_3": "c@test",
+    }
+    assert discover_credentials(environ) == [(1, "a@test", "pa"), (2, "b@test", "pb")]
+    assert discover_credentials({**environ, "TEST_USER_INDEX": "2"}) == [(2, "b@test", "pb")]
@@ -0,0 +1,94 @@
+# tests/unit/test_driver_resolver.py
+#
+# Driver resolution against a cache file under tmp_path; the browser version
+# probe and the download are faked, so nothing touches the network.
+
+import json
+import os
+
+import pytest
+
+import utils.driver_resolver as resolver
+
+
+def executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setattr(resolver, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(resolver, "CACHE_FILE", tmp_path / "drivers.json")
+    monkeypatch.setattr(resolver, "_resolved", {})
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.delenv("DRIVER_OFFLINE", raising=False)
+    monkeypatch.setattr(resolver, "installed_browser_version", lambda browser: "126.0.6478.55")
+    downloads = []
+
+    def download(browser):
+        downloads.append(browser)
+        return executable(tmp_path / f"downloaded-{len(downloads)}")
+
+    monkeypatch.setattr(resolver, "_download", download)
+    env = type("Env", (), {})()
+    env.dir, env.downloads = tmp_path, downloads
+    return env
+
+
+def write_cache(env, entries):
+    (env.dir / "drivers.json").write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_miss_downloads_once_and_caches(env):
+    path = resolver.resolve_driver("chrome")
+    assert env.downloads == ["chrome"]
+    cache = json.loads((env.dir / "drivers.json").read_text(encoding="utf-8"))
+    assert cache["chrome-126"]["path"] == path
+
+    # a fresh process reads the cache instead of downloading
+    resolver._resolved.clear()
+    assert resolver.resolve_driver("chrome") == path
+    assert env.downloads == ["chrome"]
+
+
+def test_cached_driver_for_another_major_is_not_used_online(env):
+    write_cache(env, {"chrome-125": {"path": executable(env.dir / "old"), "resolved_at": 1}})
+    resolver.resolve_driver("chrome")
+    assert env.downloads == ["chrome"]
+
+
+def test_offline_falls_back_to_the_newest_cached_driver(env):
+    newest = executable(env.dir / "newest")
+    write_cache(env, {
+        "chrome-124": {"path": executable(env.dir / "older"), "resolved_at": 1},
+        "chrome-125": {"path": newest, "resolved_at": 2},
+        "chrome-120": {"path": str(env.dir / "deleted"), "resolved_at": 3},
+    })
+    assert resolver.resolve_driver("chrome", offline=True) == newest
+    assert env.downloads == []
+
+
+def test_offline_without_a_cached_driver_fails_clearly(env):
+    with pytest.raises(RuntimeError, match="Offline mode"):
+        resolver.resolve_driver("chrome", offline=True)
+    assert env.downloads == []
+
+
+def test_pinned_path_wins(env, monkeypatch):
+    pinned = executable(env.dir / "pinned")
+    monkeypatch.setenv("CHROMEDRIVER_PATH", pinned)
+    assert resolver.resolve_driver("chrome") == pinned
+    assert env.downloads == []
+
+
+def test_pinned_path_must_be_executable(env, monkeypatch):
+    monkeypatch.setenv("CHROMEDRIVER_PATH", os.path.join(env.dir, "missing"))
+    with pytest.raises(RuntimeError, match="not an executable"):
+        resolver.resolve_driver("chrome")
+
+
+def test_unsupported_browser(env):
+    with pytest.raises(ValueError):
+        resolver.resolve_driver("safari")
@@ -0,0 +1,150 @@
+# tests/unit/test_flaky_db.py
+#
+# Result extraction and flake scoring of utils/flaky_db.py, against a
+# throwaway SQLite database under tmp_path.
+
+import json
+from itertools import count
+
+import pytest
+
+import utils.flaky_db as flaky_db
+from utils.flaky_db import FlakyDB, results_from_report
+
+_created = count(1)
+
+
+def write_report(path, tests, created=None):
+    created = next(_created) if created is None else created
+    path.write_text(json.dumps({"created": created, "tests": tests}), encoding="utf-8")
+    return path
+
+
+def entry(nodeid, outcome, seconds=1.0, browser="chrome", **props):
+    if browser:
+        props["browser"] = browser
+    return {
+        "nodeid": nodeid, "outcome": outcome, "call": {"duration": seconds},
+        "user_properties": [{name: value} for name, value in props.items()],
+    }
+
+
+def test_results_from_report_counts_reruns_and_retries(tmp_path):
+    report = write_report(tmp_path / "report.json", [
+        entry("t::rerun", "rerun"),
+        entry("t::rerun", "rerun"),
+        entry("t::rerun", "passed", 2.0),
+        entry("t::retried", "passed", retries=1),
+        entry("t::plain", "failed", 3.0),
+    ], created=5.0)
+
+    created, results = results_from_report(report)
+
+    assert created == 5.0
+    assert sorted(results) == [
+        ("t::plain", "failed", 0, 3.0),
+        ("t::rerun", "passed", 2, 2.0),
+        ("t::retried", "passed", 1, 1.0),
+    ]
+
+
+def test_quarantined_xfail_and_xpass_count_as_their_real_result(tmp_path):
+    report = write_report(tmp_path / "report.json", [
+        entry("t::q_failed", "xfailed", quarantined=0.4),
+        entry("t::q_passed", "xpassed", quarantined=0.4),
+        entry("t::real_xfail", "xfailed"),
+    ])
+
+    _, results = results_from_report(report)
+
+    assert {nodeid: outcome for nodeid, outcome, _, _ in results} == {
+        "t::q_failed": "failed", "t::q_passed": "passed", "t::real_xfail": "xfailed",
+    }
+
+
+def test_only_browser_tests_are_recorded(tmp_path):
+    report = write_report(tmp_path / "report.json", [
+        entry("tests/unit/test_x.py::test_pure", "passed", browser=None),
+        {"nodeid": "t::stepped", "outcome": "passed", "steps": []},
+        entry("t::driven", "failed"),
+    ])
+
+    _, results = results_from_report(report)
+
+    assert sorted(nodeid for nodeid, *_ in results) == ["t::driven", "t::stepped"]
+
+
+def test_unit_test_runs_leave_history_and_file_alone(tmp_path):
+    report = write_report(tmp_path / "report.json", [entry("t::pure", "failed", browser=None)])
+    out = tmp_path / "flaky_tests.json"
+
+    assert flaky_db.record_outcomes(report, out_path=out, db_path=tmp_path / "flaky.sqlite") == []
+    assert not out.exists() and not (tmp_path / "flaky.sqlite").exists()
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    sha = {"value": "aaa"}
+    monkeypatch.setattr(flaky_db, "git_sha", lambda: sha["value"])
+    database = FlakyDB(tmp_path / "flaky.sqlite")
+    database.sha = sha
+    yield database
+    database.close()
+
+
+def run(db, tmp_path, sha, *tests):
+    db.sha["value"] = sha
+    return db.record(*results_from_report(write_report(tmp_path / "report.json", list(tests))))
+
+
+def by_nodeid(scores):
+    return {s["nodeid"]: s for s in scores}
+
+
+def test_failure_on_a_sha_that_also_passed_is_flaky(db, tmp_path):
+    run(db, tmp_path, "aaa", entry("t::flaky", "passed"), entry("t::broken", "passed"))
+    run(db, tmp_path, "aaa", entry("t::flaky", "failed", 4.0))
+    # broken only fails after the code changed: a real failure, not a flake
+    run(db, tmp_path, "bbb", entry("t::broken", "failed", 2.0))
+
+    scores = by_nodeid(db.scores())
+
+    assert scores["t::flaky"]["flaky_failures"] == 1
+    assert scores["t::flaky"]["flake_rate"] == 0.5
+    assert scores["t::flaky"]["time_to_failure_s"] == {"median": 4.0, "p90": 4.0}
+    assert scores["t::broken"]["flaky_failures"] == 0
+    assert scores["t::broken"]["flake_rate"] == 0.0
+    assert scores["t::broken"]["fail_rate"] == 0.5
+
+
+def test_pass_after_retry_is_flaky(db, tmp_path):
+    run(db, tmp_path, "aaa", entry("t::x", "passed", retries=2))
+    run(db, tmp_path, "aaa", entry("t::x", "passed"))
+    assert by_nodeid(db.scores())["t::x"]["retried_passes"] == 1
+    assert by_nodeid(db.scores())["t::x"]["flake_rate"] == 0.5
+
+
+def test_window_is_per_test_not_per_run(db, tmp_path):
+    run(db, tmp_path, "aaa", entry("t::slow_suite", "passed"))
+    run(db, tmp_path, "aaa", entry("t::slow_suite", "failed"))
+    for _ in range(5):
+        run(db, tmp_path, "aaa", entry("t::other", "passed"))
+
+    scores = by_nodeid(db.scores(window=3))
+
+    assert scores["t::slow_suite"]["runs"] == 2
+    assert scores["t::slow_suite"]["flaky_failures"] == 1
+    assert scores["t::other"]["runs"] == 3
+
+
+def test_reports_without_results_are_not_recorded(db, tmp_path):
+    assert run(db, tmp_path, "aaa") is None
+    assert db.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+
+
+def test_quarantine_needs_min_runs(db, tmp_path):
+    for outcome in ("passed", "failed", "passed", "failed"):
+        run(db, tmp_path, "aaa", entry("t::x", outcome))
+    assert db.quarantined(rate=0.2, min_runs=5) == {}
+    run(db, tmp_path, "aaa", entry("t::x", "passed"))
+    assert db.quarantined(rate=0.2, min_runs=5) == {"t::x": 0.4}
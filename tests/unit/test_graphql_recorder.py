@@ -0,0 +1,73 @@
+# tests/unit/test_graphql_recorder.py
+#
+# Per-test GraphQL calls and run-level stats, from a NetworkCollector fed
+# through a fake driver; no browser.
+
+import json
+
+from utils.graphql_recorder import GraphqlRunStats, graphql_calls, histogram, percentile
+from utils.network_collector import NetworkCollector
+
+
+class FakeDriver:
+    def __init__(self):
+        self.pending = []
+
+    def log(self, method, **params):
+        self.pending.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def get_log(self, kind):
+        entries, self.pending = self.pending, []
+        return entries
+
+
+def post(driver, rid, body, started, finished, status=200, size=100):
+    driver.log("Network.requestWillBeSent", requestId=rid, timestamp=started, wallTime=started,
+               request={"url": "https://site.test/graphql", "method": "POST", "postData": json.dumps(body)})
+    driver.log("Network.responseReceived", requestId=rid, timestamp=finished,
+               response={"status": status, "mimeType": "application/json"})
+    driver.log("Network.loadingFinished", requestId=rid, timestamp=finished, encodedDataLength=size)
+
+
+def test_graphql_calls_one_entry_per_operation():
+    driver = FakeDriver()
+    post(driver, "1", {"query": "query Datasets { datasets { id } }"}, 1.0, 1.25)
+    post(driver, "2", [{"query": "{ me { id } }"}, {"query": "mutation Save { save(id: 1) { ok } }"}],
+         2.0, 2.5, status=500)
+
+    calls = graphql_calls(NetworkCollector(driver))
+
+    assert [(c["operation"], c["type"], c["latency_ms"], c["batched"], c["status"]) for c in calls] == [
+        ("Datasets", "query", 250.0, False, 200),
+        ("me", "query", 500.0, True, 500),
+        ("Save", "mutation", 500.0, True, 500),
+    ]
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 99) == 10
+    assert percentile([], 50) is None
+
+
+def test_histogram_buckets():
+    counts = histogram([10, 50, 51, 20000])
+    assert counts["<=50"] == 2 and counts["<=100"] == 1 and counts[">10000"] == 1
+
+
+def test_run_stats_summary():
+    stats = GraphqlRunStats()
+    call = {"type": "query", "variables_bytes": 10, "response_bytes": 2048, "status": 200, "error": None}
+    stats.add("t::a", [{**call, "operation": "Datasets", "latency_ms": 100.0},
+                       {**call, "operation": "Datasets", "latency_ms": 300.0}])
+    stats.add("t::b", [{**call, "operation": "Me", "latency_ms": None, "status": None, "error": "net::ERR_FAILED"}])
+
+    summary = stats.summary()
+
+    assert list(summary) == ["Datasets", "Me"]
+    assert summary["Datasets"]["count"] == 2 and summary["Datasets"]["p50_ms"] == 100.0
+    assert summary["Datasets"]["total_ms"] == 400.0 and summary["Datasets"]["max_ms"] == 300.0
+    assert summary["Me"]["errors"] == 1 and summary["Me"]["p50_ms"] is None
+    assert stats.calls == 3 and stats.tests == {"t::a": 2, "t::b": 1}
@@ -0,0 +1,95 @@
+# tests/unit/test_har.py
+#
+# HAR 1.2 export (utils/har.py) of hand-written performance-log entries fed
+# through a fake driver; no browser.
+
+import json
+
+from utils.har import build_har, save_har
+from utils.network_collector import NetworkCollector
+
+REQUEST_KEYS = {"method", "url", "httpVersion", "cookies", "headers", "queryString", "headersSize", "bodySize"}
+RESPONSE_KEYS = {"status", "statusText", "httpVersion", "cookies", "headers", "content", "redirectURL",
+                 "headersSize", "bodySize"}
+TIMING_KEYS = {"blocked", "dns", "connect", "ssl", "send", "wait", "receive"}
+
+
+class FakeDriver:
+    def __init__(self, bodies=None):
+        self.pending = []
+        self.bodies = bodies or {}
+
+    def log(self, method, **params):
+        self.pending.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def get_log(self, kind):
+        entries, self.pending = self.pending, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+
+
+def traffic(driver):
+    # a redirect, then a timed GraphQL POST
+    driver.log("Network.requestWillBeSent", requestId="1", type="Document", timestamp=10.0, wallTime=1_700_000_000.0,
+               request={"url": "https://site.test/old?a=1", "method": "GET", "headers": {"Accept": "*/*"}})
+    driver.log("Network.requestWillBeSent", requestId="1", type="Document", timestamp=10.1, wallTime=1_700_000_000.1,
+               request={"url": "https://site.test/new", "method": "GET"},
+               redirectResponse={"status": 302, "headers": {"Location": "/new"}, "protocol": "h2"})
+    driver.log("Network.responseReceived", requestId="1", timestamp=10.3,
+               response={"status": 200, "statusText": "OK", "mimeType": "text/html", "protocol": "h2",
+                         "remoteIPAddress": "10.0.0.1",
+                         "timing": {"requestTime": 10.15, "dnsStart": 1, "dnsEnd": 3, "connectStart": 3,
+                                    "connectEnd": 9, "sslStart": 5, "sslEnd": 9, "sendStart": 10,
+                                    "sendEnd": 11, "receiveHeadersEnd": 61}})
+    driver.log("Network.loadingFinished", requestId="1", timestamp=10.3, encodedDataLength=2048)
+    driver.log("Network.requestWillBeSent", requestId="2", type="Fetch", timestamp=11.0, wallTime=1_700_000_001.0,
+               request={"url": "https://site.test/graphql", "method": "POST",
+                        "headers": {"Content-Type": "application/json"}, "postData": '{"query":"{ me }"}'})
+    driver.log("Network.loadingFailed", requestId="2", timestamp=11.5, errorText="net::ERR_ABORTED")
+
+
+def test_har_has_the_1_2_shape():
+    driver = FakeDriver(bodies={"1": "<html></html>"})
+    traffic(driver)
+
+    har = build_har(driver, bodies=True)["log"]
+
+    assert har["version"] == "1.2" and har["creator"]["name"] and har["pages"] == []
+    redirect, page, failed = har["entries"]
+    for entry in (redirect, page, failed):
+        assert REQUEST_KEYS <= entry["request"].keys() and RESPONSE_KEYS <= entry["response"].keys()
+        assert entry["timings"].keys() == TIMING_KEYS and {"size", "mimeType"} <= entry["response"]["content"].keys()
+        assert entry["startedDateTime"].endswith("Z") and entry["cache"] == {}
+
+    assert redirect["response"]["status"] == 302 and redirect["response"]["redirectURL"] == "/new"
+    assert redirect["request"]["queryString"] == [{"name": "a", "value": "1"}]
+    assert page["startedDateTime"] == "2023-11-14T22:13:20.100Z"
+    assert page["serverIPAddress"] == "10.0.0.1" and page["response"]["bodySize"] == 2048
+    assert page["response"]["content"]["text"] == "<html></html>"
+    # phases from ResourceTiming; ssl overlaps connect and isn't counted twice in "time"
+    t = page["timings"]
+    assert (t["dns"], t["connect"], t["ssl"], t["send"], t["wait"]) == (2, 6, 4, 1, 50)
+    assert page["time"] == round(sum(v for k, v in t.items() if v > 0 and k != "ssl"), 3)
+    assert failed["_error"] == "net::ERR_ABORTED" and "text" not in failed["response"]["content"]
+    assert failed["request"]["postData"] == {"mimeType": "application/json", "text": '{"query":"{ me }"}'}
+    assert failed["timings"]["dns"] == -1
+
+
+def test_ring_buffer_eviction_is_noted():
+    driver = FakeDriver()
+    driver.cds_network = NetworkCollector(driver, buffer_bytes=1)
+    traffic(driver)
+    har = build_har(driver)["log"]
+    assert len(har["entries"]) == 1 and "dropped by the ring buffer" in har["comment"]
+
+
+def test_save_har_writes_nothing_without_traffic(tmp_path):
+    assert not save_har(FakeDriver(), tmp_path / "empty.har")
+    assert not (tmp_path / "empty.har").exists()
+
+    driver = FakeDriver()
+    traffic(driver)
+    assert save_har(driver, tmp_path / "t.har")
+    assert len(json.loads((tmp_path / "t.har").read_text(encoding="utf-8"))["log"]["entries"]) == 3
@@ -0,0 +1,112 @@
+# tests/unit/test_log.py
+#
+# The JSONL sink, level configuration and the context filter of utils/log.py.
+
+import json
+import logging
+
+import pytest
+
+from utils.log import (
+    CONTEXT_FILTER, LOG_CONTEXT, ROOT, JsonLinesHandler, configure_logging, read_records, worker_path,
+)
+from utils.step_timing import STEPS, timed_step
+
+
+@pytest.fixture
+def logger():
+    log = logging.getLogger(f"{ROOT}.tests.unit.log")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    yield log
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+        handler.close()
+    log.propagate = True
+
+
+def sink(logger, path):
+    handler = JsonLinesHandler(path)
+    handler.addFilter(CONTEXT_FILTER)
+    logger.addHandler(handler)
+    return handler
+
+
+@timed_step("LogPage.act")
+def act(logger):
+    logger.info("inside %s", "step")
+
+
+def test_jsonl_records_carry_context_and_data(logger, tmp_path, monkeypatch):
+    monkeypatch.setattr(LOG_CONTEXT, "test", "tests/x.py::test_y")
+    monkeypatch.setattr(LOG_CONTEXT, "worker", "gw1")
+    STEPS.reset()
+    path = tmp_path / "run.jsonl"
+    sink(logger, path)
+
+    act(logger)
+    logger.info("timed", extra={"data": {"key": "api_login", "metric": "seconds", "value": 1.5}})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    first, second, third = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert first["msg"] == "inside step"
+    assert (first["test"], first["worker"], first["step"]) == ("tests/x.py::test_y", "gw1", "LogPage.act")
+    assert second["step"] is None
+    assert second["data"] == {"key": "api_login", "metric": "seconds", "value": 1.5}
+    assert third["level"] == "ERROR" and "ValueError: boom" in third["exc"]
+
+
+def test_context_filter_sets_where_once(monkeypatch):
+    monkeypatch.setattr(LOG_CONTEXT, "worker", "gw0")
+    STEPS.reset()
+    record = logging.LogRecord("thirdparty", logging.INFO, __file__, 1, "msg", None, None)
+
+    CONTEXT_FILTER.filter(record)
+    monkeypatch.setattr(LOG_CONTEXT, "worker", "gw9")
+    CONTEXT_FILTER.filter(record)
+
+    assert record.where == " (gw0)"
+    assert logging.Formatter("%(name)s%(where)s: %(message)s").format(record) == "thirdparty (gw0): msg"
+
+
+def test_read_records_merges_workers_by_time_and_skips_torn_lines(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text(json.dumps({"ts": 2, "level": "INFO", "msg": "b"}) + "\n", encoding="utf-8")
+    worker_path(path, "gw0").write_text(
+        json.dumps({"ts": 1, "level": "WARNING", "msg": "a"}) + "\n"
+        + json.dumps({"ts": 3, "level": "ERROR", "msg": "c"}) + "\n"
+        + '{"ts": 4, "lev', encoding="utf-8",
+    )
+
+    assert [r["msg"] for r in read_records(path)] == ["a", "b", "c"]
+    assert [r["msg"] for r in read_records(path, logging.WARNING)] == ["a", "c"]
+
+
+def test_configure_logging_sets_levels_and_starts_fresh(tmp_path, monkeypatch):
+    root = logging.getLogger(ROOT)
+    pages = logging.getLogger(f"{ROOT}.pages")
+    levels = root.level, pages.level
+    before = list(root.handlers)
+    path = tmp_path / "run.jsonl"
+    path.write_text("old\n", encoding="utf-8")
+    worker_path(path, "gw3").write_text("old\n", encoding="utf-8")
+    monkeypatch.setenv("CDS_LOG_LEVEL", "warning")
+    monkeypatch.setenv("CDS_LOG_LEVELS", "pages=DEBUG")
+    monkeypatch.setattr(LOG_CONTEXT, "worker", None)
+    try:
+        configure_logging(path, fresh=True)
+        (handler,) = [h for h in root.handlers if h not in before]
+        assert root.level == logging.WARNING and pages.level == logging.DEBUG
+        assert isinstance(handler, JsonLinesHandler) and CONTEXT_FILTER in handler.filters
+        assert not worker_path(path, "gw3").exists()
+        assert path.read_text(encoding="utf-8") == ""
+    finally:
+        for h in root.handlers[:]:
+            if h not in before:
+                root.removeHandler(h)
+                h.close()
+        root.setLevel(levels[0])
+        pages.setLevel(levels[1])
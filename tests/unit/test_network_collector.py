@@ -0,0 +1,101 @@
+# tests/unit/test_network_collector.py
+#
+# utils/network_collector.py fed with hand-written performance-log entries
+# through a fake driver; no browser.
+
+import json
+
+import pytest
+
+from utils.network_collector import NetworkCollector, _root_fields, parse_graphql
+
+
+class FakeDriver:
+    """Hands out queued performance-log entries once, like Chrome does."""
+
+    def __init__(self):
+        self.pending = []
+
+    def log(self, method, **params):
+        self.pending.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+
+    def get_log(self, kind):
+        entries, self.pending = self.pending, []
+        return entries
+
+
+def send(driver, rid, body=None, url="https://example.test/graphql"):
+    request = {"url": url, "method": "POST" if body else "GET"}
+    if body:
+        request["postData"] = json.dumps(body)
+    driver.log("Network.requestWillBeSent", requestId=rid, request=request, timestamp=1.0, wallTime=1.0)
+
+
+def finish(driver, rid, status=200):
+    driver.log("Network.responseReceived", requestId=rid, timestamp=1.1,
+               response={"status": status, "mimeType": "application/json"})
+    driver.log("Network.loadingFinished", requestId=rid, timestamp=1.2, encodedDataLength=42)
+
+
+def test_request_body_is_dropped_once_the_response_finished():
+    driver = FakeDriver()
+    collector = NetworkCollector(driver)
+    send(driver, "1", {"query": "mutation publish { publishDataset(id: 1) { status } }"})
+    collector.drain()
+    (record,) = collector.all()
+    assert record.post_data is not None
+
+    finish(driver, "1")
+    collector.drain()
+
+    assert record.post_data is None
+    assert record.done and record.encoded_data_length == 42
+    # still found by operation name and root field
+    assert collector.completed_operation("publish") is record
+    assert collector.completed_operation("publishDataset") is record
+
+
+def test_failed_request_drops_its_body_too():
+    driver = FakeDriver()
+    collector = NetworkCollector(driver)
+    send(driver, "1", {"query": "{ uploadFile { id } }"})
+    driver.log("Network.loadingFailed", requestId="1", timestamp=2.0, errorText="net::ERR_FAILED")
+    collector.drain()
+    (record,) = collector.all()
+    assert record.failed and record.post_data is None
+    assert collector.operation("uploadFile") == [record]
+
+
+@pytest.mark.parametrize("query, fields", [
+    ("{ datasets { id } }", ["datasets"]),
+    ("query Q($id: ID!) { dataset(id: $id) { id title } tags { name } }", ["dataset", "tags"]),
+    # arguments holding braces of their own
+    ('mutation { publishDataset(input: {id: "1", meta: {a: 1}}) { status } }', ["publishDataset"]),
+    # the alias is dropped, the real field kept
+    ("{ first: dataset(id: 1) { id } second: dataset(id: 2) { id } }", ["dataset", "dataset"]),
+    # spreads aren't fields; an inline fragment's fields are top-level
+    ("{ ...Base ... on Query { me { id } } stats { count } }", ["me", "stats"]),
+    ("{ ... @include(if: $full) { usage { bytes } } me { id } }", ["usage", "me"]),
+    ("{ me @skip(if: $anon) { id } }", ["me"]),
+    ("not graphql", []),
+])
+def test_root_fields(query, fields):
+    assert _root_fields(query) == fields
+
+
+def test_parse_graphql_reads_names_types_and_batches():
+    body = json.dumps([
+        {"query": "mutation Publish { publishDataset(id: 1) { status } }", "variables": {"id": 1}},
+        {"operationName": "Named", "query": "query { me { id } }"},
+        {"not": "an operation"},
+    ])
+    assert parse_graphql(body) == [
+        ("mutation", "Publish", ["publishDataset"], len(json.dumps({"id": 1}))),
+        ("query", "Named", ["me"], 0),
+    ]
+
+
+def test_parse_graphql_ignores_other_bodies():
+    assert parse_graphql(None) == []
+    assert parse_graphql("a=1&b=2") == []
+    assert parse_graphql(json.dumps({"query": 42})) == []
@@ -0,0 +1,56 @@
+# tests/unit/test_network_idle.py
+#
+# The idle predicate behind BasePage.wait_for_network_idle(), on hand-built
+# tracker states; no browser.
+
+from utils.network_idle import is_network_idle
+
+
+def state(now, last, inflight=0, total=0, born=0, graphql=0, graphql_total=0, graphql_last=None):
+    return {
+        "inflight": inflight, "graphql": graphql, "total": total, "graphql_total": graphql_total,
+        "now": now, "born": born, "last": last,
+        "graphql_last": last if graphql_last is None else graphql_last,
+    }
+
+
+def test_quiet_before_the_wait_does_not_count():
+    # quiet for 5 s before the wait began: not idle until 500 ms after it
+    mark = state(now=10_000, last=5_000)
+    assert not is_network_idle(state(now=10_000, last=5_000), mark, 500)
+    assert not is_network_idle(state(now=10_499, last=5_000), mark, 500)
+    assert is_network_idle(state(now=10_500, last=5_000), mark, 500)
+
+
+def test_activity_after_the_mark_restarts_the_window():
+    mark = state(now=10_000, last=5_000)
+    assert not is_network_idle(state(now=10_600, last=10_300, total=1), mark, 500)
+    assert is_network_idle(state(now=10_800, last=10_300, total=1), mark, 500)
+
+
+def test_in_flight_request_is_never_idle():
+    mark = state(now=0, last=0)
+    assert not is_network_idle(state(now=60_000, last=0, inflight=1), mark, 500)
+
+
+def test_expect_request_waits_for_the_counter_to_move():
+    mark = state(now=10_000, last=9_000, total=3)
+    quiet_but_nothing_sent = state(now=20_000, last=9_000, total=3)
+    assert is_network_idle(quiet_but_nothing_sent, mark, 500)
+    assert not is_network_idle(quiet_but_nothing_sent, mark, 500, expect_request=True)
+    sent = state(now=20_000, last=10_200, total=4)
+    assert is_network_idle(sent, mark, 500, expect_request=True)
+
+
+def test_expect_request_after_navigation_counts_from_zero():
+    mark = state(now=10_000, last=9_000, total=7)
+    new_document = state(now=12_000, last=10_500, total=1, born=10_100)
+    assert is_network_idle(new_document, mark, 500, expect_request=True)
+
+
+def test_graphql_only_ignores_other_requests():
+    mark = state(now=10_000, last=10_000, graphql_last=9_000)
+    polling = state(now=11_000, last=10_900, inflight=1, graphql_last=9_000)
+    assert is_network_idle(polling, mark, 500, graphql_only=True)
+    assert not is_network_idle(polling, mark, 500)
+    assert not is_network_idle(polling, mark, 500, graphql_only=True, expect_request=True)
@@ -0,0 +1,134 @@
+# tests/unit/test_perf_baseline.py
+#
+# Sample extraction and regression flags of utils/perf_baseline.py, against a
+# throwaway SQLite history under tmp_path.
+
+import json
+
+import pytest
+
+from utils.perf_baseline import PerfBaseline, record_run, samples_from_log, samples_from_report
+
+
+def write_report(path, created, tests):
+    path.write_text(json.dumps({"created": created, "duration": 1.0, "tests": tests}), encoding="utf-8")
+    return path
+
+
+def passed(nodeid, seconds, browser="chrome", **props):
+    if browser:
+        props["browser"] = browser
+    return {
+        "nodeid": nodeid, "outcome": "passed", "call": {"duration": seconds},
+        "user_properties": [{name: value} for name, value in props.items()],
+    }
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    db = PerfBaseline(tmp_path / "history.sqlite")
+    yield db
+    db.close()
+
+
+def test_samples_from_report_reads_passed_tests_steps_and_pages(tmp_path):
+    steps = [{"step": "LoginPage.login", "duration_s": 1.0}, {"step": "LoginPage.login", "duration_s": 0.5}]
+    pages = [
+        {"page": "/dashboard", "lcp_ms": 900, "navigation": {"ttfb_ms": 120, "load_ms": 0},
+         "resources": {"transfer_bytes": 4096}},
+        {"page": "/datasets", "soft_navigation": True, "navigation": {"ttfb_ms": 5}},
+    ]
+    failed = {"nodeid": "t::failed", "outcome": "failed", "call": {"duration": 9.0}}
+    report = write_report(tmp_path / "report.json", 42.0,
+                          [passed("t::ok", 2.0, steps=steps, page_metrics=pages), failed])
+
+    created, samples = samples_from_report(report)
+
+    assert created == 42.0
+    assert sorted(samples) == sorted([
+        ("test", "t::ok", "duration_s", 2.0),
+        ("step", "t::ok::LoginPage.login", "duration_s", 1.5),
+        ("page", "t::ok::/dashboard", "lcp_ms", 900),
+        ("page", "t::ok::/dashboard", "ttfb_ms", 120),
+        ("page", "t::ok::/dashboard", "resources_bytes", 4096),
+    ])
+
+
+def test_samples_from_report_accepts_legacy_property_pairs(tmp_path):
+    test = {"nodeid": "t::ok", "outcome": "passed", "call": {"duration": 1.0},
+            "user_properties": [["steps", [{"step": "HomePage.visit", "duration_s": 0.25}]]]}
+    _, samples = samples_from_report(write_report(tmp_path / "report.json", 1.0, [test]))
+    assert ("step", "t::ok::HomePage.visit", "duration_s", 0.25) in samples
+
+
+def test_only_browser_tests_give_samples(tmp_path):
+    report = write_report(tmp_path / "report.json", 1.0, [
+        passed("tests/unit/test_x.py::test_pure", 0.01, browser=None),
+        passed("t::driven", 3.0),
+    ])
+    _, samples = samples_from_report(report)
+    assert samples == [("test", "t::driven", "duration_s", 3.0)]
+
+
+def test_unit_test_runs_are_not_recorded(tmp_path):
+    report = write_report(tmp_path / "report.json", 1.0, [passed("t::pure", 0.01, browser=None)])
+    out = tmp_path / "perf_regressions.json"
+    assert record_run(report, out, tmp_path / "history.sqlite") == []
+    assert not out.exists() and not (tmp_path / "history.sqlite").exists()
+
+
+def test_samples_from_log_takes_the_median_per_series():
+    records = [
+        {"msg": "launch", "data": {"key": "browser_launch", "metric": "seconds", "value": v}}
+        for v in (1.0, 5.0, 2.0)
+    ] + [{"msg": "no data"}, {"data": {"key": "partial"}}]
+    assert samples_from_log(records) == [("log", "browser_launch", "seconds", 2.0)]
+
+
+def record(baseline, created, value, key="t::ok", metric="duration_s"):
+    return baseline.record(created, [("test", key, metric, value)])
+
+
+def test_regression_needs_min_runs_of_history(baseline):
+    for created in (1, 2):
+        record(baseline, created, 1.0)
+    run = record(baseline, 3, 5.0)
+    assert baseline.regressions(run, min_runs=3) == []
+    assert [r["ratio"] for r in baseline.regressions(run, min_runs=2)] == [5.0]
+
+
+def test_regression_is_against_the_rolling_median(baseline):
+    for created, value in enumerate((1.0, 1.0, 10.0, 1.0)):
+        record(baseline, created, value)
+    run = record(baseline, 99, 1.5)
+    (flag,) = baseline.regressions(run, factor=1.3, min_runs=3)
+    assert flag["median"] == 1.0 and flag["runs"] == 4 and flag["value"] == 1.5
+
+
+def test_differences_under_the_noise_floor_are_ignored(baseline):
+    for created in range(3):
+        record(baseline, created, 0.1)
+    # 3x slower, but only 0.2 s: under the 0.25 s duration floor
+    run = record(baseline, 10, 0.3)
+    assert baseline.regressions(run, min_runs=3) == []
+
+
+def test_a_report_is_recorded_once(baseline):
+    assert record(baseline, 7, 1.0) is not None
+    assert record(baseline, 7, 1.0) is None
+
+
+def test_record_run_rewrites_regressions_of_a_known_report(tmp_path):
+    db = tmp_path / "history.sqlite"
+    out = tmp_path / "perf_regressions.json"
+    for created in range(3):
+        record_run(write_report(tmp_path / "r.json", created, [passed("t::ok", 1.0)]), out, db)
+    report = write_report(tmp_path / "r.json", 3, [passed("t::ok", 4.0)])
+    assert len(record_run(report, out, db)) == 1
+
+    out.write_text("stale", encoding="utf-8")
+    flagged = record_run(report, out, db)
+
+    assert len(flagged) == 1
+    written = json.loads(out.read_text(encoding="utf-8"))
+    assert written["report_created"] == 3 and written["regressions"] == flagged
@@ -0,0 +1,70 @@
+# tests/unit/test_report_generator.py
+#
+# report_generator.generate() on a small report.json, in every format, and
+# the detached worker conftest starts for --report background.
+
+import json
+
+import pytest
+
+import conftest
+from report_generator import REPORT_FORMATS, generate
+
+CREATED = 1_700_000_000.0
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    tests = [
+        {"nodeid": "tests/provider/test_a.py::test_ok", "outcome": "passed", "call": {"duration": 1.0}},
+        {"nodeid": "tests/provider/test_a.py::test_broken", "outcome": "failed",
+         "call": {"duration": 2.0, "crash": {"message": "AssertionError: dataset not published"}}},
+    ]
+    (tmp_path / "report.json").write_text(
+        json.dumps({"created": CREATED, "duration": 3.0, "summary": {"total": 2}, "tests": tests}),
+        encoding="utf-8",
+    )
+    (tmp_path / "perf_regressions.json").write_text(json.dumps({
+        "report_created": CREATED, "factor": 1.3, "window": 10,
+        "regressions": [{"kind": "test", "key": "tests/provider/test_a.py::test_ok", "metric": "duration_s",
+                         "value": 4.0, "median": 1.0, "ratio": 4.0, "runs": 5}],
+    }), encoding="utf-8")
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "run.jsonl").write_text(json.dumps({
+        "ts": 1, "level": "WARNING", "logger": "cds.pages.x", "msg": "publish button never enabled",
+        "test": "tests/provider/test_a.py::test_broken", "step": "CreateDatasetPage.click_publish",
+    }) + "\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_generate_writes_every_format(run_dir):
+    written = generate(["report.json"], REPORT_FORMATS, base_dir=run_dir, log_path="logs/run.jsonl")
+
+    assert set(written) == set(REPORT_FORMATS)
+    md = (run_dir / "TEST_REPORT.md").read_text(encoding="utf-8")
+    html = (run_dir / "TEST_REPORT.html").read_text(encoding="utf-8")
+    for text in (md, html):
+        assert "test_broken" in text
+        assert "dataset not published" in text
+        assert "publish button never enabled" in text
+        assert "x4.00" in text
+    assert "test_ok" in html  # the HTML report lists every test
+    assert (run_dir / "TEST_REPORT.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_generate_without_reports_writes_nothing(tmp_path):
+    assert generate(["report.json"], ("md",), base_dir=tmp_path, log_path="") == {}
+    assert not (tmp_path / "TEST_REPORT.md").exists()
+
+
+def test_unknown_format_is_rejected(run_dir):
+    with pytest.raises(ValueError):
+        generate(["report.json"], ("docx",), base_dir=run_dir)
+
+
+def test_background_worker_builds_the_reports(run_dir):
+    worker = conftest._start_report_worker(run_dir, run_dir / "report.json", ("md", "html"), "logs/run.jsonl")
+    assert worker.wait(timeout=120) == 0
+    assert "test_broken" in (run_dir / "TEST_REPORT.md").read_text(encoding="utf-8")
+    assert (run_dir / "TEST_REPORT.html").exists() and not (run_dir / "TEST_REPORT.pdf").exists()
+    assert "TEST_REPORT.html generated" in (run_dir / "report_generator.log").read_text(encoding="utf-8")
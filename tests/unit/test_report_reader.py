@@ -0,0 +1,19 @@
+# tests/unit/test_report_reader.py
+
+from utils.report_reader import user_property
+
+
+def test_user_property_reads_dict_entries():
+    test = {"user_properties": [{"har": "a.har"}, {"screenshot": "s.png"}]}
+    assert user_property(test, "screenshot") == "s.png"
+
+
+def test_user_property_reads_legacy_pairs():
+    test = {"user_properties": [["screenshot", "s.png"], ["steps", []]]}
+    assert user_property(test, "screenshot") == "s.png"
+    assert user_property(test, "steps") == []
+
+
+def test_user_property_default():
+    assert user_property({}, "screenshot") is None
+    assert user_property({"user_properties": [{"har": "a.har"}]}, "screenshot", "none") == "none"
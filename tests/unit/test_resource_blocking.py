@@ -0,0 +1,118 @@
+# tests/unit/test_resource_blocking.py
+#
+# Block-list rules, category parsing and the savings estimate; no browser.
+
+import json
+import re
+
+import pytest
+
+import utils.resource_blocking as resource_blocking
+from utils.network_collector import NetworkRequest
+from utils.resource_blocking import (
+    DEFAULT_CATEGORIES, ResourceSizeCache, load_rules, network_usage, parse_categories, patterns_for,
+)
+
+
+def blocked(url, patterns):
+    """Network.setBlockedURLs matching: the whole URL, '*' as the only wildcard."""
+    return any(re.fullmatch(".*".join(map(re.escape, p.split("*"))), url) for p in patterns)
+
+
+@pytest.mark.parametrize("url, category", [
+    ("https://www.googletagmanager.com/gtag/js?id=G-1", "analytics"),
+    ("https://www.google-analytics.com/g/collect?v=2", "analytics"),
+    ("https://connect.facebook.net/en_US/fbevents.js", "trackers"),
+    ("https://fonts.gstatic.com/s/inter/v12/abc.woff2", "fonts"),
+    ("https://site.test/_next/static/media/font.woff2?v=3", "fonts"),
+    ("https://site.test/_next/image?url=%2Flogo.png&w=64", "images"),
+    ("https://site.test/logo.svg", "images"),
+])
+def test_rules_block_their_category(url, category):
+    rules = load_rules()
+    assert blocked(url, rules[category])
+    others = [c for c in rules if c != category]
+    assert not blocked(url, patterns_for(others, rules))
+
+
+@pytest.mark.parametrize("url", [
+    "https://site.test/api/graphql",
+    "https://site.test/_next/static/chunks/main.js",
+    "https://site.test/datasets?tab=drafts",
+])
+def test_app_requests_are_never_blocked(url):
+    rules = load_rules()
+    assert not blocked(url, patterns_for(list(rules), rules))
+
+
+def test_parse_categories():
+    assert parse_categories(None) == ()
+    assert parse_categories("default") == DEFAULT_CATEGORIES
+    assert parse_categories("Images, default,images") == ("images", *DEFAULT_CATEGORIES)
+
+
+def test_unknown_category_is_an_error():
+    with pytest.raises(ValueError, match="Unknown resource category: videos"):
+        patterns_for(["fonts", "videos"], load_rules())
+
+
+def test_rules_file_adds_and_overrides_categories(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"fonts": ["*.woff2"], "chat": ["*intercom.io*"]}), encoding="utf-8")
+    rules = load_rules(path)
+    assert rules["fonts"] == ["*.woff2"]
+    assert rules["chat"] == ["*intercom.io*"]
+    assert "analytics" in rules
+
+
+def request(url, size=0, blocked_reason=None, redirects=0):
+    record = NetworkRequest("1", url, "GET", None, 0.0, 0.0, "Other")
+    record.redirects = redirects
+    if blocked_reason:
+        record.failed = True
+        record.blocked_reason = blocked_reason
+    else:
+        record.finished_at = 1.0
+        record.encoded_data_length = size
+    return record
+
+
+def test_network_usage_estimates_bytes_saved_from_earlier_loads(tmp_path):
+    cache = ResourceSizeCache(tmp_path / "sizes.json")
+    network_usage([request("https://fonts.gstatic.com/a.woff2?v=1", size=30_000)], cache)
+
+    usage = network_usage([
+        request("https://site.test/", size=5_000, redirects=1),
+        request("https://fonts.gstatic.com/a.woff2?v=2", blocked_reason="inspector"),
+        request("https://tracker.test/px.gif", blocked_reason="inspector"),
+        request("https://site.test/offline", blocked_reason="other"),
+    ], cache)
+
+    assert usage == {
+        "requests": 5,
+        "bytes_received": 5_000,
+        "blocked_requests": 2,
+        "bytes_saved_estimate": 30_000,
+        "blocked_unknown_size": 1,
+    }
+
+
+def test_size_cache_merges_with_what_other_workers_saved(tmp_path):
+    path = tmp_path / "sizes.json"
+    path.write_text(json.dumps({"other.test/a.js": 10}), encoding="utf-8")
+    cache = ResourceSizeCache(path)
+    cache.learn("https://site.test/b.js?x=1", 20)
+    cache.save()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"other.test/a.js": 10, "site.test/b.js": 20}
+
+
+def test_size_cache_trims_the_least_recently_seen(tmp_path, monkeypatch):
+    monkeypatch.setattr(resource_blocking, "SIZE_CACHE_LIMIT", 2)
+    path = tmp_path / "sizes.json"
+    path.write_text(json.dumps({"site.test/seen.js": 2, "site.test/old.js": 1, "site.test/mid.js": 3}),
+                    encoding="utf-8")
+    cache = ResourceSizeCache(path)
+    # first in the file, but seen again in this run
+    cache.learn("https://site.test/seen.js", 5)
+    cache.save()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"site.test/mid.js": 3, "site.test/seen.js": 5}
@@ -0,0 +1,118 @@
+# tests/unit/test_step_timing.py
+#
+# Step spans and their time buckets (utils/step_timing.py), on a fake clock
+# and a fake driver.
+
+import pytest
+
+import utils.step_timing as step_timing
+from utils.step_timing import STEPS, instrument_class, instrument_driver
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(step_timing, "time", clock)
+    STEPS.reset()
+    yield clock
+    STEPS.reset()
+
+
+class FakeDriver:
+    def __init__(self, clock):
+        self.clock = clock
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        self.clock.advance(0.5)
+
+
+class Page:
+    def __init__(self, driver, clock):
+        self.driver = driver
+        self.clock = clock
+
+    def outer(self):
+        self.driver.execute("click")
+        self.inner()
+        self.clock.advance(1.0)  # Python work
+
+    def inner(self):
+        STEPS.enter_wait()
+        self.driver.execute("findElements")  # polled by the wait: not a webdriver round trip
+        self.clock.advance(2.0)
+        STEPS.exit_wait(2.5)
+
+    def fail(self):
+        raise ValueError("boom")
+
+    def _helper(self):
+        return "untimed"
+
+    @property
+    def title(self):
+        return "t"
+
+
+instrument_class(Page)
+
+
+def test_nested_spans_with_inclusive_buckets(clock):
+    driver = instrument_driver(FakeDriver(clock))
+    Page(driver, clock).outer()
+
+    inner, outer = STEPS.spans  # recorded as they finish
+    assert (inner["step"], inner["depth"]) == ("Page.inner", 1)
+    assert (outer["step"], outer["depth"]) == ("Page.outer", 0)
+    assert inner == {**inner, "duration_s": 2.5, "wait_s": 2.5, "webdriver_s": 0.0, "other_s": 0.0}
+    # the parent's wait includes the child's; 1.0 s of Python is "other"
+    assert outer == {**outer, "duration_s": 4.0, "wait_s": 2.5, "webdriver_s": 0.5, "other_s": 1.0}
+    assert [s["step"] for s in STEPS.ordered()] == ["Page.outer", "Page.inner"]
+    assert driver.commands == ["click", "findElements"]
+
+
+def test_errors_are_recorded_and_reraised(clock):
+    with pytest.raises(ValueError):
+        Page(None, clock).fail()
+    (span,) = STEPS.spans
+    assert span["error"] == "ValueError" and STEPS.current is None
+
+
+def test_only_public_plain_methods_are_instrumented():
+    assert getattr(Page.outer, "__step_timed__", False)
+    assert not getattr(Page._helper, "__step_timed__", False)
+    assert isinstance(vars(Page)["title"], property)
+
+
+def test_driver_is_instrumented_once(clock):
+    driver = FakeDriver(clock)
+    wrapped = instrument_driver(driver).execute
+    assert instrument_driver(driver).execute is wrapped
+
+
+def test_hooks_see_step_start_and_finish(clock):
+    seen = []
+
+    class Hook:
+        def step_started(self, name):
+            seen.append(("start", name, STEPS.current))
+
+        def step_finished(self, name):
+            seen.append(("finish", name, STEPS.current))
+
+    STEPS.hooks.append(Hook())
+    Page(FakeDriver(clock), clock).inner()
+    # hooks run outside the span: it isn't on the stack yet / any more
+    assert seen == [("start", "Page.inner", None), ("finish", "Page.inner", None)]
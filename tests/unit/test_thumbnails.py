@@ -0,0 +1,43 @@
+# tests/unit/test_thumbnails.py
+
+import os
+import sys
+
+import pytest
+
+from utils import thumbnails
+from utils.thumbnails import make_thumbnails, prune_cache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    path = tmp_path / "shot.png"
+    Image.new("RGB", (1920, 1080), "white").save(path)
+    return path
+
+
+def test_thumbnail_fits_the_box_and_is_cached(tmp_path, screenshot):
+    cache = tmp_path / "cache"
+    (thumb,) = make_thumbnails([screenshot], (2, 2), dpi=100, cache_dir=cache).values()
+    assert (thumb.width, thumb.height) == (200, 113)
+    assert not thumb.cached
+    (again,) = make_thumbnails([screenshot], (2, 2), dpi=100, cache_dir=cache).values()
+    assert again.cached and again.path == thumb.path
+
+
+def test_prune_removes_only_unused_entries(tmp_path):
+    old, fresh = tmp_path / "old.jpg", tmp_path / "fresh.jpg"
+    old.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    os.utime(old, (0, 0))
+    assert prune_cache(tmp_path, max_age_days=14) == 1
+    assert not old.exists() and fresh.exists()
+
+
+def test_without_pillow_nothing_is_resized(tmp_path, screenshot, monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    monkeypatch.setattr(thumbnails, "_warned_no_pillow", False)
+    assert make_thumbnails([screenshot], (2, 2), cache_dir=tmp_path / "cache") == {}
+    assert thumbnails._warned_no_pillow
@@ -0,0 +1,120 @@
+# tests/unit/test_tracing.py
+#
+# Which step calls get traced, and how a trace stream reaches disk, with the
+# DevTools connection faked; no browser.
+
+import base64
+import gzip
+
+import pytest
+
+import utils.tracing as tracing
+from utils.step_timing import STEPS, timed_step
+from utils.tracing import StepTracer, TraceSession, trace_path
+
+
+class FakeSession:
+    started = []
+
+    def __init__(self, driver, path, categories=None):
+        self.path = path
+
+    def start(self):
+        FakeSession.started.append(self.path)
+        return self
+
+    def stop(self):
+        return self.path
+
+
+@pytest.fixture
+def traced(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_DIR", tmp_path)
+    monkeypatch.setattr(tracing, "TraceSession", FakeSession)
+    FakeSession.started = []
+    STEPS.reset()
+    tracer = StepTracer(driver=None, test_name="tests/x.py::test_publish", step="Page.publish")
+    STEPS.hooks.append(tracer)
+    yield tracer
+    STEPS.reset()
+
+
+@timed_step("Page.publish")
+def publish(inner=False):
+    if inner:
+        publish()
+
+
+@timed_step("Page.fill")
+def fill():
+    pass
+
+
+def test_only_the_named_step_is_traced_once_per_call(traced, tmp_path):
+    fill()
+    publish()
+    fill()
+    publish()
+    assert [p.name for p in FakeSession.started] == [
+        "tests_x.py_test_publish__Page.publish.json.gz",
+        "tests_x.py_test_publish__Page.publish_1.json.gz",
+    ]
+    assert traced.paths == [str(p) for p in FakeSession.started]
+
+
+def test_nested_call_of_the_step_shares_the_outer_trace(traced):
+    publish(inner=True)
+    assert len(FakeSession.started) == 1 and len(traced.paths) == 1
+
+
+def test_failed_start_is_not_fatal(traced, monkeypatch):
+    def broken(self):
+        raise tracing.TracingError("no debuggerAddress (tracing needs Chrome)")
+
+    monkeypatch.setattr(FakeSession, "start", broken)
+    publish()
+    assert traced.paths == []
+
+
+def test_trace_path_is_file_safe(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACE_DIR", tmp_path)
+    assert trace_path("tests/a.py::test_b[param 1]") == tmp_path / "tests_a.py_test_b_param_1_.json.gz"
+
+
+class FakeCdp:
+    def __init__(self, payload, chunk=4):
+        encoded = base64.b64encode(payload).decode()
+        self.chunks = [encoded[i:i + chunk] for i in range(0, len(encoded), chunk)]
+        self.sent = []
+        self.closed = False
+
+    def send(self, method, params=None):
+        self.sent.append(method)
+        if method == "IO.read":
+            data = self.chunks.pop(0)
+            return {"data": data, "base64Encoded": True, "eof": not self.chunks}
+        return {}
+
+    def wait_event(self, method):
+        assert method == "Tracing.tracingComplete"
+        return {"stream": "stream-1"}
+
+    def close(self):
+        self.closed = True
+
+
+def test_stop_streams_the_trace_to_disk(tmp_path):
+    payload = gzip.compress(b'{"traceEvents": []}')
+    session = TraceSession(driver=None, path=tmp_path / "t.json.gz")
+    # base64 decoded chunk by chunk: chunk sizes are multiples of 4
+    session._cdp = cdp = FakeCdp(payload, chunk=8)
+
+    path = session.stop()
+
+    assert gzip.decompress(path.read_bytes()) == b'{"traceEvents": []}'
+    assert cdp.sent[0] == "Tracing.end" and cdp.sent[-1] == "IO.close" and cdp.closed
+
+
+def test_stop_without_start_fails():
+    with pytest.raises(tracing.TracingError):
+        TraceSession(driver=None, path="x.json.gz").stop()
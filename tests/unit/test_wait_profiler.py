@@ -0,0 +1,76 @@
+# tests/unit/test_wait_profiler.py
+#
+# The locator reverse index and the run-wide wait table of
+# utils/wait_profiler.py, on a throwaway locators package.
+
+import json
+
+import pytest
+
+import utils.wait_profiler as wait_profiler
+from utils.wait_profiler import WaitProfile, build_locator_index, locator_name
+
+
+@pytest.fixture
+def fake_locators(tmp_path, monkeypatch):
+    pkg = tmp_path / "fake_locators"
+    (pkg / "provider").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "provider" / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "provider" / "usecase.py").write_text(
+        "from selenium.webdriver.common.by import By\n"
+        "class UsecaseLocators:\n"
+        "    PUBLISH_TAB = '//button[text()=\"Publish\"]'\n"
+        "    SAVE = (By.ID, 'save')\n"
+        "    helper = '//not-a-constant'\n",
+        encoding="utf-8",
+    )
+    (pkg / "shared.py").write_text(
+        "from fake_locators.provider.usecase import UsecaseLocators\n"
+        "class SharedLocators:\n"
+        "    PUBLISH = '//button[text()=\"Publish\"]'\n",
+        encoding="utf-8",
+    )
+    (pkg / "broken.py").write_text("raise ImportError('optional dependency')\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return "fake_locators"
+
+
+def test_index_maps_values_to_every_defining_constant(fake_locators):
+    index = build_locator_index(fake_locators)
+    assert sorted(index['//button[text()="Publish"]']) == ["SharedLocators.PUBLISH", "UsecaseLocators.PUBLISH_TAB"]
+    # (By, value) tuples are indexed by value; lowercase attributes and re-imports are not
+    assert index["save"] == ["UsecaseLocators.SAVE"]
+    assert "//not-a-constant" not in index
+
+
+def test_locator_name_falls_back_to_the_value(fake_locators, monkeypatch):
+    monkeypatch.setitem(wait_profiler._index, "index", build_locator_index(fake_locators))
+    assert locator_name(("xpath", '//button[text()="Publish"]')) == "SharedLocators.PUBLISH | UsecaseLocators.PUBLISH_TAB"
+    assert locator_name("//unknown") == "//unknown"
+    assert locator_name(None) is None
+
+
+def group(calls, seconds, timeouts, satisfied, satisfied_seconds, max_s, kinds):
+    return {"calls": calls, "seconds": seconds, "timeouts": timeouts, "satisfied": satisfied,
+            "satisfied_seconds": satisfied_seconds, "max_s": max_s, "kinds": kinds}
+
+
+def test_profile_sums_tests_and_ranks(tmp_path):
+    profile = WaitProfile()
+    profile.add({"A.SLOW": group(2, 6.0, 1, 1, 1.0, 5.0, ["visible"]),
+                 "A.FAST": group(1, 0.5, 0, 1, 0.5, 0.5, ["clickable"])})
+    profile.add({"A.SLOW": group(1, 2.0, 0, 1, 2.0, 2.0, ["present"])})
+
+    slow, fast = profile.rows()
+    assert slow["locator"] == "A.SLOW" and fast["locator"] == "A.FAST"
+    assert (slow["calls"], slow["seconds"], slow["timeouts"], slow["tests"]) == (3, 8.0, 1, 2)
+    assert slow["mean_to_satisfy_s"] == 1.5 and slow["max_s"] == 5.0
+    assert slow["timeout_rate"] == 0.333 and slow["kinds"] == ["present", "visible"]
+
+    # header plus locators that timed out at least once
+    assert len(profile.table("timeouts")) == 2
+
+    profile.write(tmp_path / "wait_profile.json")
+    written = json.loads((tmp_path / "wait_profile.json").read_text(encoding="utf-8"))
+    assert [r["locator"] for r in written["locators"]] == ["A.SLOW", "A.FAST"]
@@ -0,0 +1,77 @@
+# tests/unit/test_web_vitals.py
+#
+# Shape of the page_metrics records, from a fake driver that answers the
+# capture script with a canned result; no browser.
+
+from utils.web_vitals import PageMetricsRecorder, _rounded
+
+CAPTURED = {
+    "url": "https://site.test/datasets",
+    "soft_navigation": True,
+    "since_previous_ms": 1234.5678,
+    "navigation": {"ttfb_ms": 87.123456, "load_ms": 0, "transfer_bytes": 5120},
+    "lcp_ms": 912.34567,
+    "lcp_element": "img",
+    "cls": 0.012345678,
+    "resources": {"count": 2, "transfer_bytes": 2048,
+                  "slowest": [{"name": "a.js", "duration_ms": 45.6789, "transfer_bytes": 1024}]},
+}
+
+
+class FakeDriver:
+    def __init__(self, captured=CAPTURED, cdp=True):
+        self.captured = captured
+        self.cdp = cdp
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return self.captured
+
+    def execute_cdp_cmd(self, cmd, params):
+        if not self.cdp:
+            raise RuntimeError("no CDP")
+        return {"metrics": [
+            {"name": "Nodes", "value": 812.0},
+            {"name": "ScriptDuration", "value": 0.123456789},
+            {"name": "NotKept", "value": 1.0},
+        ]}
+
+
+def test_rounded_keeps_ms_to_a_tenth_and_fractions_to_four_places():
+    assert _rounded({"a": 912.34567, "b": [0.012345678, 3], "c": None, "d": "x"}) == {
+        "a": 912.3, "b": [0.0123, 3], "c": None, "d": "x",
+    }
+
+
+def test_capture_record_shape():
+    recorder = PageMetricsRecorder()
+    record = recorder.capture(FakeDriver(), "datasets")
+
+    assert recorder.records == [record]
+    assert record == {
+        "page": "datasets",
+        "url": "https://site.test/datasets",
+        "soft_navigation": True,
+        "since_previous_ms": 1234.6,
+        "navigation": {"ttfb_ms": 87.1, "load_ms": 0, "transfer_bytes": 5120},
+        "lcp_ms": 912.3,
+        "lcp_element": "img",
+        "cls": 0.0123,
+        "resources": {"count": 2, "transfer_bytes": 2048,
+                      "slowest": [{"name": "a.js", "duration_ms": 45.7, "transfer_bytes": 1024}]},
+        "cdp": {"Nodes": 812.0, "ScriptDuration": 0.1235},
+    }
+
+
+def test_capture_without_cdp_has_no_cdp_block():
+    record = PageMetricsRecorder().capture(FakeDriver(cdp=False), "home")
+    assert record["cdp"] is None and record["lcp_ms"] == 912.3
+
+
+def test_disabled_recorder_captures_nothing():
+    recorder = PageMetricsRecorder()
+    recorder.enabled = False
+    driver = FakeDriver()
+    assert recorder.capture(driver, "home") is None
+    assert driver.scripts == [] and recorder.records == []
@@ -0,0 +1,165 @@
+# utils/api_login.py
+
+import os
+import time
+from html import unescape
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from utils.browser_pool import origin_of
+from utils.browser_state import BrowserState
+
+# next-auth style endpoints of the frontend (relative to HOME_URL_DEV)
+AUTH_CSRF_PATH = os.getenv("AUTH_CSRF_PATH", "api/auth/csrf")
+AUTH_SIGNIN_PATH = os.getenv("AUTH_SIGNIN_PATH", "api/auth/signin/keycloak")
+
+
+class LoginError(Exception):
+    """The identity provider did not accept the login (or the flow changed shape)."""
+
+
+class _LoginFormParser(HTMLParser):
+    """Finds the Keycloak login form (id=kc-form-login), else the first form with a password field."""
+
+    def __init__(self):
+        super().__init__()
+        self.action = None
+        self._form_action = None
+        self._in_form = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._in_form = True
+            self._form_action = attrs.get("action")
+            if attrs.get("id") == "kc-form-login":
+                self.action = self._form_action
+        elif tag == "input" and self._in_form and attrs.get("type") == "password" and self.action is None:
+            self.action = self._form_action
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._in_form = False
+
+
+def _cookie_to_cdp(cookie) -> dict:
+    out = {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path or "/",
+        "secure": bool(cookie.secure),
+        "httpOnly": cookie.has_nonstandard_attr("HttpOnly") or cookie.has_nonstandard_attr("httponly"),
+    }
+    if cookie.expires:
+        out["expires"] = cookie.expires
+    return out
+
+
+class ApiLogin:
+    """
+    Provider login without a browser: drive the OIDC authorization-code flow
+    (frontend sign-in → Keycloak login form → callback) with a requests.Session
+    and return the resulting cookies as a BrowserState that restore_state()
+    can inject into any browser.
+
+    One instance is meant to live for the whole session so the underlying
+    connection pool (keep-alive to the frontend and to Keycloak) is reused.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session = None, timeout: int = 15):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def login(self, email: str, password: str) -> BrowserState:
+        # cookies belong to one login; the connections stay warm
+        self.session.cookies.clear()
+
+        login_page = self._start_sign_in()
+        action = self._form_action(login_page)
+        resp = self.session.post(
+            action,
+            data={"username": email, "password": password, "credentialId": ""},
+            allow_redirects=True,
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+
+        if origin_of(resp.url) != origin_of(self.base_url) or self._looks_like_login_form(resp.text):
+            raise LoginError(f"Identity provider did not accept the login for {email} (ended on {resp.url})")
+
+        return BrowserState(
+            cookies=[_cookie_to_cdp(c) for c in self.session.cookies],
+            origin=origin_of(self.base_url),
+            local_storage={},
+            session_storage={},
+        )
+
+    def password_grant(self, token_url: str, client_id: str, email: str, password: str,
+                       client_secret: str = None, scope: str = "openid") -> dict:
+        """
+        Raw tokens via the resource-owner password grant (only works for clients
+        that have Direct Access Grants enabled). Returns the token JSON.
+        """
+        data = {
+            "grant_type": "password",
+            "client_id": client_id,
+            "username": email,
+            "password": password,
+            "scope": scope,
+        }
+        if client_secret:
+            data["client_secret"] = client_secret
+        resp = self.session.post(token_url, data=data, timeout=self.timeout)
+        if resp.status_code != 200:
+            raise LoginError(f"Token endpoint returned HTTP {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+
+    # ─── flow steps ─────────────────────────────────────────────────────────────
+
+    def _start_sign_in(self) -> requests.Response:
+        """Ask the frontend to start the sign-in; follow it to the IdP login page."""
+        csrf = self.session.get(urljoin(self.base_url, AUTH_CSRF_PATH), timeout=self.timeout)
+        token = None
+        if csrf.ok:
+            try:
+                token = csrf.json().get("csrfToken")
+            except ValueError:
+                token = None
+
+        signin_url = urljoin(self.base_url, AUTH_SIGNIN_PATH)
+        if token:
+            resp = self.session.post(
+                signin_url,
+                data={"csrfToken": token, "callbackUrl": self.base_url, "json": "true"},
+                allow_redirects=True,
+                timeout=self.timeout,
+            )
+            # with json=true next-auth answers {"url": <authorize URL>} instead of redirecting
+            if "application/json" in resp.headers.get("content-type", ""):
+                resp = self.session.get(resp.json()["url"], timeout=self.timeout)
+        else:
+            resp = self.session.get(signin_url, allow_redirects=True, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp
+
+    def _form_action(self, resp: requests.Response) -> str:
+        parser = _LoginFormParser()
+        parser.feed(resp.text)
+        if not parser.action:
+            raise LoginError(f"No login form found at {resp.url}")
+        return urljoin(resp.url, unescape(parser.action))
+
+    @staticmethod
+    def _looks_like_login_form(html: str) -> bool:
+        return 'id="kc-form-login"' in html
+
+
+def timed_login(api: ApiLogin, email: str, password: str):
+    """(BrowserState, seconds) — used by the fixture log line and the benchmark."""
+    started = time.perf_counter()
+    state = api.login(email, password)
+    return state, time.perf_counter() - started
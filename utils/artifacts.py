@@ -0,0 +1,152 @@
+# utils/artifacts.py
+
+"""
+Debug artifacts (screenshots, page HTML) taken by page objects, by policy.
+
+  off      nothing is captured, failures included
+  failure  only failure paths capture (BasePage.capture_failure) — default
+  step     also BasePage.capture_step calls and the end of every
+           page-object step (ARTIFACTS is then a STEPS hook)
+
+Only the WebDriver round trip (screenshot / page_source) happens on the test's
+thread. Decoding and writing go to a background thread. Files land in
+ARTIFACT_DIR/<test name>/ (relative to `base_dir`, which conftest sets to
+the directory pytest was started from) with a running number, so they sort
+in the order they were taken. Happy-path runs at the default level take no screenshots.
+
+conftest sets the level (--artifacts, or ARTIFACT_LEVEL), calls
+start_test()/end_test() around every browser test and lists the files in
+the test's user_properties ("artifacts").
+"""
+
+import base64
+import os
+import queue
+import re
+import threading
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+ARTIFACT_LEVELS = ("off", "failure", "step")
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", "artifacts"))
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "artifact"
+
+
+class ArtifactWriter:
+    """Writes (path, payload) jobs on a background thread."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path, payload, encoding) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((path, payload, encoding))
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                path, payload, encoding = job
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    if encoding == "base64":
+                        path.write_bytes(base64.b64decode(payload))
+                    else:
+                        path.write_text(payload, encoding="utf-8")
+                except Exception as e:
+                    log.warning("Could not write %s: %s", path, e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every submitted file is on disk."""
+        self._queue.join()
+
+    def close(self, timeout: float = 60) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+
+class ArtifactManager:
+    def __init__(self, level: str = os.getenv("ARTIFACT_LEVEL", "failure")):
+        self.level = level
+        self.writer = ArtifactWriter()
+        self.driver = None
+        # where report.json is; saved paths are relative to it
+        self.base_dir = Path.cwd()
+        self.dir = self.base_dir / ARTIFACT_DIR / "session"
+        self.saved = []
+        self._n = 0
+
+    # ── per test ─────────────────────────────────────────────────────────
+    def start_test(self, driver, test_name: str) -> None:
+        self.driver = driver
+        self.dir = self.base_dir / ARTIFACT_DIR / _safe(test_name)
+        self.saved = []
+        self._n = 0
+
+    def end_test(self) -> list:
+        """Paths saved for the test that just ended (all written by the time this returns)."""
+        self.writer.flush()
+        saved, self.saved = self.saved, []
+        self.driver = None
+        return saved
+
+    # ── capture ──────────────────────────────────────────────────────────
+    def capture_step(self, driver, label: str) -> None:
+        """Screenshot at a checkpoint; only at level "step"."""
+        if self.level == "step":
+            self._capture(driver, label, html=False)
+
+    def capture_failure(self, driver, label: str) -> None:
+        """Screenshot + page HTML on a failure path; skipped at level "off"."""
+        if self.level != "off":
+            self._capture(driver, label, html=True)
+
+    def _capture(self, driver, label, html):
+        self._n += 1
+        stem = f"{self._n:02d}_{_safe(label)}"
+        try:
+            png = driver.get_screenshot_as_base64()
+            self._submit(self.dir / f"{stem}.png", png, "base64")
+            if html:
+                self._submit(self.dir / f"{stem}.html", driver.page_source, "text")
+        except Exception as e:
+            # never let a debug capture mask the error being debugged
+            log.warning("Could not capture %s: %s", label, e.__class__.__name__)
+
+    def _submit(self, path, payload, encoding):
+        self.writer.submit(path, payload, encoding)
+        self.saved.append(os.path.relpath(path, self.base_dir))
+
+    # ── STEPS hook (level "step") ────────────────────────────────────────
+    def step_started(self, name) -> None:
+        pass
+
+    def step_finished(self, name) -> None:
+        if self.driver is not None:
+            self.capture_step(self.driver, name)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+ARTIFACTS = ArtifactManager()
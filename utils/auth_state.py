@@ -0,0 +1,102 @@
+# utils/auth_state.py
+
+import base64
+import json
+import os
+import re
+import time
+
+from utils.browser_state import BrowserState
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Re-login anyway once a saved state is older than this (seconds)
+AUTH_STATE_TTL = int(os.getenv("AUTH_STATE_TTL", "1800"))
+# Treat tokens expiring within this window as already expired
+EXPIRY_MARGIN = 60
+
+_AUTH_COOKIE = re.compile(r"session|token|auth|keycloak|kc_", re.IGNORECASE)
+_JWT = re.compile(r"eyJ[\w-]+\.eyJ[\w-]+\.[\w-]*")
+
+
+def _jwt_exp(token: str):
+    """`exp` claim of an unverified JWT, or None if it has none / is not a JWT."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+def state_expiry(state: BrowserState):
+    """
+    Earliest expiry (epoch seconds) found in the state: expiring auth cookies
+    and the `exp` claim of any JWT stored in cookies or web storage.
+    None if nothing in the state carries an expiry.
+    """
+    expiries = []
+    for cookie in state.cookies:
+        if not _AUTH_COOKIE.search(cookie.get("name", "")):
+            continue
+        expires = cookie.get("expires", cookie.get("expiry", -1))
+        if expires and expires > 0:
+            expiries.append(expires)
+        expiries.extend(filter(None, (_jwt_exp(t) for t in _JWT.findall(cookie.get("value", "")))))
+
+    for store in (state.local_storage, state.session_storage):
+        for value in store.values():
+            expiries.extend(filter(None, (_jwt_exp(t) for t in _JWT.findall(value or ""))))
+
+    return min(expiries) if expiries else None
+
+
+class AuthStateStore:
+    """
+    Logged-in browser state per credential, kept for the whole pytest session
+    (per xdist worker). Tokens only ever live in memory.
+    """
+
+    def __init__(self, ttl: int = AUTH_STATE_TTL):
+        self.ttl = ttl
+        self._states = {}
+        # what provider_home did, for the end-of-session summary
+        self.logins = 0
+        self.api_logins = 0
+        self.restores = 0
+
+    def get(self, email: str):
+        """Saved state for `email`, or None if there is none or it has expired."""
+        state = self._states.get(email)
+        if state is None:
+            return None
+        if self.is_expired(state):
+            log.info("Saved session for %s expired, a fresh login is needed", email)
+            self.invalidate(email)
+            return None
+        return state
+
+    def put(self, email: str, state: BrowserState) -> None:
+        self._states[email] = state
+
+    def count_restore(self) -> None:
+        """A saved state was restored and the dashboard accepted it."""
+        self.restores += 1
+
+    def count_login(self, api: bool = False) -> None:
+        """A login ran: through the Keycloak form, or over HTTP with `api`."""
+        if api:
+            self.api_logins += 1
+        else:
+            self.logins += 1
+
+    def invalidate(self, email: str) -> None:
+        self._states.pop(email, None)
+
+    def is_expired(self, state: BrowserState, now: float = None) -> bool:
+        now = now or time.time()
+        if now - state.captured_at > self.ttl:
+            return True
+        expiry = state_expiry(state)
+        return expiry is not None and expiry - EXPIRY_MARGIN <= now
@@ -0,0 +1,209 @@
+# utils/browser_pool.py
+
+import shutil
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Implicit wait every browser is handed out with. Zero: all waiting goes
+# through BasePage's explicit wait engine, so the two never compound.
+IMPLICIT_WAIT = 0
+
+
+def origin_of(url: str):
+    """Return scheme://host[:port] for http(s) URLs, None for about:, data:, etc."""
+    parts = urlparse(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def is_alive(driver) -> bool:
+    """Cheap liveness probe: a crashed browser or dead session raises here."""
+    try:
+        driver.window_handles
+        return True
+    except WebDriverException:
+        return False
+
+
+def reset_browser(driver, origins=()) -> None:
+    """
+    Bring a used browser back to a clean state without relaunching it:
+      1) close every tab except the first one
+      2) drop cookies and per-origin storage (localStorage, sessionStorage,
+         IndexedDB, service workers, cache storage)
+      3) undo CDP overrides a test may have left behind
+      4) park the tab on about:blank
+    The HTTP cache is deliberately kept, that is what makes the next test fast.
+    """
+    origins = {o for o in origins if o}
+
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        origins.add(origin_of(driver.current_url))
+        driver.close()
+    driver.switch_to.window(handles[0])
+    origins.add(origin_of(driver.current_url))
+    origins.discard(None)
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+            )
+        driver.execute_cdp_cmd("Network.setExtraHTTPHeaders", {"headers": {}})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+    else:
+        # Firefox: no CDP, so clear what we can reach from the current page
+        driver.delete_all_cookies()
+        if origin_of(driver.current_url):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+    driver.get("about:blank")
+    driver.implicitly_wait(IMPLICIT_WAIT)
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping the pool needs to recycle it."""
+
+    def __init__(self, driver, profile_dir=None):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.uses = 0
+        self.launched_at = time.monotonic()
+
+
+class BrowserPool:
+    """
+    Warm browsers for one pytest process (so one pool per xdist worker).
+
+    `launcher` is a zero-argument callable returning (driver, profile_dir).
+    acquire() hands out an idle browser or launches a new one; release() resets
+    it for the next test, or retires it once it has served `max_uses` tests,
+    crashed, or failed to reset.
+
+    `after_reset(driver)` runs after each successful reset (e.g. to put back
+    seeded consent cookies); `discard_profile(path)` removes a retired
+    browser's profile dir (default: rmtree inline).
+    """
+
+    def __init__(self, launcher, max_uses: int = 20, origins=(), after_reset=None,
+                 discard_profile=None):
+        self._launcher = launcher
+        self.max_uses = max_uses
+        # origins whose storage is always wiped on reset (e.g. the site under test)
+        self.origins = set(origins)
+        self._after_reset = after_reset
+        self._discard_profile = discard_profile or (lambda path: shutil.rmtree(path, ignore_errors=True))
+        self._idle = []
+        self._busy = {}
+        self.launches = 0
+        self.retired = 0
+
+    def acquire(self):
+        pooled = None
+        while self._idle:
+            candidate = self._idle.pop()
+            if is_alive(candidate.driver):
+                pooled = candidate
+                break
+            log.warning("Idle browser is dead, discarding it")
+            self._retire(candidate)
+
+        if pooled is None:
+            started = time.monotonic()
+            driver, profile_dir = self._launcher()
+            pooled = PooledBrowser(driver, profile_dir)
+            self.launches += 1
+            seconds = time.monotonic() - started
+            log.info("Launched browser #%d in %.2fs", self.launches, seconds,
+                     extra={"data": {"key": "browser_launch", "metric": "duration_s", "value": seconds}})
+
+        pooled.uses += 1
+        self._busy[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, driver, healthy: bool = True) -> None:
+        pooled = self._busy.pop(id(driver), None)
+        if pooled is None:
+            # not one of ours; just make sure it does not leak
+            self._quit(driver)
+            return
+
+        if not healthy or pooled.uses >= self.max_uses or not is_alive(driver):
+            self._retire(pooled)
+            return
+
+        try:
+            reset_browser(driver, self.origins)
+            if self._after_reset:
+                self._after_reset(driver)
+        except WebDriverException as e:
+            log.warning("Reset failed (%s), retiring browser", e.__class__.__name__)
+            self._retire(pooled)
+            return
+
+        self._idle.append(pooled)
+
+    def close(self) -> None:
+        for pooled in self._idle + list(self._busy.values()):
+            self._retire(pooled)
+        self._idle.clear()
+        self._busy.clear()
+        log.info("Closed: %d launch(es), %d retired", self.launches, self.retired)
+
+    def _retire(self, pooled: PooledBrowser) -> None:
+        self._quit(pooled.driver)
+        if pooled.profile_dir:
+            self._discard_profile(pooled.profile_dir)
+        self.retired += 1
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPools:
+    """
+    One BrowserPool per launch configuration. Some settings (the page-load
+    strategy, for one) are capabilities fixed when the browser starts, so
+    browsers launched with different values can't be shared.
+
+    `make_launcher(key)` returns the launcher for that key; each pool is
+    created the first time its key is asked for.
+    """
+
+    def __init__(self, make_launcher, max_uses: int = 20, origins=(), **pool_kwargs):
+        self._make_launcher = make_launcher
+        self.max_uses = max_uses
+        self.origins = list(origins)
+        # after_reset / discard_profile, passed to every BrowserPool
+        self._pool_kwargs = pool_kwargs
+        self._pools = {}
+
+    def get(self, key) -> BrowserPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = BrowserPool(
+                self._make_launcher(key), max_uses=self.max_uses, origins=self.origins,
+                **self._pool_kwargs,
+            )
+        return pool
+
+    def close(self) -> None:
+        for key, pool in self._pools.items():
+            log.debug("Closing pool %r", key)
+            pool.close()
+        self._pools.clear()
@@ -0,0 +1,133 @@
+# utils/browser_state.py
+
+import json
+import time
+
+from utils.browser_pool import origin_of
+
+# sessionStorage flag the restore script leaves behind so it only seeds a tab once
+RESTORED_FLAG = "__cds_state_restored"
+
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+_READ_STORAGE_JS = """
+var out = {local: {}, session: {}};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var k = window.localStorage.key(i);
+    out.local[k] = window.localStorage.getItem(k);
+}
+for (var j = 0; j < window.sessionStorage.length; j++) {
+    var s = window.sessionStorage.key(j);
+    if (s !== arguments[0]) { out.session[s] = window.sessionStorage.getItem(s); }
+}
+return out;
+"""
+
+_RESTORE_JS = """
+(function () {
+    if (window.location.origin !== %(origin)s) { return; }
+    try {
+        if (window.sessionStorage.getItem(%(flag)s)) { return; }
+        var local = %(local)s, session = %(session)s;
+        Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+        Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+        window.sessionStorage.setItem(%(flag)s, "1");
+    } catch (e) { /* storage disabled for this document */ }
+})();
+"""
+
+
+class BrowserState:
+    """Cookies (all domains) plus local/session storage of one origin."""
+
+    def __init__(self, cookies, origin, local_storage, session_storage, captured_at=None):
+        self.cookies = cookies
+        self.origin = origin
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.captured_at = captured_at or time.time()
+
+
+def capture_state(driver) -> BrowserState:
+    """Snapshot the browser's cookies and the current origin's web storage."""
+    if hasattr(driver, "execute_cdp_cmd"):
+        # every domain, including the identity provider's httpOnly session cookies
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    else:
+        cookies = driver.get_cookies()
+    storage = driver.execute_script(_READ_STORAGE_JS, RESTORED_FLAG)
+    return BrowserState(
+        cookies=cookies,
+        origin=origin_of(driver.current_url),
+        local_storage=storage["local"],
+        session_storage=storage["session"],
+    )
+
+
+def cdp_cookie(cookie: dict) -> dict:
+    out = {k: cookie[k] for k in _COOKIE_FIELDS if k in cookie}
+    # session cookies are reported with expires == -1; setCookies wants it omitted
+    if out.get("expires", -1) <= 0:
+        out.pop("expires", None)
+    # WebDriver's get_cookies() calls it "expiry"
+    if "expiry" in cookie and "expires" not in out:
+        out["expires"] = cookie["expiry"]
+    return out
+
+
+def restore_state(driver, state: BrowserState):
+    """
+    Put `state` into a browser *before* it navigates to the origin.
+
+    Chrome: cookies go in through CDP and storage is seeded by a script that
+    runs at the start of every new document on that origin (once per tab).
+    Returns the script identifier so the caller can remove it again.
+
+    Firefox: no CDP, so visit the origin once and write cookies/storage there.
+    Returns None.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd(
+            "Network.setCookies", {"cookies": [cdp_cookie(c) for c in state.cookies]}
+        )
+        if not state.origin:
+            return None
+        source = _RESTORE_JS % {
+            "origin": json.dumps(state.origin),
+            "flag": json.dumps(RESTORED_FLAG),
+            "local": json.dumps(state.local_storage),
+            "session": json.dumps(state.session_storage),
+        }
+        return driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+        )["identifier"]
+
+    if state.origin:
+        driver.get(state.origin)
+        for cookie in state.cookies:
+            try:
+                driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite"})
+            except Exception:
+                # cookies of other domains cannot be set from this page
+                pass
+        driver.execute_script(
+            _RESTORE_JS % {
+                "origin": json.dumps(state.origin),
+                "flag": json.dumps(RESTORED_FLAG),
+                "local": json.dumps(state.local_storage),
+                "session": json.dumps(state.session_storage),
+            }
+        )
+    return None
+
+
+def remove_restore_script(driver, identifier) -> None:
+    """Undo restore_state()'s new-document script (no-op for None)."""
+    if identifier is None:
+        return
+    try:
+        driver.execute_cdp_cmd(
+            "Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier}
+        )
+    except Exception:
+        pass
@@ -0,0 +1,283 @@
+# utils/chrome_profile.py
+
+"""
+Prebaked Chrome profile template, cloned per launch instead of starting Chrome
+on an empty user-data dir every time.
+
+The template is built once per Chrome major version (under a file lock, so
+one xdist worker bakes and the rest wait): first-run work done, the site's
+cookie consent accepted and its static assets in the HTTP cache. Each launch
+gets a copy — reflinked where the filesystem supports it (btrfs, XFS), a
+plain copy otherwise. Hard links are not used: Chrome rewrites its SQLite
+and LevelDB files in place and would corrupt the shared template.
+
+The consent cookies/storage captured while baking are kept next to the
+template as the "seed state", so a pooled browser can get them back after
+reset_browser() wipes the site's cookies and storage.
+
+Retired profile dirs are deleted by a background thread (ProfileReaper) so
+teardown doesn't wait on rmtree.
+"""
+
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from filelock import FileLock
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from locators.homepage_locators import HomepageLocators
+from utils.browser_state import cdp_cookie, capture_state
+from utils.driver_resolver import CACHE_DIR, LOCK_TIMEOUT, installed_browser_version
+from utils.network_idle import inject_network_tracker, is_network_idle, network_state
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Rebuild the template once it is older than this (hours)
+PROFILE_TEMPLATE_MAX_AGE = float(os.getenv("PROFILE_TEMPLATE_MAX_AGE", "24"))
+# Baking waits for the warmed page to stay this quiet (ms) before capturing it
+BAKE_QUIET_MS = 1000
+
+READY_MARKER = ".template-ready"
+SEED_FILE = "seed-state.json"
+
+# Chrome's per-process lock files plus our own bookkeeping; never copied
+_SKIP = shutil.ignore_patterns("Singleton*", "lockfile", "Crashpad", READY_MARKER, SEED_FILE)
+
+# FICLONE from <linux/fs.h>; tried once, then plain copies if unsupported
+_FICLONE = 0x40049409
+_reflink_ok = sys.platform.startswith("linux")
+
+# per-process memo of the template path (None = baking failed, use empty profiles)
+_template = {}
+
+_SEED_STORAGE_JS = """
+(function () {
+    if (window.location.origin !== %(origin)s) { return; }
+    try {
+        var local = %(local)s;
+        Object.keys(local).forEach(function (k) {
+            if (window.localStorage.getItem(k) === null) { window.localStorage.setItem(k, local[k]); }
+        });
+    } catch (e) { /* storage disabled for this document */ }
+})();
+"""
+
+
+def template_dir(browser_version=None):
+    major = (browser_version or installed_browser_version("chrome") or "unknown").split(".")[0]
+    return CACHE_DIR / f"chrome-profile-{major}"
+
+
+def _is_fresh(path) -> bool:
+    marker = path / READY_MARKER
+    if not marker.exists():
+        return False
+    return (time.time() - marker.stat().st_mtime) < PROFILE_TEMPLATE_MAX_AGE * 3600
+
+
+def ensure_template(bake):
+    """
+    Path of a ready template, baking it first if missing or stale.
+    `bake(path)` must launch Chrome on `path`, prepare it and quit, returning
+    the seed state dict (or None). Returns None if baking fails.
+    """
+    if "path" in _template:
+        return _template["path"]
+
+    path = template_dir()
+    try:
+        if not _is_fresh(path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with FileLock(str(path) + ".lock", timeout=LOCK_TIMEOUT):
+                # another worker may have finished baking while we waited
+                if not _is_fresh(path):
+                    _bake_into(path, bake)
+    except Exception as e:
+        log.warning("Could not bake a profile template (%s: %s); using empty profiles",
+                    e.__class__.__name__, e)
+        path = None
+
+    _template["path"] = path
+    return path
+
+
+def _bake_into(path, bake):
+    started = time.monotonic()
+    building = path.with_name(f"{path.name}.building-{os.getpid()}")
+    shutil.rmtree(building, ignore_errors=True)
+    building.mkdir(parents=True)
+    try:
+        seed = bake(str(building))
+        with open(building / SEED_FILE, "w", encoding="utf-8") as f:
+            json.dump(seed or {}, f)
+        (building / READY_MARKER).touch()
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(building, path)
+    log.info("Baked profile template %s in %.1fs", path, time.monotonic() - started)
+
+
+def bake_profile(driver, url, consent_locator=None, timeout: float = 15):
+    """
+    Prepare a freshly launched browser for use as the template: load `url`
+    (warms the HTTP cache), accept the cookie banner and let the page go
+    quiet. Returns the seed state to restore after pool resets.
+    """
+    if not url:
+        # nothing to warm; Chrome's own first-run work is still done
+        driver.get("about:blank")
+        return None
+
+    driver.get(url)
+    try:
+        WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, consent_locator or HomepageLocators.COOKIE_CONSENT_ACCEPT))
+        ).click()
+    except TimeoutException:
+        pass  # no banner on this deployment
+
+    inject_network_tracker(driver)
+    mark = [network_state(driver)]
+
+    def _quiet(driver):
+        state = network_state(driver)
+        if state is None:
+            return False
+        if mark[0] is None:
+            mark[0] = state
+        return is_network_idle(state, mark[0], quiet_ms=BAKE_QUIET_MS)
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(_quiet)
+    except TimeoutException:
+        pass  # a page that keeps polling still makes a usable template
+
+    state = capture_state(driver)
+    return {"cookies": state.cookies, "origin": state.origin, "local": state.local_storage}
+
+
+def load_seed(template):
+    if template is None:
+        return None
+    try:
+        with open(template / SEED_FILE, encoding="utf-8") as f:
+            return json.load(f) or None
+    except (OSError, ValueError):
+        return None
+
+
+def install_seed_storage(driver, seed) -> None:
+    """
+    Register a new-document script that puts the seed's localStorage keys
+    back whenever they are missing. Added once per browser; it survives
+    resets and never overwrites values a test has set.
+    """
+    if not seed or not seed.get("origin") or not seed.get("local"):
+        return
+    source = _SEED_STORAGE_JS % {
+        "origin": json.dumps(seed["origin"]),
+        "local": json.dumps(seed["local"]),
+    }
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    except Exception:
+        pass
+
+
+def restore_seed_cookies(driver, seed) -> None:
+    """Put the seed cookies back after reset_browser() cleared them."""
+    if not seed or not seed.get("cookies"):
+        return
+    try:
+        driver.execute_cdp_cmd(
+            "Network.setCookies", {"cookies": [cdp_cookie(c) for c in seed["cookies"]]}
+        )
+    except Exception:
+        pass
+
+
+def _clone_file(src, dst):
+    global _reflink_ok
+    if _reflink_ok:
+        import fcntl
+
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            # filesystem can't reflink (ext4, tmpfs, cross-device); stop trying
+            _reflink_ok = False
+    return shutil.copy2(src, dst)
+
+
+def clone_profile(template, prefix: str = "chrome-user-data-") -> str:
+    """Fresh temp user-data dir populated from `template`."""
+    started = time.monotonic()
+    dest = tempfile.mkdtemp(prefix=prefix)
+    shutil.copytree(
+        template, dest, ignore=_SKIP, copy_function=_clone_file,
+        symlinks=True, dirs_exist_ok=True,
+    )
+    method = "reflink" if _reflink_ok else "copy"
+    seconds = time.monotonic() - started
+    log.info("Cloned template (%s) in %.2fs", method, seconds,
+             extra={"data": {"key": "profile_clone", "metric": "duration_s", "value": seconds}})
+    return dest
+
+
+class ProfileReaper:
+    """Deletes retired profile dirs on a background thread."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def reap(self, path) -> None:
+        if not path:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="profile-reaper", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(path)
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                if path is None:
+                    return
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._queue.task_done()
+
+    def drain(self, timeout: float = 60) -> None:
+        """Finish pending deletions (called once at session end)."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+
+REAPER = ProfileReaper()
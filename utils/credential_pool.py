@@ -0,0 +1,116 @@
+# utils/credential_pool.py
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from filelock import FileLock, Timeout
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+_EMAIL_VAR = re.compile(r"^TEST_EMAIL_(\d+)$")
+
+
+def discover_credentials(environ=None) -> list:
+    """
+    Every (index, email, password) for which both TEST_EMAIL_<n> and
+    TEST_PASSWORD_<n> are set, ordered by n. If TEST_USER_INDEX is set, only
+    that account is returned (keeps the old single-account behaviour working).
+    """
+    environ = os.environ if environ is None else environ
+    found = []
+    for key, email in environ.items():
+        m = _EMAIL_VAR.match(key)
+        if not m or not email:
+            continue
+        idx = int(m.group(1))
+        password = environ.get(f"TEST_PASSWORD_{idx}")
+        if password:
+            found.append((idx, email, password))
+    found.sort()
+
+    pinned = environ.get("TEST_USER_INDEX")
+    if pinned:
+        found = [c for c in found if c[0] == int(pinned)]
+    return found
+
+
+def worker_number() -> int:
+    """0 for the controller / non-xdist runs, n for xdist worker 'gw<n>'."""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+    return int(worker[2:]) if worker[2:].isdigit() else 0
+
+
+class Lease:
+    """One account checked out of the pool; release() gives it back."""
+
+    def __init__(self, index, email, password, lock):
+        self.index = index
+        self.email = email
+        self.password = password
+        self._lock = lock
+
+    def release(self) -> None:
+        if self._lock is not None:
+            self._lock.release()
+            self._lock = None
+
+
+class CredentialPool:
+    """
+    Hands out test accounts so that no two pytest processes (xdist workers,
+    or separate runs sharing `lock_dir`) use the same account at once.
+
+    Each account is guarded by its own lock file. acquire() starts probing at
+    this worker's slot, so with enough accounts every worker keeps "its" own
+    account; when all are taken it polls until one frees up or `wait_timeout`
+    seconds pass.
+    """
+
+    def __init__(self, credentials, lock_dir, wait_timeout: float = 600, poll_interval: float = 0.5):
+        self.credentials = list(credentials)
+        self.lock_dir = Path(lock_dir)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    def acquire(self) -> Lease:
+        if not self.credentials:
+            raise RuntimeError("Credential pool is empty: set TEST_EMAIL_<n>/TEST_PASSWORD_<n>")
+
+        start = worker_number() % len(self.credentials)
+        order = self.credentials[start:] + self.credentials[:start]
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+
+        while True:
+            for idx, email, password in order:
+                lock = FileLock(str(self.lock_dir / f"credential-{idx}.lock"))
+                try:
+                    lock.acquire(timeout=0)
+                except Timeout:
+                    continue
+                if waited:
+                    log.info("Got account #%d after waiting in the queue", idx)
+                return Lease(idx, email, password, lock)
+
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"All {len(self.credentials)} test account(s) stayed busy for {self.wait_timeout}s"
+                )
+            if not waited:
+                log.info("All %d account(s) in use, queueing…", len(self.credentials))
+                waited = True
+            time.sleep(self.poll_interval)
+
+    @contextmanager
+    def lease(self):
+        lease = self.acquire()
+        try:
+            yield lease
+        finally:
+            lease.release()
@@ -0,0 +1,192 @@
+# utils/driver_resolver.py
+
+"""
+Resolve the chromedriver / geckodriver binary once and share the answer.
+
+Every xdist worker used to call ChromeDriverManager().install() for every test,
+i.e. N concurrent version lookups (and possibly downloads) per test. Here the
+lookup result is kept in an on-disk cache guarded by a file lock, so:
+  - the first worker to need a driver resolves it, the others wait on the lock
+    and then read the cached path;
+  - a cached binary whose major version matches the installed browser is used
+    without touching the network;
+  - a pinned CHROMEDRIVER_PATH / GECKODRIVER_PATH always wins;
+  - offline mode never downloads and fails with a clear message instead.
+"""
+
+import json
+import os
+import stat
+import time
+from pathlib import Path
+
+from filelock import FileLock
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# pinned driver binaries, checked before anything else
+DRIVER_PATH_ENV = {
+    "chrome": "CHROMEDRIVER_PATH",
+    "firefox": "GECKODRIVER_PATH",
+}
+
+# browser names as understood by webdriver_manager's OS probe
+_BROWSER_TYPES = {
+    "chrome": ("google-chrome", "chromium"),
+    "firefox": ("firefox",),
+}
+
+CACHE_DIR = Path(os.getenv("DRIVER_CACHE_DIR", Path.home() / ".cache" / "civicdataspace-test"))
+CACHE_FILE = CACHE_DIR / "drivers.json"
+LOCK_TIMEOUT = 300
+
+# per-process memo: once resolved, later launches in this worker are free
+_resolved = {}
+
+
+def offline_requested() -> bool:
+    return os.getenv("DRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def installed_browser_version(browser: str):
+    """Ask the OS (no network) which browser version is installed, or None."""
+    from webdriver_manager.core.os_manager import OperationSystemManager
+
+    osm = OperationSystemManager()
+    for browser_type in _BROWSER_TYPES.get(browser, ()):
+        try:
+            version = osm.get_browser_version_from_os(browser_type)
+        except Exception:
+            version = None
+        if version:
+            return version
+    return None
+
+
+def _major(version):
+    return str(version).split(".")[0] if version else None
+
+
+def _is_executable(path) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache: dict) -> None:
+    # write-then-rename so lock-free readers never see a half-written file
+    tmp = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    os.replace(tmp, CACHE_FILE)
+
+
+def _cache_key(browser: str, version) -> str:
+    return f"{browser}-{_major(version) or 'unknown'}"
+
+
+def _lookup(cache: dict, browser: str, version):
+    """Return a usable cached path for this browser version, or None."""
+    entry = cache.get(_cache_key(browser, version))
+    if entry and _is_executable(entry.get("path")):
+        return entry["path"]
+    return None
+
+
+def _any_cached(cache: dict, browser: str):
+    """Newest usable cached binary for `browser`, whatever its version."""
+    entries = [
+        e for key, e in cache.items()
+        if key.startswith(f"{browser}-") and _is_executable(e.get("path"))
+    ]
+    if not entries:
+        return None
+    return max(entries, key=lambda e: e.get("resolved_at", 0))["path"]
+
+
+def _download(browser: str) -> str:
+    """Resolve via webdriver_manager (may hit the network)."""
+    if browser == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    # 1) Fetch via webdriver_manager
+    raw_path = ChromeDriverManager().install()
+    folder = os.path.dirname(raw_path)
+
+    # 2) If the returned path isn't the actual binary, look for it
+    if os.access(raw_path, os.X_OK) and os.path.basename(raw_path).lower() in ("chromedriver", "chromedriver.exe"):
+        return raw_path
+
+    candidates = [
+        fn for fn in os.listdir(folder)
+        if fn.lower() in ("chromedriver", "chromedriver.exe")
+    ]
+    if not candidates:
+        raise RuntimeError(
+            f"Couldn’t find executable ‘chromedriver’ in {folder}. "
+            f"Files there: {os.listdir(folder)}"
+        )
+    real = os.path.join(folder, candidates[0])
+    # ensure it’s executable
+    st = os.stat(real)
+    os.chmod(real, st.st_mode | stat.S_IXUSR)
+    return real
+
+
+def resolve_driver(browser: str, offline: bool = False) -> str:
+    """Return the path of a driver binary for `browser` ("chrome" or "firefox")."""
+    if browser in _resolved:
+        return _resolved[browser]
+
+    env_var = DRIVER_PATH_ENV.get(browser)
+    if env_var is None:
+        raise ValueError(f"Unsupported browser: {browser!r}")
+
+    pinned = os.getenv(env_var)
+    if pinned:
+        if not _is_executable(pinned):
+            raise RuntimeError(f"{env_var}={pinned} is not an executable file")
+        _resolved[browser] = pinned
+        return pinned
+
+    offline = offline or offline_requested()
+    version = installed_browser_version(browser)
+
+    # Fast path: no lock needed, the cache file is only ever replaced atomically
+    path = _lookup(_read_cache(), browser, version)
+
+    if path is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(CACHE_FILE) + ".lock", timeout=LOCK_TIMEOUT):
+            # another worker may have filled the cache while we waited
+            cache = _read_cache()
+            path = _lookup(cache, browser, version)
+            if path is None and offline:
+                path = _any_cached(cache, browser)
+                if path is None:
+                    raise RuntimeError(
+                        f"Offline mode: no cached {browser} driver in {CACHE_FILE} "
+                        f"and {env_var} is not set"
+                    )
+                log.warning("Offline mode: using cached %s driver %s (installed browser version: %s)",
+                            browser, path, version or "unknown")
+            elif path is None:
+                path = _download(browser)
+                cache[_cache_key(browser, version)] = {
+                    "path": path,
+                    "browser_version": version,
+                    "resolved_at": time.time(),
+                }
+                _write_cache(cache)
+
+    _resolved[browser] = path
+    return path
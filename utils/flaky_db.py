@@ -0,0 +1,213 @@
+# utils/flaky_db.py
+
+"""
+Outcome history of every test, and flake rates scored from it.
+
+After each run, pytest_sessionfinish stores each test of report.json in a
+local SQLite database (FLAKE_DB, default DRIVER_CACHE_DIR/flaky.sqlite). A
+row holds the nodeid, the git SHA, the outcome, the number of retries
+(pytest-rerunfailures "rerun" entries, or a "retries" user property) and
+the call duration.
+
+A failure is counted as flaky when the same test also passed on the same
+SHA: the code didn't change, the result did. A pass that needed a retry
+counts as flaky too. Over its own last FLAKE_WINDOW results (default 50),
+so partial runs (-k, a single file) don't push it out of the window, a test's
+
+  flake_rate        (flaky failures + passes after a retry) / runs
+  fail_rate         failures / runs
+  time_to_failure   median / p90 of the call duration of its failed runs
+
+are written to flaky_tests.json after every run, worst first.
+
+--quarantine marks tests whose flake rate is at least FLAKE_QUARANTINE_RATE
+(default 0.2) over at least FLAKE_MIN_RUNS runs (default 5) as
+xfail(strict=False). They still run and are still recorded, so they leave
+quarantine once they stabilise, but they no longer fail the run.
+
+A report is recorded once: runs are keyed by report.json's "created" stamp.
+Only browser tests are recorded (report_reader.is_browser_test); reports
+without any (unit tests, --collect-only) are not recorded.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from utils.driver_resolver import CACHE_DIR
+from utils.graphql_recorder import percentile
+from utils.perf_baseline import git_sha
+from utils.report_reader import is_browser_test, iter_report, user_property
+
+FLAKE_DB = Path(os.getenv("FLAKE_DB", CACHE_DIR / "flaky.sqlite"))
+FLAKE_WINDOW = int(os.getenv("FLAKE_WINDOW", "50"))
+FLAKE_MIN_RUNS = int(os.getenv("FLAKE_MIN_RUNS", "5"))
+FLAKE_QUARANTINE_RATE = float(os.getenv("FLAKE_QUARANTINE_RATE", "0.2"))
+FLAKY_FILE = "flaky_tests.json"
+
+PASSED = ("passed", "xpassed")
+FAILED = ("failed", "error")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY,
+    report_created REAL UNIQUE,
+    recorded_at    REAL,
+    git_sha        TEXT,
+    host           TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id     INTEGER REFERENCES runs(id),
+    nodeid     TEXT,
+    git_sha    TEXT,
+    outcome    TEXT,
+    retries    INTEGER,
+    duration_s REAL
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, run_id);
+"""
+
+
+def results_from_report(path) -> tuple:
+    """(created, [(nodeid, outcome, retries, duration_s)]) of a report file's browser tests, streamed."""
+    created = None
+    results = {}
+    reruns = {}
+    for event in iter_report(path):
+        if event[0] == "meta":
+            if event[1] == "created":
+                created = event[2]
+            continue
+        test = event[1]
+        nodeid, outcome = test["nodeid"], test.get("outcome")
+        if outcome == "rerun":
+            reruns[nodeid] = reruns.get(nodeid, 0) + 1
+            continue
+        if not is_browser_test(test):
+            continue
+        if user_property(test, "quarantined") is not None:
+            # a quarantined test is xfail: its real result is what counts
+            outcome = {"xfailed": "failed", "xpassed": "passed"}.get(outcome, outcome)
+        duration = (test.get("call") or {}).get("duration")
+        results[nodeid] = [outcome, int(user_property(test, "retries") or 0), duration]
+    for nodeid, count in reruns.items():
+        if nodeid in results:
+            results[nodeid][1] = max(results[nodeid][1], count)
+    return created, [(nodeid, *row) for nodeid, row in results.items()]
+
+
+class FlakyDB:
+    def __init__(self, path=FLAKE_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # another run on this machine may be writing at the same moment
+        self.db = sqlite3.connect(str(self.path), timeout=30)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, created, results):
+        """Store a report's results under its "created" stamp; returns the run id, or None if already recorded or empty."""
+        if not results:
+            return None
+        sha = git_sha()
+        with self.db:
+            if created is not None and self.db.execute(
+                "SELECT 1 FROM runs WHERE report_created = ?", (created,)
+            ).fetchone():
+                return None
+            run_id = self.db.execute(
+                "INSERT INTO runs (report_created, recorded_at, git_sha, host) VALUES (?, ?, ?, ?)",
+                (created, time.time(), sha, socket.gethostname()),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO results (run_id, nodeid, git_sha, outcome, retries, duration_s) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, nodeid, sha, *row) for nodeid, *row in results],
+            )
+        return run_id
+
+    def scores(self, window=FLAKE_WINDOW) -> list:
+        """Per-test flake statistics over each test's last `window` results, most flaky first."""
+        rows = self.db.execute(
+            "SELECT nodeid, git_sha, outcome, retries, duration_s FROM ("
+            "  SELECT *, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY run_id DESC) AS n FROM results"
+            ") WHERE n <= ?",
+            (window,),
+        ).fetchall()
+        by_test = {}
+        for nodeid, sha, outcome, retries, duration in rows:
+            by_test.setdefault(nodeid, []).append((sha, outcome, retries or 0, duration))
+
+        scores = []
+        for nodeid, results in by_test.items():
+            counted = [r for r in results if r[1] in PASSED + FAILED]
+            if not counted:
+                continue
+            passed_on = {sha for sha, outcome, _, _ in counted if outcome in PASSED}
+            failures = [r for r in counted if r[1] in FAILED]
+            flaky_failures = sum(1 for sha, _, _, _ in failures if sha in passed_on)
+            retried_passes = sum(1 for _, outcome, retries, _ in counted if outcome in PASSED and retries)
+            failed_durations = sorted(d for _, _, _, d in failures if d is not None)
+            scores.append({
+                "nodeid": nodeid,
+                "runs": len(counted),
+                "failures": len(failures),
+                "flaky_failures": flaky_failures,
+                "retried_passes": retried_passes,
+                "flake_rate": round((flaky_failures + retried_passes) / len(counted), 3),
+                "fail_rate": round(len(failures) / len(counted), 3),
+                "time_to_failure_s": {
+                    "median": round(statistics.median(failed_durations), 3),
+                    "p90": round(percentile(failed_durations, 90), 3),
+                } if failed_durations else None,
+                "shas": len({r[0] for r in counted}),
+            })
+        return sorted(scores, key=lambda s: (s["flake_rate"], s["fail_rate"]), reverse=True)
+
+    def quarantined(self, rate=FLAKE_QUARANTINE_RATE, min_runs=FLAKE_MIN_RUNS, window=FLAKE_WINDOW) -> dict:
+        """{nodeid: flake_rate} of the tests to quarantine."""
+        return {
+            s["nodeid"]: s["flake_rate"]
+            for s in self.scores(window)
+            if s["runs"] >= min_runs and s["flake_rate"] >= rate
+        }
+
+
+def record_outcomes(report_path, out_path=FLAKY_FILE, db_path=FLAKE_DB) -> list:
+    """Feed report.json into the history and write the flake scores; returns the flaky tests."""
+    created, results = results_from_report(report_path)
+    if not results:
+        # no browser test ran: leave the history and flaky_tests.json alone
+        return []
+    db = FlakyDB(db_path)
+    try:
+        db.record(created, results)
+        scores = db.scores()
+    finally:
+        db.close()
+    flaky = [s for s in scores if s["flake_rate"] > 0]
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "window": FLAKE_WINDOW,
+            "quarantine_rate": FLAKE_QUARANTINE_RATE,
+            "min_runs": FLAKE_MIN_RUNS,
+            "tests": flaky,
+        }, f, indent=2)
+    return flaky
+
+
+def load_quarantine(db_path=FLAKE_DB) -> dict:
+    """Tests to quarantine, or {} if there is no history yet."""
+    if not Path(db_path).exists():
+        return {}
+    db = FlakyDB(db_path)
+    try:
+        return db.quarantined()
+    finally:
+        db.close()
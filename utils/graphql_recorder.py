@@ -0,0 +1,121 @@
+# utils/graphql_recorder.py
+
+"""
+Every GraphQL operation a test triggers, and per-run latency stats for each.
+
+graphql_calls() turns the driver's NetworkCollector records into one entry per
+operation (a batched POST gives one per operation, sharing the latency).
+conftest stores them in the test's user_properties ("graphql"). The xdist
+controller, or the only process without xdist, gets those through the test
+reports and feeds GRAPHQL_STATS. At the end of the run it prints a per-operation
+table and writes graphql_stats.json with percentiles and latency histograms.
+"""
+
+import json
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def graphql_calls(network) -> list:
+    """One dict per GraphQL operation in `network` (a NetworkCollector)."""
+    network.drain()
+    calls = []
+    for req in network.all():
+        for op_type, name, fields, variables_bytes in req.graphql:
+            latency = req.latency
+            calls.append({
+                "operation": name or (fields[0] if fields else "anonymous"),
+                "type": op_type,
+                "variables_bytes": variables_bytes,
+                "response_bytes": req.encoded_data_length,
+                "status": req.status,
+                "error": req.error_text if req.failed else None,
+                "latency_ms": None if latency is None else round(latency * 1000, 1),
+                "batched": len(req.graphql) > 1,
+            })
+    return calls
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def histogram(values):
+    counts = dict.fromkeys([f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"], 0)
+    for value in values:
+        for bound in LATENCY_BUCKETS_MS:
+            if value <= bound:
+                counts[f"<={bound}"] += 1
+                break
+        else:
+            counts[f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+    return counts
+
+
+class GraphqlRunStats:
+    """GraphQL calls of the whole run, grouped by operation."""
+
+    def __init__(self):
+        self.by_operation = {}
+        self.tests = {}
+
+    def add(self, nodeid, calls) -> None:
+        for call in calls:
+            self.by_operation.setdefault(call["operation"], []).append(call)
+        self.tests[nodeid] = len(calls)
+
+    @property
+    def calls(self) -> int:
+        return sum(len(c) for c in self.by_operation.values())
+
+    def summary(self) -> dict:
+        out = {}
+        for name, calls in self.by_operation.items():
+            latencies = sorted(c["latency_ms"] for c in calls if c["latency_ms"] is not None)
+            out[name] = {
+                "type": calls[0]["type"],
+                "count": len(calls),
+                "errors": sum(1 for c in calls if c["error"] or (c["status"] or 0) >= 400),
+                "total_ms": round(sum(latencies), 1),
+                "p50_ms": percentile(latencies, 50),
+                "p90_ms": percentile(latencies, 90),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+                "max_ms": latencies[-1] if latencies else None,
+                "mean_response_bytes": round(sum(c["response_bytes"] for c in calls) / len(calls)),
+                "max_variables_bytes": max(c["variables_bytes"] for c in calls),
+                "histogram_ms": histogram(latencies),
+            }
+        return dict(sorted(out.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+    def table(self, limit: int = 20):
+        """Lines for the terminal summary, slowest operations (by total time) first."""
+        def ms(value):
+            return "-" if value is None else f"{value:.0f}"
+
+        lines = [f"{'operation':<36} {'n':>5} {'err':>4} {'p50':>7} {'p90':>7} {'p95':>7} "
+                 f"{'max':>7} {'total':>9} {'resp KB':>8}"]
+        for name, s in list(self.summary().items())[:limit]:
+            lines.append(
+                f"{name[:36]:<36} {s['count']:>5} {s['errors']:>4} {ms(s['p50_ms']):>7} "
+                f"{ms(s['p90_ms']):>7} {ms(s['p95_ms']):>7} {ms(s['max_ms']):>7} "
+                f"{ms(s['total_ms']):>9} {s['mean_response_bytes'] / 1024:>8.1f}"
+            )
+        return lines
+
+    def write(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "calls": self.calls,
+                "tests": self.tests,
+                "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+                "operations": self.summary(),
+            }, f, indent=2)
+
+
+GRAPHQL_STATS = GraphqlRunStats()
@@ -0,0 +1,157 @@
+# utils/har.py
+
+"""
+HAR 1.2 export of a driver's recent network traffic, for failed tests.
+
+The entries come from the NetworkCollector's ring buffer, so a HAR holds at
+most HAR_BUFFER_BYTES worth of events, newest kept. Timings are derived from
+Chrome's ResourceTiming the way DevTools does it. With bodies=True, response
+bodies still held by Chrome are added (up to HAR_BODY_MAX_BYTES each).
+Open the file in DevTools (Network → Import HAR) or any HAR viewer.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.network_collector import network_collector
+
+HAR_BODY_MAX_BYTES = int(os.getenv("HAR_BODY_MAX_BYTES", str(1024 * 1024)))
+
+
+def _pairs(headers):
+    return [{"name": k, "value": str(v)} for k, v in (headers or {}).items()]
+
+
+def _timings(entry):
+    """HAR timings (ms) from CDP ResourceTiming; -1 marks phases that didn't happen."""
+    response = entry["response"] or {}
+    timing = response.get("timing")
+    started, finished = entry["started"], entry["finished"]
+    total = (finished - started) * 1000 if finished is not None and started is not None else 0
+    if not timing:
+        # served from cache, failed, or still in flight: only the total is known
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1,
+                "send": 0, "wait": round(max(total, 0), 3), "receive": 0}
+
+    def span(start, end):
+        s, e = timing.get(start, -1), timing.get(end, -1)
+        return e - s if s >= 0 and e >= 0 else -1
+
+    queued = (timing["requestTime"] - started) * 1000 if started is not None else 0
+    first = next((timing[k] for k in ("dnsStart", "connectStart", "sendStart") if timing.get(k, -1) >= 0), 0)
+    send_end = timing.get("sendEnd", 0)
+    headers_end = timing.get("receiveHeadersEnd", send_end)
+    end = (finished - timing["requestTime"]) * 1000 if finished is not None else headers_end
+    return {
+        "blocked": round(max(queued + first, 0), 3),
+        "dns": round(span("dnsStart", "dnsEnd"), 3),
+        "connect": round(span("connectStart", "connectEnd"), 3),
+        "ssl": round(span("sslStart", "sslEnd"), 3),
+        "send": round(max(send_end - timing.get("sendStart", send_end), 0), 3),
+        "wait": round(max(headers_end - send_end, 0), 3),
+        "receive": round(max(end - headers_end, 0), 3),
+    }
+
+
+def _entry(entry, body=None):
+    request, response = entry["request"], entry["response"] or {}
+    timings = _timings(entry)
+    url = request["url"]
+    har_request = {
+        "method": request.get("method") or "GET",
+        "url": url,
+        "httpVersion": response.get("protocol") or "",
+        "cookies": [],
+        "headers": _pairs(request.get("headers")),
+        "queryString": [{"name": k, "value": v} for k, v in parse_qsl(urlsplit(url).query)],
+        "headersSize": -1,
+        "bodySize": len(request["postData"]) if request.get("postData") else 0,
+    }
+    if request.get("postData"):
+        content_type = next(
+            (v for k, v in (request.get("headers") or {}).items() if k.lower() == "content-type"), ""
+        )
+        har_request["postData"] = {"mimeType": content_type, "text": request["postData"]}
+
+    content = {"size": entry["encoded_data_length"], "mimeType": response.get("mimeType") or ""}
+    if body is not None:
+        content["text"], base64 = body
+        if base64:
+            content["encoding"] = "base64"
+    headers = response.get("headers") or {}
+    location = next((v for k, v in headers.items() if k.lower() == "location"), "")
+
+    out = {
+        "startedDateTime": datetime.fromtimestamp(entry["wall_time"] or 0, timezone.utc)
+                                   .isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        "time": round(sum(v for v in timings.values() if v > 0) - max(timings["ssl"], 0), 3),
+        "request": har_request,
+        "response": {
+            "status": response.get("status") or 0,
+            "statusText": response.get("statusText") or "",
+            "httpVersion": response.get("protocol") or "",
+            "cookies": [],
+            "headers": _pairs(headers),
+            "content": content,
+            "redirectURL": location,
+            "headersSize": -1,
+            "bodySize": entry["encoded_data_length"],
+        },
+        "cache": {},
+        "timings": timings,
+        "_resourceType": entry["type"],
+    }
+    if response.get("remoteIPAddress"):
+        out["serverIPAddress"] = response["remoteIPAddress"]
+    if entry["error"]:
+        out["_error"] = entry["error"]
+    return out
+
+
+def _body(driver, request_id):
+    """(text, base64) for a finished request, or None if Chrome no longer has it."""
+    try:
+        result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    except WebDriverException:
+        return None
+    if len(result["body"]) > HAR_BODY_MAX_BYTES:
+        return None
+    return result["body"], result.get("base64Encoded", False)
+
+
+def build_har(driver, bodies: bool = False) -> dict:
+    network = network_collector(driver)
+    network.drain()
+    entries = []
+    for key, entry in network.buffer.entries.items():
+        body = None
+        # redirect hops ("id#n") and failed requests have no body to fetch
+        if bodies and "#" not in key and entry["finished"] is not None and not entry["error"]:
+            body = _body(driver, key)
+        entries.append(_entry(entry, body))
+    log = {
+        "version": "1.2",
+        "creator": {"name": "CivicDataSpace-test", "version": "1.0"},
+        "pages": [],
+        "entries": entries,
+    }
+    if network.buffer.evicted:
+        log["comment"] = f"{network.buffer.evicted} older request(s) dropped by the ring buffer"
+    return {"log": log}
+
+
+def save_har(driver, path, bodies: bool = False) -> bool:
+    """Write the driver's recent traffic to `path`; False if there's nothing to write."""
+    network = network_collector(driver)
+    if not network.available:
+        return False
+    har = build_har(driver, bodies)
+    if not har["log"]["entries"]:
+        return False
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(har, f)
+    return True
@@ -0,0 +1,194 @@
+# utils/html_report.py
+
+"""
+TEST_REPORT.html: one self-contained page listing every test of a run.
+
+Each row has the outcome, the total duration (setup + call + teardown) and
+the failure message. An expandable detail holds the page-object step
+timings, the warnings/errors the test logged, and links to its screenshot,
+HAR, traces and debug artifacts. Screenshots are <img loading="lazy">
+pointing at the files on disk, so the page stays small and opens at once.
+A few lines of inline JS filter by text and outcome and sort on the column
+headers.
+
+HtmlReportWriter is fed tests one at a time while the reports stream in
+(report_generator passes add_test as MergedReport's on_test). Rows are
+spooled to a temporary file. finish() writes the summary header, then copies
+the rows over, so memory doesn't grow with the number of tests.
+"""
+
+import os
+import shutil
+import tempfile
+from html import escape
+from pathlib import Path
+
+from utils.report_reader import user_property
+
+_CSS = """
+body { font: 14px/1.4 system-ui, sans-serif; margin: 24px; color: #222; }
+h1 { margin: 0 0 8px; }
+.summary span { margin-right: 16px; }
+.controls { margin: 16px 0; display: flex; gap: 12px; align-items: center; }
+.controls input[type=search] { width: 320px; padding: 4px 8px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 4px 8px; border-bottom: 1px solid #eee; vertical-align: top; }
+th { cursor: pointer; user-select: none; background: #fafafa; position: sticky; top: 0; }
+th[data-dir=asc]::after { content: " ▲"; } th[data-dir=desc]::after { content: " ▼"; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; white-space: nowrap; }
+.passed { color: #1a7f37; } .failed, .error { color: #cf222e; } .skipped, .xfailed { color: #9a6700; }
+.msg { font-family: ui-monospace, monospace; font-size: 12px; white-space: pre-wrap; max-width: 60ch; }
+details table { width: auto; margin: 6px 0; } details td, details th { font-size: 12px; padding: 2px 6px; }
+details img { max-width: 720px; display: block; margin: 6px 0; border: 1px solid #ddd; }
+.log { font-family: ui-monospace, monospace; font-size: 12px; }
+tr.hidden { display: none; }
+"""
+
+_JS = """
+(function () {
+  var rows = Array.prototype.slice.call(document.querySelectorAll("#tests tbody tr"));
+  var search = document.getElementById("q");
+  var boxes = document.querySelectorAll(".controls input[type=checkbox]");
+  function apply() {
+    var q = search.value.toLowerCase(), show = {};
+    boxes.forEach(function (b) { show[b.value] = b.checked; });
+    var shown = 0;
+    rows.forEach(function (r) {
+      var ok = (show[r.dataset.outcome] !== false) && (!q || r.dataset.text.indexOf(q) !== -1);
+      r.classList.toggle("hidden", !ok);
+      if (ok) shown++;
+    });
+    document.getElementById("shown").textContent = shown;
+  }
+  search.addEventListener("input", apply);
+  boxes.forEach(function (b) { b.addEventListener("change", apply); });
+  document.querySelectorAll("#tests th[data-key]").forEach(function (th) {
+    th.addEventListener("click", function () {
+      var key = th.dataset.key, dir = th.dataset.dir === "asc" ? "desc" : "asc";
+      document.querySelectorAll("#tests th").forEach(function (h) { delete h.dataset.dir; });
+      th.dataset.dir = dir;
+      var num = key === "duration", sign = dir === "asc" ? 1 : -1;
+      rows.sort(function (a, b) {
+        var x = a.dataset[key], y = b.dataset[key];
+        return sign * (num ? parseFloat(x) - parseFloat(y) : x.localeCompare(y));
+      });
+      var body = document.querySelector("#tests tbody");
+      rows.forEach(function (r) { body.appendChild(r); });
+    });
+  });
+  apply();
+})();
+"""
+
+
+def test_duration(test) -> float:
+    return sum((test.get(phase) or {}).get("duration") or 0.0 for phase in ("setup", "call", "teardown"))
+
+
+def step_totals(test) -> list:
+    """(step, calls, seconds, wait seconds) per step name, slowest first."""
+    totals = {}
+    for span in test.get("steps") or user_property(test, "steps") or []:
+        entry = totals.setdefault(span["step"], [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += span.get("duration_s", 0.0)
+        entry[2] += span.get("wait_s", 0.0)
+    return sorted(((name, *v) for name, v in totals.items()), key=lambda r: r[2], reverse=True)
+
+
+class HtmlReportWriter:
+    def __init__(self, path, base_dir, failure_message, test_logs=None, log_line=str):
+        self.path = Path(path)
+        self.base_dir = Path(base_dir)
+        self.failure_message = failure_message
+        self.test_logs = test_logs or {}
+        self.log_line = log_line
+        self.outcomes = set()
+        self._rows = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def _href(self, rel):
+        """Link to a file that report.json names relative to base_dir."""
+        target = self.base_dir / rel
+        try:
+            return escape(os.path.relpath(target, self.path.parent).replace(os.sep, "/"))
+        except ValueError:  # another drive on Windows
+            return escape(target.as_uri())
+
+    def _detail(self, test) -> str:
+        parts = []
+        steps = step_totals(test)
+        if steps:
+            rows = "".join(
+                f"<tr><td>{escape(name)}</td><td class=num>{calls}</td>"
+                f"<td class=num>{seconds:.2f}</td><td class=num>{wait:.2f}</td></tr>"
+                for name, calls, seconds, wait in steps
+            )
+            parts.append("<table><tr><th>Step</th><th>Calls</th><th>Seconds</th><th>Wait s</th></tr>"
+                         f"{rows}</table>")
+        records = self.test_logs.get(test["nodeid"], [])
+        if records:
+            parts.append("".join(f"<div class=log>{escape(self.log_line(r))}</div>" for r in records))
+        links = []
+        for name in ("har", "traces", "artifacts"):
+            value = user_property(test, name)
+            for rel in ([value] if isinstance(value, str) else value or []):
+                links.append(f'<a href="{self._href(rel)}">{escape(Path(rel).name)}</a>')
+        if links:
+            parts.append("<div>" + " · ".join(links) + "</div>")
+        screenshot = user_property(test, "screenshot")
+        if screenshot:
+            href = self._href(screenshot)
+            parts.append(f'<a href="{href}"><img loading="lazy" src="{href}" alt="screenshot"></a>')
+        if not parts:
+            return ""
+        return "<details><summary>details</summary>" + "".join(parts) + "</details>"
+
+    def add_test(self, test) -> None:
+        nodeid = test["nodeid"]
+        outcome = test.get("outcome", "unknown")
+        self.outcomes.add(outcome)
+        duration = test_duration(test)
+        message = self.failure_message(test) if outcome in ("failed", "error") else ""
+        text = f"{nodeid} {outcome} {message}".lower()
+        self._rows.write(
+            f'<tr data-name="{escape(nodeid)}" data-outcome="{escape(outcome)}" '
+            f'data-duration="{duration:.3f}" data-text="{escape(text)}">'
+            f"<td>{escape(nodeid)}{self._detail(test)}</td>"
+            f"<td class={escape(outcome)}>{escape(outcome)}</td>"
+            f"<td class=num>{duration:.2f}</td>"
+            f"<td class=msg>{escape(message)}</td></tr>\n"
+        )
+
+    def finish(self, report, regression_lines=()) -> Path:
+        """Write the page; `report` is the MergedReport the tests streamed into."""
+        counts = " ".join(
+            f"<span class={escape(o)}><b>{escape(o.capitalize())}:</b> {n}</span>"
+            for o, n in sorted(report.outcomes.items())
+        )
+        boxes = "".join(
+            f'<label><input type=checkbox value="{escape(o)}" checked> {escape(o)}</label>'
+            for o in sorted(self.outcomes)
+        )
+        regressions = ""
+        if regression_lines:
+            items = "".join(f"<li><code>{escape(line)}</code></li>" for line in regression_lines)
+            regressions = f"<h2>Performance regressions</h2><ul>{items}</ul>"
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as out:
+            out.write(
+                "<!DOCTYPE html><html><head><meta charset=utf-8>"
+                f"<title>Test Report</title><style>{_CSS}</style></head><body>"
+                "<h1>Test Report Summary</h1>"
+                f"<div class=summary><span><b>Total tests:</b> {report.total}</span>{counts}</div>"
+                f"{regressions}"
+                "<div class=controls><input id=q type=search placeholder='Filter by test name or message'>"
+                f"{boxes}<span><span id=shown>{report.total}</span> shown</span></div>"
+                "<table id=tests><thead><tr><th data-key=name>Test</th><th data-key=outcome>Outcome</th>"
+                "<th data-key=duration>Duration (s)</th><th>Message</th></tr></thead><tbody>\n"
+            )
+            self._rows.seek(0)
+            shutil.copyfileobj(self._rows, out)
+            out.write(f"</tbody></table><script>{_JS}</script></body></html>\n")
+        self._rows.close()
+        return self.path
@@ -0,0 +1,178 @@
+# utils/log.py
+
+"""
+Structured logging for pages, utils and conftest.
+
+Modules log through get_logger(__name__) with %-style arguments. Level
+checks happen before a message is built, so a DEBUG line costs next to
+nothing when DEBUG is off. Every record carries the context it was logged
+in:
+
+  test    node id of the running test (set by conftest's logstart/logfinish hooks)
+  worker  xdist worker id (gw0, gw1, ...) or None
+  step    innermost page-object step running (utils/step_timing.py), e.g. LoginPage.login
+
+pytest shows the records of a failed test under "Captured log", and live
+with --log-cli-level; pytest.ini's log_format prints worker and step. The
+context is added by ContextFilter, which conftest attaches to pytest's log
+handlers and configure_logging to the JSONL sink.
+
+Levels are switched without touching code:
+  CDS_LOG_LEVEL=DEBUG                                  every wait, click and retry
+  CDS_LOG_LEVELS="pages=DEBUG,utils.browser_pool=WARNING"  per logger prefix
+
+The JSON Lines sink (--log-jsonl, default LOG_JSONL) writes one object per
+record. Under xdist each worker writes its own file with the worker id in the
+name (run.gw0.jsonl, ...); read_records() merges them. A record's `data`
+(extra={"data": {...}}) is written as-is. Timings logged with
+data={"key": ..., "metric": ..., "value": ...} become samples of the
+performance history (utils/perf_baseline.py), and report_generator.py lists
+the warnings and errors each failed test logged.
+"""
+
+import glob
+import json
+import logging
+import os
+from pathlib import Path
+
+from utils.step_timing import STEPS
+
+ROOT = "cds"
+# "" turns the sink off
+LOG_JSONL = os.getenv("CDS_LOG_JSONL", "logs/run.jsonl")
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger in the "cds" tree, e.g. get_logger("pages.home_page") → cds.pages.home_page."""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+class LogContext:
+    """What this process is doing right now."""
+
+    def __init__(self):
+        self.test = None
+        self.worker = os.getenv("PYTEST_XDIST_WORKER")
+
+
+LOG_CONTEXT = LogContext()
+
+class ContextFilter(logging.Filter):
+    """
+    Stamps test/worker/step (and `where`, for pytest.ini's log_format) on the
+    records of the handlers it is attached to. A filter instead of a global
+    record factory: records made by any library, or before this module was
+    imported, still format.
+    """
+
+    def filter(self, record):
+        if not hasattr(record, "where"):
+            record.test = LOG_CONTEXT.test
+            record.worker = LOG_CONTEXT.worker
+            record.step = STEPS.current
+            where = " ".join(v for v in (record.worker, record.step) if v)
+            record.where = f" ({where})" if where else ""
+        return True
+
+
+CONTEXT_FILTER = ContextFilter()
+
+
+def add_context(*handlers) -> None:
+    """Attach CONTEXT_FILTER to handlers (None entries are skipped; attaching twice is a no-op)."""
+    for handler in handlers:
+        if handler is not None:
+            handler.addFilter(CONTEXT_FILTER)
+
+
+class JsonLinesHandler(logging.Handler):
+    """One JSON object per record; line-buffered so a crashed worker loses at most a line."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stream = open(self.path, "a", encoding="utf-8", buffering=1)
+
+    def emit(self, record):
+        try:
+            entry = {
+                "ts": round(record.created, 3),
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                "test": getattr(record, "test", None),
+                "worker": getattr(record, "worker", None),
+                "step": getattr(record, "step", None),
+            }
+            data = getattr(record, "data", None)
+            if data is not None:
+                entry["data"] = data
+            if record.exc_info:
+                entry["exc"] = logging.Formatter().formatException(record.exc_info)
+            self.stream.write(json.dumps(entry, default=str) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            super().close()
+
+
+def worker_path(path, worker):
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{worker}{path.suffix}") if worker else path
+
+
+def log_files(path) -> list:
+    """The sink file and its per-worker siblings."""
+    path = Path(path)
+    siblings = glob.glob(str(path.with_name(f"{glob.escape(path.stem)}.*{path.suffix}")))
+    return [p for p in [path, *map(Path, sorted(siblings))] if p.exists()]
+
+
+def configure_logging(jsonl_path=None, fresh: bool = False) -> None:
+    """
+    Levels from the environment, and the JSONL sink if a path is given.
+    `fresh` removes the previous run's files first (the controller does this
+    before any worker starts).
+    """
+    root = logging.getLogger(ROOT)
+    root.setLevel(os.getenv("CDS_LOG_LEVEL", "INFO").upper())
+    for spec in filter(None, os.getenv("CDS_LOG_LEVELS", "").split(",")):
+        name, _, level = spec.partition("=")
+        logging.getLogger(f"{ROOT}.{name.strip()}").setLevel(level.strip().upper())
+
+    if jsonl_path:
+        if fresh:
+            for old in log_files(jsonl_path):
+                old.unlink()
+        handler = JsonLinesHandler(worker_path(jsonl_path, LOG_CONTEXT.worker))
+        add_context(handler)
+        root.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    root = logging.getLogger(ROOT)
+    for handler in list(root.handlers):
+        if isinstance(handler, JsonLinesHandler):
+            root.removeHandler(handler)
+            handler.close()
+
+
+def read_records(path, min_level: int = logging.NOTSET) -> list:
+    """Records of the sink at `path` (all workers), oldest first."""
+    records = []
+    for file in log_files(path):
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a killed worker
+                if logging.getLevelName(entry.get("level", "NOTSET")) >= min_level:
+                    records.append(entry)
+    return sorted(records, key=lambda r: r.get("ts", 0))
@@ -0,0 +1,375 @@
+# utils/network_collector.py
+
+"""
+Incremental, indexed view of Chrome's Network events for one driver.
+
+driver.get_log("performance") hands out each entry exactly once, so one
+collector per driver is its only reader. drain() parses just the entries
+that arrived since the last call (each JSON message is decoded once) and
+folds them into NetworkRequest records. Those are indexed by requestId and
+by GraphQL operation: both the operationName and the top-level fields, so
+"publishDataset" finds the mutation whatever the client named it.
+Everything that needs network data (resource-blocking stats, is_published,
+the GraphQL recorder) reads from here instead of re-parsing the log.
+
+Records stay for the whole test (blocking stats and the GraphQL recorder
+total them at teardown), but a request's body is parsed when it is sent
+and dropped once the response has finished, so a long wizard test holds
+one small record per request rather than every upload and mutation body.
+
+It also keeps the raw request/response details (headers, CDP timing) of the
+most recent requests in a NetworkRingBuffer, capped at HAR_BUFFER_BYTES of
+event data. conftest turns that into a HAR file when a test fails (utils/har.py).
+
+conftest calls reset() at the start of every test so a pooled browser's
+records never leak into the next test.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+
+from selenium.common.exceptions import WebDriverException
+
+# Event bytes (raw log messages) the HAR ring buffer keeps per driver
+HAR_BUFFER_BYTES = int(os.getenv("HAR_BUFFER_BYTES", str(8 * 1024 * 1024)))
+
+_OPERATION_RE = re.compile(r"^\s*(query|mutation|subscription)\b\s*([_A-Za-z]\w*)?")
+_NAME_RE = re.compile(r"[_A-Za-z]\w*")
+
+
+def _root_fields(query: str):
+    """
+    Top-level field names of a GraphQL document's first operation. Fields
+    selected through an inline fragment (`... on Query { x }`) count as
+    top-level; fragment spreads, aliases and directives don't.
+    """
+    start = query.find("{")
+    if start < 0:
+        return []
+    # one entry per open brace: True for an inline fragment's, which
+    # doesn't start a nested selection
+    braces, depth, inline_next = [], 0, False
+    fields, i, n = [], start, len(query)
+    while i < n:
+        ch = query[i]
+        if ch == "{":
+            braces.append(inline_next)
+            if not inline_next:
+                depth += 1
+            inline_next = False
+        elif ch == "}":
+            if not braces.pop():
+                depth -= 1
+                if depth == 0:
+                    break
+        elif ch == "(":
+            # skip arguments, which may contain braces of their own
+            paren = 1
+            i += 1
+            while i < n and paren:
+                paren += {"(": 1, ")": -1}.get(query[i], 0)
+                i += 1
+            continue
+        elif depth == 1 and query.startswith("...", i):
+            i = _skip_ws(query, i + 3)
+            m = _NAME_RE.match(query, i)
+            if m and m.group(0) != "on":
+                i = m.end()  # named spread: its fields live in the fragment
+                continue
+            if m:
+                m = _NAME_RE.match(query, _skip_ws(query, m.end()))
+                i = m.end() if m else i + 2
+            inline_next = True
+            continue
+        elif ch == "@":
+            m = _NAME_RE.match(query, i + 1)
+            i = m.end() if m else i + 1
+            continue
+        elif depth == 1:
+            m = _NAME_RE.match(query, i)
+            if m:
+                rest = query[m.end():].lstrip()
+                if rest.startswith(":"):
+                    # alias: the real field name follows the colon
+                    i = query.index(":", m.end()) + 1
+                    continue
+                fields.append(m.group(0))
+                i = m.end()
+                continue
+        i += 1
+    return fields
+
+
+def _skip_ws(text, i):
+    while i < len(text) and text[i] in " \t\r\n,":
+        i += 1
+    return i
+
+
+def parse_graphql(post_data):
+    """
+    [(operation_type, operation_name, root_fields, variables_bytes), ...]
+    for a GraphQL POST body (batched bodies give several), or [] if it isn't one.
+    """
+    if not post_data:
+        return []
+    try:
+        body = json.loads(post_data)
+    except ValueError:
+        return []
+    ops = []
+    for item in body if isinstance(body, list) else [body]:
+        if not isinstance(item, dict) or not isinstance(item.get("query"), str):
+            continue
+        query = item["query"]
+        m = _OPERATION_RE.match(query)
+        op_type = m.group(1) if m else "query"
+        name = item.get("operationName") or (m.group(2) if m else None)
+        variables = item.get("variables")
+        ops.append((
+            op_type,
+            name,
+            _root_fields(query),
+            len(json.dumps(variables)) if variables else 0,
+        ))
+    return ops
+
+
+class NetworkRequest:
+    """One request as assembled from its Network.* events."""
+
+    __slots__ = (
+        "request_id", "url", "method", "post_data", "resource_type", "started", "wall_time",
+        "redirects", "status", "mime_type", "from_cache", "response_at", "finished_at",
+        "encoded_data_length", "failed", "error_text", "blocked_reason", "graphql",
+    )
+
+    def __init__(self, request_id, url, method, post_data, started, wall_time, resource_type):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.post_data = post_data    # None once the request is done
+        self.resource_type = resource_type
+        self.started = started        # CDP monotonic seconds
+        self.wall_time = wall_time    # epoch seconds
+        self.redirects = 0
+        self.status = None
+        self.mime_type = None
+        self.from_cache = False
+        self.response_at = None
+        self.finished_at = None
+        self.encoded_data_length = 0
+        self.failed = False
+        self.error_text = None
+        self.blocked_reason = None
+        self.graphql = []             # parse_graphql() result
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None or self.failed
+
+    @property
+    def latency(self):
+        """Seconds from request to end of body (or failure), None while in flight."""
+        end = self.finished_at or self.response_at
+        return None if end is None else end - self.started
+
+    @property
+    def operations(self):
+        return [name for _, name, _, _ in self.graphql if name]
+
+
+class NetworkRingBuffer:
+    """
+    HAR-level details of the latest requests, oldest evicted first once the
+    raw events behind them exceed `max_bytes`. Redirect hops are kept as
+    separate entries ("<requestId>#<n>"), as HAR lists them.
+    """
+
+    _RESPONSE_KEYS = (
+        "status", "statusText", "headers", "mimeType", "protocol", "timing",
+        "remoteIPAddress", "fromDiskCache", "fromServiceWorker",
+    )
+
+    def __init__(self, max_bytes: int = HAR_BUFFER_BYTES):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self._sizes = {}
+        self._hops = {}
+        self.size = 0
+        self.evicted = 0
+
+    def add(self, method, params, size: int) -> None:
+        rid = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if rid in self.entries and params.get("redirectResponse") is not None:
+                # close the previous hop under its own key
+                hop = self._hops[rid] = self._hops.get(rid, 0) + 1
+                previous = self.entries.pop(rid)
+                previous["response"] = self._response(params["redirectResponse"])
+                previous["finished"] = params.get("timestamp")
+                key = f"{rid}#{hop}"
+                self.entries[key] = previous
+                self._sizes[key] = self._sizes.pop(rid)
+            request = params["request"]
+            self.entries[rid] = {
+                "request": {k: request.get(k) for k in ("url", "method", "headers", "postData")},
+                "type": params.get("type"),
+                "started": params.get("timestamp"),
+                "wall_time": params.get("wallTime"),
+                "response": None,
+                "finished": None,
+                "encoded_data_length": 0,
+                "error": None,
+            }
+        elif rid not in self.entries:
+            return
+        elif method == "Network.responseReceived":
+            self.entries[rid]["response"] = self._response(params.get("response", {}))
+        elif method == "Network.loadingFinished":
+            self.entries[rid]["finished"] = params.get("timestamp")
+            self.entries[rid]["encoded_data_length"] = int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            self.entries[rid]["finished"] = params.get("timestamp")
+            self.entries[rid]["error"] = params.get("blockedReason") or params.get("errorText")
+        else:
+            return
+        self._sizes[rid] = self._sizes.get(rid, 0) + size
+        self.size += size
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            key, _ = self.entries.popitem(last=False)
+            self.size -= self._sizes.pop(key, 0)
+            self.evicted += 1
+
+    def _response(self, response):
+        return {k: response.get(k) for k in self._RESPONSE_KEYS}
+
+
+class NetworkCollector:
+    def __init__(self, driver, buffer_bytes: int = HAR_BUFFER_BYTES):
+        self.driver = driver
+        self.available = hasattr(driver, "get_log")
+        self.buffer = NetworkRingBuffer(buffer_bytes)
+        self._clear()
+
+    def _clear(self):
+        self.requests = {}
+        self.order = []
+        self._by_operation = {}
+        self.events = 0
+        self.buffer.clear()
+
+    def reset(self) -> None:
+        """Forget everything seen so far (pending log entries are discarded too)."""
+        self.drain()
+        self._clear()
+
+    # ── ingestion ────────────────────────────────────────────────────────
+    def drain(self) -> int:
+        """Fold newly logged events into the index; returns how many were read."""
+        if not self.available:
+            return 0
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            # e.g. Firefox, or a browser launched without performance logging
+            self.available = False
+            return 0
+        for entry in entries:
+            raw = entry["message"]
+            message = json.loads(raw)["message"]
+            method = message.get("method", "")
+            if method.startswith("Network."):
+                params = message.get("params", {})
+                self._apply(method, params)
+                self.buffer.add(method, params, len(raw))
+        self.events += len(entries)
+        return len(entries)
+
+    def _apply(self, method, params):
+        rid = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            existing = self.requests.get(rid)
+            if existing is not None:
+                # same id, next hop of a redirect chain
+                existing.redirects += 1
+                existing.url = params["request"]["url"]
+                return
+            req = params["request"]
+            record = NetworkRequest(
+                rid, req["url"], req.get("method"), req.get("postData"),
+                params.get("timestamp"), params.get("wallTime"), params.get("type"),
+            )
+            self.requests[rid] = record
+            self.order.append(rid)
+            if record.method == "POST" and (record.post_data or req.get("hasPostData")):
+                self._index_graphql(record, bool(req.get("hasPostData")))
+        elif rid not in self.requests:
+            return
+        elif method == "Network.responseReceived":
+            record, response = self.requests[rid], params.get("response", {})
+            record.status = response.get("status")
+            record.mime_type = response.get("mimeType")
+            record.from_cache = bool(response.get("fromDiskCache") or response.get("fromServiceWorker"))
+            record.response_at = params.get("timestamp")
+        elif method == "Network.loadingFinished":
+            record = self.requests[rid]
+            record.finished_at = params.get("timestamp")
+            record.encoded_data_length = int(params.get("encodedDataLength", 0))
+            record.post_data = None  # already parsed into record.graphql
+        elif method == "Network.loadingFailed":
+            record = self.requests[rid]
+            record.failed = True
+            record.finished_at = params.get("timestamp")
+            record.error_text = params.get("errorText")
+            record.blocked_reason = params.get("blockedReason")
+            record.post_data = None
+
+    def _index_graphql(self, record, has_post_data):
+        if record.post_data is None and has_post_data and "graphql" in record.url.lower():
+            # large bodies are left out of the event; fetch them on demand
+            try:
+                record.post_data = self.driver.execute_cdp_cmd(
+                    "Network.getRequestPostData", {"requestId": record.request_id}
+                )["postData"]
+            except Exception:
+                return
+        record.graphql = parse_graphql(record.post_data)
+        for _, name, fields, _ in record.graphql:
+            for key in {name, *fields} - {None}:
+                self._by_operation.setdefault(key, []).append(record.request_id)
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def all(self):
+        """Requests in the order they were sent."""
+        return [self.requests[rid] for rid in self.order]
+
+    def operation(self, name):
+        """Requests for a GraphQL operation name or root field, oldest first."""
+        return [self.requests[rid] for rid in self._by_operation.get(name, ())]
+
+    def completed_operation(self, name):
+        """Latest finished (or failed) request for `name` after a drain, else None."""
+        self.drain()
+        for record in reversed(self.operation(name)):
+            if record.done:
+                return record
+        return None
+
+    def response_body(self, record) -> str:
+        return self.driver.execute_cdp_cmd(
+            "Network.getResponseBody", {"requestId": record.request_id}
+        )["body"]
+
+
+def network_collector(driver) -> NetworkCollector:
+    """The driver's collector, created on first use."""
+    collector = getattr(driver, "cds_network", None)
+    if collector is None:
+        collector = driver.cds_network = NetworkCollector(driver)
+    return collector
@@ -0,0 +1,133 @@
+# utils/network_idle.py
+"""
+In-page counter of in-flight fetch / XHR requests (GraphQL counted separately)
+so page objects can wait for "the backend is done" instead of sleeping.
+
+The script is registered with Page.addScriptToEvaluateOnNewDocument at launch,
+so it is in place before the app's own code runs on every navigation. Browsers
+without CDP get it injected on first use instead; requests already in flight
+at that moment are not seen, which the quiet window covers.
+
+The quiet window of a wait starts when the wait does (or at a mark taken
+before the action), never earlier: a page that was already quiet before a
+click is not idle until it has stayed quiet for NETWORK_QUIET_MS after it.
+Actions that must reach the backend (uploads, saves) also wait for the
+request counter to move past the mark, so the wait can't finish before the
+request has even started.
+"""
+
+import os
+
+# How long the page must have had zero requests in flight to count as idle.
+NETWORK_QUIET_MS = int(os.getenv("NETWORK_QUIET_MS", "500"))
+
+NETWORK_TRACKER_SCRIPT = r"""
+(function () {
+  if (window.__cdsNet) return;
+  var now = Date.now();
+  var net = window.__cdsNet = {inflight: 0, graphql: 0, total: 0, graphqlTotal: 0,
+                               born: now, last: now, graphqlLast: now};
+
+  function isGraphql(url, body) {
+    return /graphql/i.test(String(url || "")) ||
+           (typeof body === "string" && body.indexOf('"query"') !== -1);
+  }
+  function start(gql) {
+    net.inflight++; net.total++;
+    net.last = Date.now();
+    if (gql) { net.graphql++; net.graphqlTotal++; net.graphqlLast = net.last; }
+  }
+  function done(gql) {
+    net.inflight = Math.max(0, net.inflight - 1);
+    net.last = Date.now();
+    if (gql) { net.graphql = Math.max(0, net.graphql - 1); net.graphqlLast = net.last; }
+  }
+
+  var origFetch = window.fetch;
+  if (origFetch) {
+    window.fetch = function (input, init) {
+      var gql = isGraphql((input && input.url) || input, init && init.body);
+      start(gql);
+      var p;
+      try { p = origFetch.apply(this, arguments); } catch (e) { done(gql); throw e; }
+      return p.then(function (r) { done(gql); return r; },
+                    function (e) { done(gql); throw e; });
+    };
+  }
+
+  var open = XMLHttpRequest.prototype.open;
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__cdsUrl = url;
+    return open.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function (body) {
+    var gql = isGraphql(this.__cdsUrl, body), finished = false;
+    function finish() { if (!finished) { finished = true; done(gql); } }
+    start(gql);
+    this.addEventListener("loadend", finish);
+    try { return send.apply(this, arguments); } catch (e) { finish(); throw e; }
+  };
+})();
+"""
+
+_STATE_SCRIPT = """
+var n = window.__cdsNet;
+if (!n) return null;
+var now = Date.now();
+return {inflight: n.inflight, graphql: n.graphql, total: n.total, graphql_total: n.graphqlTotal,
+        now: now, born: n.born, last: n.last, graphql_last: n.graphqlLast,
+        idle_ms: now - n.last, graphql_idle_ms: now - n.graphqlLast};
+"""
+
+
+def install_network_tracker(driver) -> bool:
+    """
+    Register the tracker for every future document (Chrome/CDP) and inject it
+    into the current one. Returns False if only the current document got it.
+    """
+    registered = False
+    try:
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+        )
+        registered = True
+    except Exception:
+        pass
+    inject_network_tracker(driver)
+    return registered
+
+
+def inject_network_tracker(driver) -> None:
+    """Install the tracker into the current document only (no-op if present)."""
+    driver.execute_script(NETWORK_TRACKER_SCRIPT)
+
+
+def network_state(driver):
+    """
+    {"inflight", "graphql", "total", "graphql_total", "now", "born", "last",
+    "graphql_last", "idle_ms", "graphql_idle_ms"} for the current document
+    (times in page-clock ms), or None when the tracker isn't installed there.
+    """
+    return driver.execute_script(_STATE_SCRIPT)
+
+
+def is_network_idle(state, mark, quiet_ms=NETWORK_QUIET_MS, graphql_only=False, expect_request=False) -> bool:
+    """
+    Whether `state` counts as idle for a wait that began at `mark` (the
+    network_state() taken when the wait started or before the action).
+    Nothing may be in flight, and nothing may have started or finished for
+    `quiet_ms` since max(mark, last activity). With `expect_request`, a
+    request must also have started after the mark.
+    """
+    busy, last, total = (
+        ("graphql", "graphql_last", "graphql_total") if graphql_only else ("inflight", "last", "total")
+    )
+    if state[busy]:
+        return False
+    if expect_request:
+        # a document loaded after the mark counts its requests from zero
+        before = 0 if state["born"] > mark["now"] else mark[total]
+        if state[total] <= before:
+            return False
+    return state["now"] - max(mark["now"], state[last]) >= quiet_ms
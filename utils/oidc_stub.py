@@ -0,0 +1,210 @@
+# utils/oidc_stub.py
+
+"""
+A tiny offline stand-in for the CivicDataSpace frontend + its Keycloak realm,
+just enough to exercise utils.api_login without network access.
+
+Frontend (next-auth style):
+    GET  /api/auth/csrf                       -> {"csrfToken": ...}
+    POST /api/auth/signin/keycloak            -> 302 to the realm's authorize endpoint
+    GET  /api/auth/callback/keycloak?code=... -> sets next-auth.session-token, 302 /dashboard
+    GET  /dashboard                           -> "User Dashboard" (needs the session cookie)
+
+Realm (Keycloak paths):
+    GET  /realms/<realm>/.well-known/openid-configuration
+    GET  /realms/<realm>/protocol/openid-connect/auth   -> login form (id=kc-form-login)
+    POST /realms/<realm>/login-actions/authenticate     -> 302 back with ?code=...
+    POST /realms/<realm>/protocol/openid-connect/token  -> password / authorization_code grants
+"""
+
+import base64
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+CLIENT_ID = "dataspace"
+TOKEN_LIFETIME = 300
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def make_token(subject: str, lifetime: int = TOKEN_LIFETIME) -> str:
+    """Unsigned JWT (alg=none) — only the shape and the exp claim matter here."""
+    now = int(time.time())
+    return f"{_b64({'alg': 'none', 'typ': 'JWT'})}.{_b64({'sub': subject, 'iat': now, 'exp': now + lifetime})}."
+
+
+_LOGIN_FORM = """<!doctype html><html><body><div id="kc-form-wrapper">
+<form id="kc-form-login" action="{action}" method="post">
+{error}
+<input id="username" name="username" type="text">
+<input id="password" name="password" type="password">
+<input id="kc-login" type="submit" value="Sign In">
+</form></div></body></html>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "OidcStandIn/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is exercised too
+
+    # ─── plumbing ───────────────────────────────────────────────────────────────
+    def setup(self):
+        super().setup()
+        # one handler instance per TCP connection
+        self.server.stand_in.connections += 1
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="text/html", headers=()):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, data, status=200, headers=()):
+        self._send(status, json.dumps(data), "application/json", headers)
+
+    def _redirect(self, location, headers=()):
+        self._send(302, b"", headers=[("Location", location), *headers])
+
+    def _form(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode()
+        return {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+    def _cookies(self) -> dict:
+        out = {}
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            if "=" in part:
+                k, v = part.strip().split("=", 1)
+                out[k] = v
+        return out
+
+    # ─── routing ────────────────────────────────────────────────────────────────
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        realm = self.server.realm_path
+        stub = self.server.stand_in
+
+        if url.path == "/api/auth/csrf":
+            token = secrets.token_hex(16)
+            self._json({"csrfToken": token}, headers=[("Set-Cookie", f"next-auth.csrf-token={token}; Path=/; HttpOnly")])
+        elif url.path == f"{realm}/.well-known/openid-configuration":
+            issuer = stub.base_url.rstrip("/") + realm
+            self._json({
+                "issuer": issuer,
+                "authorization_endpoint": f"{issuer}/protocol/openid-connect/auth",
+                "token_endpoint": f"{issuer}/protocol/openid-connect/token",
+            })
+        elif url.path == f"{realm}/protocol/openid-connect/auth":
+            action = f"{realm}/login-actions/authenticate?" + urlencode(
+                {"redirect_uri": query.get("redirect_uri", ""), "state": query.get("state", "")}
+            )
+            self._send(200, _LOGIN_FORM.format(action=action.replace("&", "&amp;"), error=""))
+        elif url.path == "/api/auth/callback/keycloak":
+            email = stub.codes.pop(query.get("code"), None)
+            if email is None:
+                self._send(400, "invalid code")
+                return
+            token = make_token(email)
+            stub.sessions[token] = email
+            self._redirect("/dashboard", [("Set-Cookie", f"next-auth.session-token={token}; Path=/; HttpOnly")])
+        elif url.path == "/dashboard":
+            if self._cookies().get("next-auth.session-token") in stub.sessions:
+                self._send(200, "<html><body><span class='Text-module_headingXl'>User Dashboard</span></body></html>")
+            else:
+                self._redirect("/")
+        elif url.path == "/":
+            self._send(200, "<html><body><button>LOGIN / SIGN UP</button></body></html>")
+        else:
+            self._send(404, "not found")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        realm = self.server.realm_path
+        stub = self.server.stand_in
+        form = self._form()
+
+        if url.path == "/api/auth/signin/keycloak":
+            authorize = stub.base_url.rstrip("/") + f"{realm}/protocol/openid-connect/auth?" + urlencode({
+                "client_id": CLIENT_ID,
+                "response_type": "code",
+                "redirect_uri": stub.base_url.rstrip("/") + "/api/auth/callback/keycloak",
+                "state": secrets.token_hex(8),
+            })
+            if form.get("json") == "true":
+                self._json({"url": authorize})
+            else:
+                self._redirect(authorize)
+        elif url.path == f"{realm}/login-actions/authenticate":
+            email, password = form.get("username"), form.get("password")
+            if stub.users.get(email) != password:
+                error = '<span id="input-error">Invalid username or password.</span>'
+                self._send(200, _LOGIN_FORM.format(action=self.path.replace("&", "&amp;"), error=error))
+                return
+            code = secrets.token_hex(12)
+            stub.codes[code] = email
+            location = query["redirect_uri"] + "?" + urlencode({"code": code, "state": query.get("state", "")})
+            self._redirect(location, [("Set-Cookie", f"KEYCLOAK_SESSION={secrets.token_hex(8)}; Path={realm}/")])
+        elif url.path == f"{realm}/protocol/openid-connect/token":
+            grant = form.get("grant_type")
+            if grant == "password" and stub.users.get(form.get("username")) == form.get("password"):
+                email = form["username"]
+            elif grant == "authorization_code" and form.get("code") in stub.codes:
+                email = stub.codes.pop(form["code"])
+            else:
+                self._json({"error": "invalid_grant"}, status=401)
+                return
+            self._json({
+                "access_token": make_token(email),
+                "refresh_token": make_token(email, TOKEN_LIFETIME * 6),
+                "id_token": make_token(email),
+                "token_type": "Bearer",
+                "expires_in": TOKEN_LIFETIME,
+            })
+        else:
+            self._send(404, "not found")
+
+
+class OidcStandIn:
+    """Runs the stand-in on 127.0.0.1:<random port> in a daemon thread."""
+
+    def __init__(self, users: dict, realm: str = "test"):
+        self.users = dict(users)
+        self.codes = {}
+        self.sessions = {}
+        self.connections = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.stand_in = self
+        self._server.realm_path = f"/realms/{realm}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    @property
+    def token_url(self) -> str:
+        return self.base_url.rstrip("/") + self._server.realm_path + "/protocol/openid-connect/token"
+
+    def start(self) -> "OidcStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,226 @@
+# utils/perf_baseline.py
+
+"""
+Performance history across runs, and regression flags against it.
+
+After each run, pytest_sessionfinish feeds report.json into a local SQLite
+store (PERF_HISTORY_DB, default DRIVER_CACHE_DIR/perf-history.sqlite):
+
+  test  <nodeid>                  duration_s   call phase of passed tests
+  step  <nodeid>::<Page.method>   duration_s   summed over the step's calls
+  page  <nodeid>::<page>          lcp_ms, ttfb_ms, load_ms, resources_bytes
+  log   <key>                     median of the run's timings logged with
+                                  data={"key", "metric", "value"} (utils/log.py),
+                                  e.g. browser_launch, api_login
+
+Each sample of the new run is compared with the median of the same series
+over the previous PERF_BASELINE_WINDOW runs (default 10). It is flagged when
+it exceeds that median by PERF_REGRESSION_FACTOR (default 1.3) and by at
+least the series' noise floor. A series needs PERF_BASELINE_MIN_RUNS earlier
+samples (default 3) before it can be flagged. The flags go to
+perf_regressions.json, which report_generator.py turns into a "Performance
+regressions" section.
+
+Only browser tests are recorded (report_reader.is_browser_test): unit tests
+would add sub-second durations to the run windows. A report without any is
+not recorded at all.
+
+A report is recorded once: runs are keyed by report.json's "created" stamp.
+Feeding the same report again only rewrites perf_regressions.json.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from utils.driver_resolver import CACHE_DIR
+from utils.log import read_records
+from utils.report_reader import is_browser_test, iter_report, user_property
+
+PERF_HISTORY_DB = Path(os.getenv("PERF_HISTORY_DB", CACHE_DIR / "perf-history.sqlite"))
+PERF_REGRESSION_FACTOR = float(os.getenv("PERF_REGRESSION_FACTOR", "1.3"))
+PERF_BASELINE_WINDOW = int(os.getenv("PERF_BASELINE_WINDOW", "10"))
+PERF_BASELINE_MIN_RUNS = int(os.getenv("PERF_BASELINE_MIN_RUNS", "3"))
+REGRESSIONS_FILE = "perf_regressions.json"
+
+# Differences below these are noise, whatever the ratio
+NOISE_FLOOR = {"duration_s": 0.25, "lcp_ms": 100, "ttfb_ms": 50, "load_ms": 100, "resources_bytes": 20480}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id             INTEGER PRIMARY KEY,
+    report_created REAL UNIQUE,
+    recorded_at    REAL,
+    git_sha        TEXT,
+    host           TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER REFERENCES runs(id),
+    kind   TEXT,
+    key    TEXT,
+    metric TEXT,
+    value  REAL
+);
+CREATE INDEX IF NOT EXISTS samples_series ON samples (kind, key, metric, run_id);
+"""
+
+
+def git_sha():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def samples_from_test(test) -> list:
+    """(kind, key, metric, value) tuples of one test entry; none unless it passed."""
+    if test.get("outcome") != "passed":
+        return []
+    samples = []
+    nodeid = test["nodeid"]
+    duration = (test.get("call") or {}).get("duration")
+    if duration is not None:
+        samples.append(("test", nodeid, "duration_s", duration))
+
+    steps = {}
+    for span in test.get("steps") or user_property(test, "steps") or []:
+        steps[span["step"]] = steps.get(span["step"], 0.0) + span["duration_s"]
+    samples.extend(("step", f"{nodeid}::{name}", "duration_s", total) for name, total in steps.items())
+
+    for record in user_property(test, "page_metrics") or []:
+        key = f"{nodeid}::{record['page']}"
+        if record.get("lcp_ms") is not None:
+            samples.append(("page", key, "lcp_ms", record["lcp_ms"]))
+        navigation = record.get("navigation") or {}
+        if not record.get("soft_navigation"):
+            for metric in ("ttfb_ms", "load_ms"):
+                if navigation.get(metric):
+                    samples.append(("page", key, metric, navigation[metric]))
+        resources = record.get("resources") or {}
+        if resources.get("transfer_bytes") is not None:
+            samples.append(("page", key, "resources_bytes", resources["transfer_bytes"]))
+    return samples
+
+
+def samples_from_report(path) -> tuple:
+    """(created, [(kind, key, metric, value)]) of a report file's browser tests, streamed."""
+    created = None
+    samples = []
+    for event in iter_report(path):
+        if event[0] == "test":
+            if is_browser_test(event[1]):
+                samples.extend(samples_from_test(event[1]))
+        elif event[1] == "created":
+            created = event[2]
+    return created, samples
+
+
+def samples_from_log(records) -> list:
+    """(kind, key, metric, value) tuples from JSONL log records, one median per series."""
+    series = {}
+    for record in records:
+        data = record.get("data")
+        if not isinstance(data, dict) or not {"key", "metric", "value"} <= data.keys():
+            continue
+        series.setdefault((data["key"], data["metric"]), []).append(data["value"])
+    return [("log", key, metric, statistics.median(values)) for (key, metric), values in series.items()]
+
+
+class PerfBaseline:
+    def __init__(self, path=PERF_HISTORY_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # another run on this machine may be writing at the same moment
+        self.db = sqlite3.connect(str(self.path), timeout=30)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, created, samples):
+        """Store a run's samples under its report's "created" stamp; returns the run id, or None if already recorded."""
+        with self.db:
+            if created is not None and self.db.execute(
+                "SELECT 1 FROM runs WHERE report_created = ?", (created,)
+            ).fetchone():
+                return None
+            run_id = self.db.execute(
+                "INSERT INTO runs (report_created, recorded_at, git_sha, host) VALUES (?, ?, ?, ?)",
+                (created, time.time(), git_sha(), socket.gethostname()),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO samples (run_id, kind, key, metric, value) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *sample) for sample in samples],
+            )
+        return run_id
+
+    def run_id(self, created):
+        """Id of the run recorded under a report's "created" stamp, or None."""
+        row = self.db.execute("SELECT id FROM runs WHERE report_created = ?", (created,)).fetchone()
+        return row[0] if row else None
+
+    def _history(self, kind, key, metric, run_id, window):
+        rows = self.db.execute(
+            "SELECT value FROM samples WHERE kind = ? AND key = ? AND metric = ? AND run_id < ? "
+            "ORDER BY run_id DESC LIMIT ?",
+            (kind, key, metric, run_id, window),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def regressions(self, run_id, factor=PERF_REGRESSION_FACTOR, window=PERF_BASELINE_WINDOW,
+                    min_runs=PERF_BASELINE_MIN_RUNS) -> list:
+        """Samples of `run_id` slower than `factor` × their rolling median, worst first."""
+        flagged = []
+        samples = self.db.execute(
+            "SELECT kind, key, metric, value FROM samples WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        for kind, key, metric, value in samples:
+            history = self._history(kind, key, metric, run_id, window)
+            if len(history) < min_runs:
+                continue
+            median = statistics.median(history)
+            if median <= 0 or value <= median * factor:
+                continue
+            if value - median < NOISE_FLOOR.get(metric, 0):
+                continue
+            flagged.append({
+                "kind": kind,
+                "key": key,
+                "metric": metric,
+                "value": round(value, 3),
+                "median": round(median, 3),
+                "ratio": round(value / median, 2),
+                "runs": len(history),
+            })
+        return sorted(flagged, key=lambda r: r["ratio"], reverse=True)
+
+
+def record_run(report_path, out_path=REGRESSIONS_FILE, db_path=PERF_HISTORY_DB, log_path=None):
+    """Feed report.json (and the run's JSONL log) into the history and write the run's regressions; returns them."""
+    created, samples = samples_from_report(report_path)
+    if not samples:
+        # no browser test passed: nothing comparable to the history
+        return []
+    if log_path:
+        samples.extend(samples_from_log(read_records(log_path)))
+    baseline = PerfBaseline(db_path)
+    try:
+        # a report seen before (e.g. regenerating) still gets a fresh regressions file
+        run_id = baseline.record(created, samples) or baseline.run_id(created)
+        flagged = baseline.regressions(run_id)
+    finally:
+        baseline.close()
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "report_created": created,
+            "factor": PERF_REGRESSION_FACTOR,
+            "window": PERF_BASELINE_WINDOW,
+            "regressions": flagged,
+        }, f, indent=2)
+    return flagged
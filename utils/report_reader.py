@@ -0,0 +1,207 @@
+# utils/report_reader.py
+
+"""
+Streaming reader for pytest-json-report output, across any number of files.
+
+A report.json holds one object whose "tests" array grows with the suite.
+iter_report() walks it with an incremental decoder. Tests are yielded one at
+a time and "collectors"/"warnings" are skipped element by element. Memory
+stays at one chunk plus the largest single test, not the whole file.
+
+.jsonl files hold one JSON object per line. Lines with a "nodeid" are tests;
+any other object (e.g. {"created": ..., "summary": ...}) is report metadata.
+
+MergedReport folds the tests of every file into one summary in a single
+pass. It keeps the tests that fail or error, which are what the report
+details, and only counts the rest.
+"""
+
+import glob
+import json
+import os
+import re
+from pathlib import Path
+
+CHUNK_CHARS = 64 * 1024
+# Top-level arrays read element by element; everything else is decoded whole
+STREAMED_KEYS = ("tests", "collectors", "warnings")
+FAILED_OUTCOMES = ("failed", "error")
+# Set by the driver fixture (or recorded from a browser session): the tests
+# whose timings and outcomes belong in the perf and flake histories
+BROWSER_PROPERTIES = ("browser", "steps", "page_metrics")
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Cursor:
+    """A text stream with a decode position, refilled in chunks."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(CHUNK_CHARS)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at the end of the stream)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos} of the current chunk")
+        self.pos += 1
+
+    def skip_comma(self) -> bool:
+        if self.peek() == ",":
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number cut by the chunk boundary ("12" of "12.5") decodes too early
+            if (isinstance(obj, (int, float)) and not isinstance(obj, bool) and not self.eof
+                    and _NUMBER_TAIL.match(self.buf, end).end() == len(self.buf) and self._fill()):
+                continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        """Elements of the array starting at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self.skip_comma():
+                break
+        self.expect("]")
+
+
+def iter_report(path):
+    """("meta", key, value) and ("test", test_dict) events of one report file."""
+    with open(path, encoding="utf-8") as f:
+        if Path(path).suffix == ".jsonl":
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "nodeid" in entry:
+                    yield "test", entry
+                else:
+                    for key, value in entry.items():
+                        yield "meta", key, value
+            return
+
+        cursor = _Cursor(f)
+        cursor.expect("{")
+        if cursor.peek() == "}":
+            return
+        while True:
+            key = cursor.value()
+            cursor.expect(":")
+            if key in STREAMED_KEYS and cursor.peek() == "[":
+                for item in cursor.items():
+                    if key == "tests":
+                        yield "test", item
+            else:
+                yield "meta", key, cursor.value()
+            if not cursor.skip_comma():
+                break
+        cursor.expect("}")
+
+
+def user_property(test: dict, name: str, default=None):
+    """
+    Look up a user property of a test entry. pytest-json-report writes them as
+    [{name: value}, ...]; older reports used [[name, value], ...].
+    """
+    for prop in test.get("user_properties") or []:
+        if isinstance(prop, dict):
+            if name in prop:
+                return prop[name]
+        elif len(prop) == 2 and prop[0] == name:
+            return prop[1]
+    return default
+
+
+def is_browser_test(test: dict) -> bool:
+    """Whether a test entry drove a browser (unit tests and the like don't)."""
+    return "steps" in test or any(user_property(test, name) is not None for name in BROWSER_PROPERTIES)
+
+
+def expand_paths(patterns) -> list:
+    """Files for the given paths/globs, in order, each once."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if match not in paths and os.path.isfile(match):
+                paths.append(match)
+    return paths
+
+
+class MergedReport:
+    """Summary of several report files, built while they stream past."""
+
+    def __init__(self):
+        self.files = []
+        self.created = []
+        self.duration = 0.0
+        self.outcomes = {}
+        self.failed_tests = []
+
+    @property
+    def total(self) -> int:
+        return sum(self.outcomes.values())
+
+    def count(self, outcome) -> int:
+        return self.outcomes.get(outcome, 0)
+
+    def add_file(self, path, on_test=None) -> None:
+        """Fold one file in; `on_test(test)` sees every test as it streams past."""
+        self.files.append(str(path))
+        for event in iter_report(path):
+            if event[0] == "test":
+                test = event[1]
+                outcome = test.get("outcome", "unknown")
+                self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+                if outcome in FAILED_OUTCOMES:
+                    self.failed_tests.append(test)
+                if on_test is not None:
+                    on_test(test)
+            elif event[1] == "created":
+                self.created.append(event[2])
+            elif event[1] == "duration":
+                self.duration += event[2] or 0.0
+
+
+def merge_reports(paths, on_test=None) -> MergedReport:
+    merged = MergedReport()
+    for path in paths:
+        merged.add_file(path, on_test)
+    return merged
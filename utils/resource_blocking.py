@@ -0,0 +1,161 @@
+# utils/resource_blocking.py
+
+import json
+import os
+from urllib.parse import urlsplit
+
+from filelock import FileLock
+
+from utils.driver_resolver import CACHE_DIR
+
+# URL patterns for Network.setBlockedURLs ('*' is the only wildcard)
+BLOCK_RULES = {
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*analytics.google.com*",
+        "*plausible.io*", "*matomo*", "*hotjar.com*", "*clarity.ms*",
+        "*segment.io*", "*mixpanel.com*",
+    ],
+    "trackers": [
+        "*doubleclick.net*", "*connect.facebook.net*", "*facebook.com/tr*",
+        "*platform.twitter.com*", "*snap.licdn.com*", "*px.ads.linkedin.com*",
+        "*adservice.google.*",
+    ],
+    "fonts": [
+        "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+        "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.otf", "*.eot",
+    ],
+    "images": [
+        "*/_next/image*",
+        "*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+        "*.webp", "*.webp?*", "*.avif", "*.avif?*", "*.ico", "*.svg", "*.svg?*",
+    ],
+}
+
+# what a bare --block-resources turns on
+DEFAULT_CATEGORIES = ("analytics", "trackers", "fonts")
+
+SIZE_CACHE_FILE = CACHE_DIR / "resource-sizes.json"
+SIZE_CACHE_LIMIT = 5000
+
+
+def load_rules(path=None) -> dict:
+    """BLOCK_RULES, extended/overridden by a JSON file of {category: [patterns]}."""
+    rules = {k: list(v) for k, v in BLOCK_RULES.items()}
+    path = path or os.getenv("BLOCK_RULES_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for category, patterns in json.load(f).items():
+                rules[category] = list(patterns)
+    return rules
+
+
+def parse_categories(value) -> tuple:
+    """'--block-resources' value → category names ('default' → DEFAULT_CATEGORIES)."""
+    if not value:
+        return ()
+    names = []
+    for part in str(value).split(","):
+        part = part.strip().lower()
+        if part == "default":
+            names.extend(DEFAULT_CATEGORIES)
+        elif part:
+            names.append(part)
+    return tuple(dict.fromkeys(names))
+
+
+def patterns_for(categories, rules) -> list:
+    unknown = [c for c in categories if c not in rules]
+    if unknown:
+        raise ValueError(f"Unknown resource category: {', '.join(unknown)} (known: {', '.join(rules)})")
+    return [p for c in categories for p in rules[c]]
+
+
+def apply_blocking(driver, patterns) -> bool:
+    """Install the block list on a Chrome session. False if the browser has no CDP."""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    return True
+
+
+def _size_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+class ResourceSizeCache:
+    """
+    Transfer sizes seen for URLs (query string dropped), learned from normal
+    page loads. A blocked request never downloads anything, so this is what
+    lets us *estimate* the bytes a block saved.
+    """
+
+    def __init__(self, path=SIZE_CACHE_FILE):
+        self.path = path
+        self.sizes = {}
+        self._learned = {}
+        try:
+            self.sizes = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def learn(self, url: str, size: int) -> None:
+        if size > 0:
+            key = _size_key(url)
+            # re-inserted, so _learned stays ordered by when a key was last seen
+            self._learned.pop(key, None)
+            self._learned[key] = size
+
+    def estimate(self, url: str):
+        key = _size_key(url)
+        return self._learned.get(key, self.sizes.get(key))
+
+    def save(self) -> None:
+        """Merge what this process learned into the shared file (other workers may write too)."""
+        if not self._learned:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(self.path) + ".lock", timeout=30):
+            try:
+                current = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                current = {}
+            # seen in this run: move to the end, dict order being the age order
+            for key, size in self._learned.items():
+                current.pop(key, None)
+                current[key] = size
+            # keep the most recently seen entries only
+            trimmed = dict(list(current.items())[-SIZE_CACHE_LIMIT:])
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(trimmed), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+def network_usage(requests, size_cache: ResourceSizeCache) -> dict:
+    """
+    Summarise one test's requests (NetworkRequest records from the driver's
+    NetworkCollector): requests made, bytes received, requests blocked by
+    setBlockedURLs and the estimated bytes those blocks saved. Also feeds the
+    size cache from finished loads.
+    """
+    blocked = []
+    requests_made = 0
+    bytes_received = 0
+
+    for req in requests:
+        requests_made += 1 + req.redirects
+        if req.failed:
+            if req.blocked_reason == "inspector":
+                blocked.append(req.url)
+        elif req.finished_at is not None:
+            bytes_received += req.encoded_data_length
+            size_cache.learn(req.url, req.encoded_data_length)
+
+    estimates = [size_cache.estimate(u) for u in blocked]
+    return {
+        "requests": requests_made,
+        "bytes_received": bytes_received,
+        "blocked_requests": len(blocked),
+        "bytes_saved_estimate": sum(e for e in estimates if e),
+        "blocked_unknown_size": sum(1 for e in estimates if not e),
+    }
@@ -0,0 +1,163 @@
+# utils/step_timing.py
+
+"""
+Per-step timing of page-object methods.
+
+Every public method a BasePage subclass defines is wrapped (see
+BasePage.__init_subclass__) and recorded as a span. Within a span the time
+is split into buckets:
+
+  wait       explicit waits through BasePage.wait_for (polling included)
+  webdriver  WebDriver round trips outside waits (clicks, send_keys, get, ...)
+  other      the rest: Python, file I/O, HTTP calls made by the page
+
+A step that calls another public step shows up as a nested span (depth + 1).
+Buckets are inclusive, so a parent's wait_s contains its children's.
+
+conftest resets STEPS at the start of each test, wraps the driver with
+instrument_driver(), and stores STEPS.spans in the test's user_properties
+("steps"); pytest_json_modifyreport lifts them into report.json.
+"""
+
+import functools
+import time
+
+BUCKETS = ("wait", "webdriver")
+
+
+class _Span:
+    __slots__ = ("name", "depth", "started", "buckets")
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.started = time.perf_counter()
+        self.buckets = dict.fromkeys(BUCKETS, 0.0)
+
+
+class StepRecorder:
+    """Spans of the running test (one recorder per process)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.spans = []
+        self._stack = []
+        self._in_wait = 0
+        self._origin = time.perf_counter()
+        # objects with step_started(name)/step_finished(name), e.g. a StepTracer;
+        # they run outside the span's own timing
+        self.hooks = []
+
+    # ── spans ────────────────────────────────────────────────────────────
+    def start(self, name):
+        for hook in self.hooks:
+            hook.step_started(name)
+        span = _Span(name, len(self._stack))
+        self._stack.append(span)
+        return span
+
+    def finish(self, span, error=None):
+        # tolerate spans finished out of order (e.g. after a reset mid-step)
+        if span in self._stack:
+            self._stack.remove(span)
+        duration = time.perf_counter() - span.started
+        measured = sum(span.buckets.values())
+        self.spans.append({
+            "step": span.name,
+            "depth": span.depth,
+            "start_s": round(span.started - self._origin, 4),
+            "duration_s": round(duration, 4),
+            **{f"{b}_s": round(v, 4) for b, v in span.buckets.items()},
+            "other_s": round(max(duration - measured, 0.0), 4),
+            "error": error,
+        })
+        for hook in self.hooks:
+            hook.step_finished(span.name)
+
+    # ── buckets ──────────────────────────────────────────────────────────
+    def add(self, bucket, seconds):
+        for span in self._stack:
+            span.buckets[bucket] += seconds
+
+    def enter_wait(self):
+        self._in_wait += 1
+
+    def exit_wait(self, seconds):
+        self._in_wait -= 1
+        self.add("wait", seconds)
+
+    @property
+    def current(self):
+        """Name of the innermost running step, or None."""
+        return self._stack[-1].name if self._stack else None
+
+    @property
+    def in_wait(self):
+        return self._in_wait > 0
+
+    def ordered(self):
+        """Spans in call order (they are recorded as they finish)."""
+        return sorted(self.spans, key=lambda s: (s["start_s"], s["depth"]))
+
+
+STEPS = StepRecorder()
+
+
+def timed_step(name):
+    """Decorator recording the wrapped call as a step span called `name`."""
+    def decorate(func):
+        if getattr(func, "__step_timed__", False):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            span = STEPS.start(name)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                STEPS.finish(span, error=e.__class__.__name__)
+                raise
+            STEPS.finish(span)
+            return result
+
+        wrapper.__step_timed__ = True
+        return wrapper
+    return decorate
+
+
+def instrument_class(cls):
+    """Wrap the public plain methods `cls` itself defines."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value) or isinstance(value, type):
+            continue
+        if isinstance(value, (staticmethod, classmethod, property)):
+            continue
+        setattr(cls, attr, timed_step(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+def instrument_driver(driver):
+    """
+    Count WebDriver round trips. WebDriver and WebElement both go through
+    driver.execute(), so shadowing it on the instance sees every command.
+    Calls made while a wait is polling are left to the wait bucket.
+    """
+    if getattr(driver, "__step_timed__", False):
+        return driver
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def timed_execute(*args, **kwargs):
+        if STEPS.in_wait:
+            return execute(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return execute(*args, **kwargs)
+        finally:
+            STEPS.add("webdriver", time.perf_counter() - started)
+
+    driver.execute = timed_execute
+    driver.__step_timed__ = True
+    return driver
@@ -0,0 +1,165 @@
+# utils/thumbnails.py
+
+"""
+Downscaled, recompressed copies of failure screenshots for the PDF report.
+
+A full-size 1920×1080 PNG costs ReportLab the decode, and the PDF the bytes,
+of an image it then prints 6 inches wide. make_thumbnails() shrinks each
+screenshot to fit the box it is printed in, at THUMB_DPI (default 110), and
+saves it as a JPEG (THUMB_QUALITY, default 80). Resizing runs in a process
+pool once there is more than one image to do.
+
+Thumbnails are cached under THUMB_CACHE_DIR (default
+~/.cache/civicdataspace-test-thumbnails), keyed by a hash of the source bytes
+and the settings. A screenshot seen in an earlier run, or twice in this one,
+is decoded only once. Entries not used for THUMB_CACHE_MAX_AGE_DAYS (default
+14) are pruned at the start of each build.
+
+Resizing needs Pillow. Without it the PDF embeds the screenshots as they are,
+and a warning says so once.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+THUMB_DPI = int(os.getenv("THUMB_DPI", "110"))
+THUMB_QUALITY = int(os.getenv("THUMB_QUALITY", "80"))
+THUMB_CACHE_DIR = Path(os.getenv(
+    "THUMB_CACHE_DIR", Path.home() / ".cache" / "civicdataspace-test-thumbnails"
+))
+THUMB_CACHE_MAX_AGE_DAYS = float(os.getenv("THUMB_CACHE_MAX_AGE_DAYS", "14"))
+
+_warned_no_pillow = False
+
+
+def pillow_available() -> bool:
+    """Whether Pillow can be imported; warns once per process if it can't."""
+    global _warned_no_pillow
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        if not _warned_no_pillow:
+            _warned_no_pillow = True
+            log.warning("Pillow is not installed; screenshots go into the PDF at full size "
+                        "(pip install pillow)")
+        return False
+    return True
+
+
+def prune_cache(cache_dir=THUMB_CACHE_DIR, max_age_days=THUMB_CACHE_MAX_AGE_DAYS) -> int:
+    """Delete thumbnails not used for `max_age_days`; returns how many went."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    try:
+        entries = list(os.scandir(cache_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            continue  # another build pruned it first
+    if removed:
+        log.debug("Pruned %d thumbnail(s) older than %g days from %s", removed, max_age_days, cache_dir)
+    return removed
+
+
+class Thumbnail:
+    __slots__ = ("source", "path", "width", "height", "source_bytes", "bytes", "cached")
+
+    def __init__(self, source, path, width, height, source_bytes, size, cached):
+        self.source = source
+        self.path = path
+        self.width = width
+        self.height = height
+        self.source_bytes = source_bytes
+        self.bytes = size
+        self.cached = cached
+
+    def fit(self, max_width, max_height):
+        """Printed size (points) inside the box, keeping the aspect ratio."""
+        scale = min(max_width / self.width, max_height / self.height)
+        return self.width * scale, self.height * scale
+
+
+def _thumbnail(source, cache_dir, max_px, quality):
+    """Runs in a pool worker: hash, then resize unless the cache has it."""
+    from PIL import Image
+
+    data = Path(source).read_bytes()
+    key = hashlib.sha256(data).hexdigest()[:32]
+    path = Path(cache_dir) / f"{key}-{max_px[0]}x{max_px[1]}-q{quality}.jpg"
+    if path.exists():
+        # a hit counts as a use: prune_cache() keeps it another max-age
+        os.utime(path)
+        with Image.open(path) as img:
+            return str(path), img.size, len(data), path.stat().st_size, True
+
+    with Image.open(source) as img:
+        img.thumbnail(max_px, Image.LANCZOS)
+        img = img.convert("RGB")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # another report build may write the same key; the rename makes that harmless
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        img.save(tmp, "JPEG", quality=quality, optimize=True)
+        os.replace(tmp, path)
+        return str(path), img.size, len(data), path.stat().st_size, False
+
+
+def make_thumbnails(sources, box_inches, dpi=THUMB_DPI, quality=THUMB_QUALITY,
+                    cache_dir=THUMB_CACHE_DIR, max_workers=None):
+    """
+    {source path: Thumbnail} for the given image files, each fitted to
+    `box_inches` (width, height) at `dpi`. Images that can't be read are
+    left out; the caller embeds those as they are (all of them without Pillow).
+    """
+    sources = list(dict.fromkeys(str(s) for s in sources))
+    if not sources or not pillow_available():
+        return {}
+    prune_cache(cache_dir)
+    max_px = (round(box_inches[0] * dpi), round(box_inches[1] * dpi))
+    args = (str(cache_dir), max_px, quality)
+    results = {}
+    if len(sources) > 1:
+        workers = min(len(sources), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {s: pool.submit(_thumbnail, s, *args) for s in sources}
+            outcomes = {s: f.exception() or f.result() for s, f in futures.items()}
+    else:
+        outcomes = {}
+        for s in sources:
+            try:
+                outcomes[s] = _thumbnail(s, *args)
+            except Exception as e:
+                outcomes[s] = e
+    for source, outcome in outcomes.items():
+        if isinstance(outcome, Exception):
+            continue
+        path, (width, height), source_bytes, size, cached = outcome
+        results[source] = Thumbnail(source, path, width, height, source_bytes, size, cached)
+    return results
+
+
+def thumbnail_summary(thumbs, seconds) -> str:
+    source = sum(t.source_bytes for t in thumbs.values())
+    small = sum(t.bytes for t in thumbs.values())
+    cached = sum(1 for t in thumbs.values() if t.cached)
+    return (f"{len(thumbs)} screenshot(s) downscaled in {seconds:.2f}s "
+            f"({cached} from cache): {source / 1024:.0f} KB → {small / 1024:.0f} KB, "
+            f"{(source - small) / 1024:.0f} KB saved")
+
+
+def timed_thumbnails(sources, box_inches, **kwargs):
+    """make_thumbnails() plus the seconds it took."""
+    started = time.perf_counter()
+    thumbs = make_thumbnails(sources, box_inches, **kwargs)
+    return thumbs, time.perf_counter() - started
@@ -0,0 +1,185 @@
+# utils/tracing.py
+
+"""
+Chrome performance traces (CDP Tracing) around a test or a single page-object step.
+
+execute_cdp_cmd can't receive CDP events, and a trace is only handed over
+through one (Tracing.tracingComplete). TraceSession therefore opens its own
+DevTools websocket to the tab, found via the debuggerAddress ChromeDriver
+reports. Chrome is asked for a gzip-compressed stream. When the trace ends, the
+stream is read with IO.read one chunk at a time and written straight to
+disk, so only one chunk is ever held in memory.
+
+The .json.gz files open in Perfetto (ui.perfetto.dev), chrome://tracing or
+DevTools → Performance → Load profile.
+
+conftest starts a session for the whole test with --cdp-trace or a bare
+@pytest.mark.trace. @pytest.mark.trace(step="CreateUsecasePage.publish")
+traces each call of that step only: a StepTracer hooked into STEPS starts
+and stops a session around it.
+"""
+
+import base64
+import json
+import os
+import re
+from pathlib import Path
+
+import requests
+import websocket
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+TRACE_DIR = Path(os.getenv("TRACE_DIR", "traces"))
+
+# What DevTools' Performance panel records, without screenshots
+TRACE_CATEGORIES = os.getenv("TRACE_CATEGORIES", ",".join((
+    "-*", "devtools.timeline", "v8.execute", "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame", "toplevel", "blink.console",
+    "blink.user_timing", "latencyInfo", "disabled-by-default-devtools.timeline.stack",
+    "disabled-by-default-v8.cpu_profiler",
+))).split(",")
+
+# Bytes per IO.read call
+TRACE_CHUNK_BYTES = 1024 * 1024
+
+
+class TracingError(Exception):
+    pass
+
+
+class CdpSocket:
+    """Minimal blocking CDP client on one target's websocket."""
+
+    def __init__(self, ws_url, timeout: float = 30):
+        # Chrome rejects websocket clients sending a foreign Origin header
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._next_id = 0
+        self.events = []
+
+    def send(self, method, params=None):
+        self._next_id += 1
+        msg_id = self._next_id
+        self.ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get("id") == msg_id:
+                if "error" in message:
+                    raise TracingError(f"{method}: {message['error'].get('message')}")
+                return message.get("result", {})
+            if "method" in message:
+                self.events.append(message)
+
+    def wait_event(self, method):
+        for i, event in enumerate(self.events):
+            if event["method"] == method:
+                return self.events.pop(i)["params"]
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get("method") == method:
+                return message["params"]
+            # other events while tracing (dataCollected is not sent in stream mode)
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+def _target_ws_url(driver) -> str:
+    address = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+    if not address:
+        raise TracingError("no debuggerAddress (tracing needs Chrome)")
+    targets = requests.get(f"http://{address}/json/list", timeout=5).json()
+    pages = [t for t in targets if t.get("type") == "page" and t.get("webSocketDebuggerUrl")]
+    if not pages:
+        raise TracingError("no debuggable tab found")
+    # ChromeDriver window handles are the CDP target ids
+    handle = driver.current_window_handle
+    return next((t for t in pages if t["id"] == handle), pages[0])["webSocketDebuggerUrl"]
+
+
+class TraceSession:
+    def __init__(self, driver, path, categories=None):
+        self.driver = driver
+        self.path = Path(path)
+        self.categories = categories or TRACE_CATEGORIES
+        self._cdp = None
+
+    def start(self) -> "TraceSession":
+        self._cdp = CdpSocket(_target_ws_url(self.driver))
+        try:
+            self._cdp.send("Tracing.start", {
+                "transferMode": "ReturnAsStream",
+                "streamFormat": "json",
+                "streamCompression": "gzip",
+                "traceConfig": {
+                    "includedCategories": [c for c in self.categories if not c.startswith("-")],
+                    "excludedCategories": ["*"] if "-*" in self.categories else [],
+                },
+            })
+        except Exception:
+            self._cdp.close()
+            self._cdp = None
+            raise
+        return self
+
+    def stop(self) -> Path:
+        """End the trace and stream it to self.path; returns the path."""
+        cdp, self._cdp = self._cdp, None
+        if cdp is None:
+            raise TracingError("trace not started")
+        try:
+            cdp.send("Tracing.end")
+            handle = cdp.wait_event("Tracing.tracingComplete")["stream"]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                while True:
+                    chunk = cdp.send("IO.read", {"handle": handle, "size": TRACE_CHUNK_BYTES})
+                    data = chunk.get("data", "")
+                    f.write(base64.b64decode(data) if chunk.get("base64Encoded") else data.encode("utf-8"))
+                    if chunk.get("eof"):
+                        break
+            cdp.send("IO.close", {"handle": handle})
+        finally:
+            cdp.close()
+        return self.path
+
+
+def trace_path(test_name: str, step: str = None, n: int = 0) -> Path:
+    name = test_name if not step else f"{test_name}__{step}"
+    if n:
+        name += f"_{n}"
+    return TRACE_DIR / (re.sub(r"[^\w.-]+", "_", name) + ".json.gz")
+
+
+class StepTracer:
+    """STEPS hook tracing every call of one step; the resulting files end up in .paths."""
+
+    def __init__(self, driver, test_name, step):
+        self.driver = driver
+        self.test_name = test_name
+        self.step = step
+        self.paths = []
+        self._active = None
+
+    def step_started(self, name):
+        if name != self.step or self._active is not None:
+            return
+        path = trace_path(self.test_name, self.step, len(self.paths))
+        try:
+            self._active = TraceSession(self.driver, path).start()
+        except Exception as e:
+            log.warning("Could not start a trace for %s: %s", name, e)
+
+    def step_finished(self, name):
+        if name != self.step or self._active is None:
+            return
+        session, self._active = self._active, None
+        try:
+            self.paths.append(str(session.stop()))
+        except Exception as e:
+            log.warning("Could not save the trace for %s: %s", name, e)
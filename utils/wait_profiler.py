@@ -0,0 +1,119 @@
+# utils/wait_profiler.py
+
+"""
+Where the suite's waiting goes, per locator constant.
+
+Every wait in pages/ goes through BasePage.wait_for (find/finds/click
+included), and WAIT_STATS records each call with its raw locator.
+locator_name() maps that locator back to the constant(s) defining it, e.g.
+"CreateUsecaseLocators.PUBLISH_TAB", using a reverse index of the locators
+package. WaitStats.summary() groups a test's waits by that name into
+"by_locator".
+
+conftest feeds those per-test groups into WAIT_PROFILE. The xdist controller
+gets them through the test reports. At the end of the run it prints the
+locators ranked by total wait time and by timeouts, and saves the full table
+to wait_profile.json.
+
+Timeouts include deliberate negative checks (is_visible/is_absent with a
+short profile), so a locator timing out on every run is not necessarily
+broken. One that times out only sometimes is the fragile kind.
+"""
+
+import importlib
+import json
+import pkgutil
+
+_index = {}
+
+
+def build_locator_index(package: str = "locators") -> dict:
+    """{locator value: [ "Class.CONSTANT", ... ]} for every constant in `package`."""
+    index = {}
+    pkg = importlib.import_module(package)
+    for info in pkgutil.walk_packages(pkg.__path__, f"{package}."):
+        try:
+            module = importlib.import_module(info.name)
+        except Exception:
+            continue
+        for cls_name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for attr, value in vars(cls).items():
+                if not attr.isupper():
+                    continue
+                if isinstance(value, tuple) and len(value) == 2:
+                    value = value[1]
+                if isinstance(value, str):
+                    index.setdefault(value, []).append(f"{cls_name}.{attr}")
+    return index
+
+
+def locator_name(value) -> str:
+    """Constant name(s) for a locator value; the value itself if none defines it."""
+    if value is None:
+        return None
+    if isinstance(value, tuple):
+        value = value[1]
+    if "index" not in _index:
+        try:
+            _index["index"] = build_locator_index()
+        except ImportError:
+            _index["index"] = {}
+    names = _index["index"].get(value)
+    return " | ".join(sorted(names)) if names else value
+
+
+class WaitProfile:
+    """Per-locator wait totals of the whole run."""
+
+    def __init__(self):
+        self.locators = {}
+
+    def add(self, by_locator) -> None:
+        for name, s in by_locator.items():
+            row = self.locators.setdefault(name, {
+                "calls": 0, "seconds": 0.0, "timeouts": 0, "satisfied": 0,
+                "satisfied_seconds": 0.0, "max_s": 0.0, "tests": 0, "kinds": [],
+            })
+            for key in ("calls", "seconds", "timeouts", "satisfied", "satisfied_seconds"):
+                row[key] += s[key]
+            row["max_s"] = max(row["max_s"], s["max_s"])
+            row["tests"] += 1
+            row["kinds"] = sorted(set(row["kinds"]) | set(s["kinds"]))
+
+    def rows(self) -> list:
+        out = []
+        for name, row in self.locators.items():
+            out.append({
+                "locator": name,
+                **row,
+                "seconds": round(row["seconds"], 3),
+                "satisfied_seconds": round(row["satisfied_seconds"], 3),
+                "mean_to_satisfy_s": (
+                    round(row["satisfied_seconds"] / row["satisfied"], 3) if row["satisfied"] else None
+                ),
+                "timeout_rate": round(row["timeouts"] / row["calls"], 3),
+            })
+        return sorted(out, key=lambda r: r["seconds"], reverse=True)
+
+    def table(self, key: str = "seconds", limit: int = 15):
+        """Lines for the terminal summary, ranked by `key` ("seconds" or "timeouts")."""
+        rows = [r for r in self.rows() if r[key]]
+        rows.sort(key=lambda r: (r[key], r["seconds"]), reverse=True)
+        lines = [f"{'locator':<48} {'calls':>6} {'total s':>8} {'mean ok s':>9} "
+                 f"{'max s':>7} {'timeouts':>8}"]
+        for r in rows[:limit]:
+            mean = "-" if r["mean_to_satisfy_s"] is None else f"{r['mean_to_satisfy_s']:.2f}"
+            lines.append(
+                f"{r['locator'][:48]:<48} {r['calls']:>6} {r['seconds']:>8.2f} {mean:>9} "
+                f"{r['max_s']:>7.2f} {r['timeouts']:>8}"
+            )
+        return lines
+
+    def write(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"locators": self.rows()}, f, indent=2)
+
+
+WAIT_PROFILE = WaitProfile()
@@ -0,0 +1,150 @@
+# utils/web_vitals.py
+
+"""
+Navigation Timing, Resource Timing and Web Vitals for the pages tests visit.
+
+An observer script registered at launch (Page.addScriptToEvaluateOnNewDocument)
+keeps LCP and CLS for each document from its first paint. capture() reads them
+together with the navigation entry (TTFB, DOMContentLoaded, load), the
+resources fetched since the previous capture, and CDP Performance.getMetrics.
+
+The app is a SPA, so most go_to_* calls are route changes inside one
+document. Those captures are flagged "soft_navigation". For them the
+navigation entry still describes the original document load, and the
+"resources" block is what the transition itself fetched.
+
+conftest resets PAGE_METRICS per test and stores its records in the test's
+user_properties ("page_metrics"). --no-page-metrics turns capturing off.
+"""
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+VITALS_OBSERVER_SCRIPT = r"""
+(function () {
+  if (window.__cdsVitals) return;
+  var v = window.__cdsVitals = {lcp: null, lcpElement: null, cls: 0, lastCapture: null};
+  try { performance.setResourceTimingBufferSize(2000); } catch (e) {}
+  try {
+    new PerformanceObserver(function (list) {
+      var entries = list.getEntries(), last = entries[entries.length - 1];
+      if (!last) return;
+      v.lcp = last.renderTime || last.loadTime || last.startTime;
+      v.lcpElement = last.element ? last.element.tagName.toLowerCase() : null;
+    }).observe({type: "largest-contentful-paint", buffered: true});
+  } catch (e) {}
+  try {
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (e) { if (!e.hadRecentInput) v.cls += e.value; });
+    }).observe({type: "layout-shift", buffered: true});
+  } catch (e) {}
+})();
+"""
+
+_CAPTURE_SCRIPT = r"""
+var v = window.__cdsVitals;
+if (!v) return null;
+var now = performance.now();
+var since = v.lastCapture === null ? 0 : v.lastCapture;
+var soft = v.lastCapture !== null;
+v.lastCapture = now;
+
+var nav = performance.getEntriesByType("navigation")[0];
+var fresh = performance.getEntriesByType("resource").filter(function (r) {
+  return r.startTime >= since;
+});
+var bytes = 0;
+fresh.forEach(function (r) { bytes += r.transferSize || 0; });
+var slowest = fresh.slice().sort(function (a, b) { return b.duration - a.duration; })
+  .slice(0, 5).map(function (r) {
+    return {name: r.name, type: r.initiatorType, duration_ms: r.duration,
+            transfer_bytes: r.transferSize || 0};
+  });
+
+return {
+  url: location.href,
+  soft_navigation: soft,
+  since_previous_ms: now - since,
+  navigation: nav ? {
+    ttfb_ms: nav.responseStart,
+    dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+    connect_ms: nav.connectEnd - nav.connectStart,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    transfer_bytes: nav.transferSize || 0
+  } : null,
+  lcp_ms: v.lcp,
+  lcp_element: v.lcpElement,
+  cls: v.cls,
+  resources: {count: fresh.length, transfer_bytes: bytes, slowest: slowest}
+};
+"""
+
+# CDP Performance.getMetrics entries worth keeping
+CDP_METRICS = (
+    "Documents", "Nodes", "JSEventListeners", "LayoutCount", "RecalcStyleCount",
+    "LayoutDuration", "RecalcStyleDuration", "ScriptDuration", "TaskDuration",
+    "JSHeapUsedSize", "JSHeapTotalSize",
+)
+
+
+def install_vitals_observer(driver) -> None:
+    """Register the LCP/CLS observer for every new document and enable CDP metrics."""
+    try:
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": VITALS_OBSERVER_SCRIPT}
+        )
+        driver.execute_cdp_cmd("Performance.enable", {})
+    except Exception:
+        pass  # no CDP (Firefox): capture() injects the observer on demand
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 4 if abs(value) < 1 else 1)
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rounded(v) for v in value]
+    return value
+
+
+def cdp_metrics(driver):
+    try:
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception:
+        return None
+    return {m["name"]: m["value"] for m in metrics if m["name"] in CDP_METRICS}
+
+
+class PageMetricsRecorder:
+    """Page metrics captured during the running test (one recorder per process)."""
+
+    def __init__(self):
+        self.enabled = True
+        self.records = []
+
+    def reset(self):
+        self.records = []
+
+    def capture(self, driver, page: str):
+        """Record metrics for `page` (a short label, e.g. "datasets"); returns the record."""
+        if not self.enabled:
+            return None
+        try:
+            data = driver.execute_script(_CAPTURE_SCRIPT)
+            if data is None:
+                # observer missing in this document (no CDP): LCP/CLS come from
+                # the buffered entries, so they may lag one capture behind
+                driver.execute_script(VITALS_OBSERVER_SCRIPT)
+                data = driver.execute_script(_CAPTURE_SCRIPT)
+        except Exception as e:
+            log.warning("Could not capture page metrics for %s: %s", page, e.__class__.__name__)
+            return None
+        record = {"page": page, **_rounded(data or {}), "cdp": _rounded(cdp_metrics(driver))}
+        self.records.append(record)
+        return record
+
+
+PAGE_METRICS = PageMetricsRecorder()